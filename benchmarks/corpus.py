@@ -0,0 +1,296 @@
+"""Deterministic synthetic media corpus for the benchmarks.
+
+Generates a source tree that exercises every extractor route:
+
+- JPEGs with a real EXIF block (DateTimeOriginal, Make, Model)
+- MP4 and MOV files with an mvhd creation time
+- filename-dated JPEGs (IMG_YYYYMMDD_HHMMSS.jpg, no EXIF)
+- undated JPEGs (no EXIF, no date in the name: the mtime fallback)
+
+laid out "wide" (one level of directories with 1000 files each) or "deep"
+(nested directories four wide with 10 files each). The same count, shape and
+seed always produce the same names, bytes and mtimes. Every file is unique,
+so content duplicate checks do real work. Files are a few hundred bytes:
+the corpus measures per-file overhead, not copy bandwidth.
+
+Run with:
+    python -m benchmarks.corpus DIRECTORY [--scale 10k|100k|1m | --count N]
+        [--shape wide|deep] [--seed N]
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import shutil
+import struct
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from photo_organizer.extractors.isobmff import QUICKTIME_EPOCH_OFFSET
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+SHAPES = ("wide", "deep")
+
+# Written before the files (marking the directory as generated) and again
+# once they are complete; only a complete corpus is reused
+MANIFEST_NAME = "corpus.json"
+GENERATOR = "photo-organizer benchmarks.corpus"
+# Bump when the generated files change, so stale corpora are regenerated
+CORPUS_VERSION = 1
+
+# Share of each kind of file (the rest are EXIF JPEGs)
+VIDEO_SHARE = 0.10
+FILENAME_DATED_SHARE = 0.20
+UNDATED_SHARE = 0.10
+
+WIDE_FILES_PER_DIRECTORY = 1000
+DEEP_FILES_PER_DIRECTORY = 10
+DEEP_FANOUT = 4
+
+CAMERAS = [
+    ("Apple", "iPhone 14 Pro"),
+    ("Canon", "Canon EOS R5"),
+    ("NIKON CORPORATION", "NIKON Z 6"),
+    ("SONY", "ILCE-7RM4"),
+    ("samsung", "SM-G991B"),
+    ("FUJIFILM", "X-T4"),
+]
+
+UNDATED_WORDS = ["holiday", "family", "scan", "export", "edited", "beach", "party"]
+
+# Dates are spread over ten years from here
+FIRST_DATE = datetime(2014, 1, 1)
+DATE_RANGE_SECONDS = 10 * 365 * 24 * 3600
+
+# Same-length placeholders spliced into the templates for each file
+_DATE_PLACEHOLDER = b"2000:01:01 00:00:00"
+_ID_PLACEHOLDER = b"0" * 32
+
+
+def _exif_template(make: str, model: str) -> Tuple[bytes, int, int]:
+    """A small JPEG with an EXIF block, and the offsets of its placeholders."""
+    exif = Image.Exif()
+    exif[0x010F] = make
+    exif[0x0110] = model
+    exif_ifd = exif.get_ifd(0x8769)
+    exif_ifd[0x9003] = _DATE_PLACEHOLDER.decode()  # DateTimeOriginal
+    exif_ifd[0xA420] = _ID_PLACEHOLDER.decode()  # ImageUniqueID
+    buffer = io.BytesIO()
+    Image.new("RGB", (16, 16), (90, 140, 200)).save(buffer, "JPEG", exif=exif)
+    data = buffer.getvalue()
+    return data, data.index(_DATE_PLACEHOLDER), data.index(_ID_PLACEHOLDER)
+
+
+def _plain_template() -> bytes:
+    """A small JPEG without EXIF; made unique with a COM segment."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (16, 16), (200, 120, 60)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _video(brand: bytes, date: datetime, file_id: bytes) -> bytes:
+    """ftyp, moov/mvhd with the creation time, and a small unique mdat."""
+    created = int(date.timestamp()) + QUICKTIME_EPOCH_OFFSET
+    mvhd = _box(b"mvhd", bytes(4) + struct.pack(">II", created, created) + bytes(88))
+    return (
+        _box(b"ftyp", brand + bytes(4) + brand)
+        + _box(b"moov", mvhd)
+        + _box(b"mdat", file_id * 8)
+    )
+
+
+class CorpusGenerator:
+    """Write the files of one corpus."""
+
+    def __init__(self, root: Path, count: int, shape: str = "wide", seed: int = 0):
+        if shape not in SHAPES:
+            raise ValueError(f"Unknown corpus shape: {shape}")
+        self.root = root
+        self.count = count
+        self.shape = shape
+        self.seed = seed
+        self._exif_templates = [_exif_template(*camera) for camera in CAMERAS]
+        self._plain = _plain_template()
+        # Depth needed for the deep shape to hold count files
+        self._depth = 1
+        directories = -(-count // DEEP_FILES_PER_DIRECTORY)
+        while DEEP_FANOUT**self._depth < directories:
+            self._depth += 1
+
+    def generate(self) -> Dict[str, int]:
+        """Write every file; returns the number written of each kind."""
+        rng = random.Random(self.seed)
+        kinds: Dict[str, int] = {}
+        created_directories = set()
+        for i in range(self.count):
+            directory = self._directory(i)
+            if directory not in created_directories:
+                directory.mkdir(parents=True, exist_ok=True)
+                created_directories.add(directory)
+
+            date = FIRST_DATE + timedelta(seconds=rng.randrange(DATE_RANGE_SECONDS))
+            kind, name, data = self._file(i, rng, date)
+            path = directory / name
+            path.write_bytes(data)
+            # The fallback extractor reads the mtime; keep it deterministic
+            mtime = time.mktime(date.timetuple()) + 86400
+            os.utime(path, (mtime, mtime))
+            kinds[kind] = kinds.get(kind, 0) + 1
+        return kinds
+
+    def _directory(self, i: int) -> Path:
+        if self.shape == "wide":
+            return self.root / f"batch_{i // WIDE_FILES_PER_DIRECTORY:04d}"
+        number = i // DEEP_FILES_PER_DIRECTORY
+        parts = []
+        for _ in range(self._depth):
+            number, digit = divmod(number, DEEP_FANOUT)
+            parts.append(f"d{digit}")
+        return self.root.joinpath(*reversed(parts))
+
+    def _file(self, i: int, rng: random.Random, date: datetime) -> Tuple[str, str, bytes]:
+        file_id = f"{i:032x}".encode()
+        roll = rng.random()
+        if roll < VIDEO_SHARE:
+            if rng.random() < 0.5:
+                return "video", f"clip_{i:07d}.mp4", _video(b"isom", date, file_id)
+            return "video", f"MVI_{i:07d}.MOV", _video(b"qt  ", date, file_id)
+        roll -= VIDEO_SHARE
+        if roll < FILENAME_DATED_SHARE:
+            # The index keeps names unique within a directory
+            name = f"IMG_{date:%Y%m%d_%H%M%S}_{i:07d}.jpg"
+            return "filename_dated", name, self._commented(file_id)
+        roll -= FILENAME_DATED_SHARE
+        if roll < UNDATED_SHARE:
+            name = f"{rng.choice(UNDATED_WORDS)} {i:07d}.jpg"
+            return "undated", name, self._commented(file_id)
+
+        data, date_offset, id_offset = rng.choice(self._exif_templates)
+        data = bytearray(data)
+        data[date_offset : date_offset + 19] = f"{date:%Y:%m:%d %H:%M:%S}".encode()
+        data[id_offset : id_offset + 32] = file_id
+        return "exif", f"DSC{i:07d}.JPG", bytes(data)
+
+    def _commented(self, file_id: bytes) -> bytes:
+        comment = b"\xff\xfe" + struct.pack(">H", 2 + len(file_id)) + file_id
+        return self._plain[:2] + comment + self._plain[2:]
+
+
+def corpus_parameters(count: int, shape: str, seed: int) -> dict:
+    return {"version": CORPUS_VERSION, "count": count, "shape": shape, "seed": seed}
+
+
+class CorpusError(Exception):
+    """Raised when a directory cannot be used for a corpus."""
+
+
+def load_manifest(root: Path) -> Optional[dict]:
+    """The manifest of a corpus written by this generator, or None."""
+    try:
+        manifest = json.loads((root / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("generator") != GENERATOR:
+        return None
+    return manifest
+
+
+def ensure_corpus(root: Path, count: int, shape: str = "wide", seed: int = 0) -> dict:
+    """Generate the corpus at root unless an identical one is already there.
+
+    A different or partial corpus at root is replaced. Any other non-empty
+    directory is left alone: the generator never deletes files it did not
+    write.
+
+    Returns:
+        The corpus manifest (parameters, kinds, generation time)
+
+    Raises:
+        CorpusError: If root is a non-empty directory not made by the generator
+    """
+    parameters = corpus_parameters(count, shape, seed)
+    manifest = load_manifest(root)
+    if (
+        manifest is not None
+        and manifest.get("complete")
+        and manifest["parameters"] == parameters
+    ):
+        return manifest
+
+    if manifest is not None:
+        shutil.rmtree(root)
+    elif root.exists() and any(root.iterdir()):
+        raise CorpusError(
+            f"{root} is not empty and was not generated by benchmarks.corpus; "
+            "choose an empty or new directory"
+        )
+    root.mkdir(parents=True, exist_ok=True)
+    manifest = {"generator": GENERATOR, "parameters": parameters, "complete": False}
+    _write_manifest(root, manifest)
+
+    started = time.perf_counter()
+    manifest["kinds"] = CorpusGenerator(root, count, shape, seed).generate()
+    manifest["generation_seconds"] = time.perf_counter() - started
+    manifest["complete"] = True
+    _write_manifest(root, manifest)
+    return manifest
+
+
+def _write_manifest(root: Path, manifest: dict) -> None:
+    (root / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n")
+
+
+def add_corpus_arguments(parser: argparse.ArgumentParser) -> None:
+    """--scale/--count, --shape and --seed, shared with the harness."""
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument(
+        "--scale", choices=SCALES, default="10k", help="Corpus size (default: 10k)"
+    )
+    size.add_argument("--count", type=int, help="Exact number of files")
+    parser.add_argument(
+        "--shape", choices=SHAPES, default="wide", help="Directory layout"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+
+def corpus_count(parsed_args: argparse.Namespace) -> int:
+    return parsed_args.count if parsed_args.count else SCALES[parsed_args.scale]
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", type=Path, help="Where to write the corpus")
+    add_corpus_arguments(parser)
+    parsed_args = parser.parse_args(args)
+
+    try:
+        manifest = ensure_corpus(
+            parsed_args.directory,
+            corpus_count(parsed_args),
+            parsed_args.shape,
+            parsed_args.seed,
+        )
+    except CorpusError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    kinds = ", ".join(f"{kind}={n}" for kind, n in sorted(manifest["kinds"].items()))
+    print(
+        f"{parsed_args.directory}: {manifest['parameters']['count']} files "
+        f"({kinds}), generated in {manifest['generation_seconds']:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Micro-benchmark: FilenameExtractor camera detection.
+
+Compares the precompiled single-pass matchers against the previous
+approach of one re.search per device pattern and per brand, and checks
+that both give the same answers on the benchmark corpus.
+
+Run with:
+    python -m benchmarks.filename_patterns [--repeat N]
+"""
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import List, Optional
+
+from photo_organizer.extractors.filename import FilenameExtractor
+
+NAMES = [
+    "IMG_20241015_143000.jpg",
+    "VID_20230101_120000.mp4",
+    "DSC_0001.JPG",
+    "DSCF1234.RAF",
+    "PXL_20240101_101010123.jpg",
+    "DJI_0042.MP4",
+    "GP010203.MP4",
+    "MVI_1234.MOV",
+    "HTC_2013.jpg",
+    "holiday_photo_final.jpg",
+    "scan0001.tif",
+    "Screenshot 2024-01-01 at 10.00.00.png",
+]
+
+FOLDERS = [
+    "/home/user/Pictures/2024/10/15",
+    "/media/card/DCIM/100CANON",
+    "/photos/Sony A7R IV",
+    "/photos/iPhone 14 Pro Max",
+    "/backup/old phone/Camera",
+    "/archive/Family/Christmas 2019",
+    "/exports/Lightroom/Selected",
+]
+
+
+def legacy_device_brand(name: str) -> Optional[str]:
+    """Previous implementation of _detect_camera_model_from_name."""
+    name_lower = name.lower()
+    for pattern_name, pattern in FilenameExtractor.DEVICE_PATTERNS.items():
+        if re.search(pattern.lower(), name_lower):
+            brand = pattern_name.split("_")[0].lower()
+            return FilenameExtractor.BRAND_NAME_MAP.get(brand, brand.capitalize())
+    return None
+
+
+def legacy_has_brand(folder_name: str) -> bool:
+    """Previous per-brand word-boundary search in _extract_from_folder."""
+    folder_name_lower = folder_name.lower()
+    for brand in FilenameExtractor.CAMERA_BRANDS:
+        pattern = r"\b" + re.escape(brand) + r"\b"
+        if re.search(pattern, folder_name_lower):
+            return True
+    return False
+
+
+def _components() -> List[str]:
+    components = []
+    for folder in FOLDERS:
+        components.extend(Path(folder).parts)
+    return components
+
+
+def check_equivalence() -> None:
+    extractor = FilenameExtractor()
+    for name in NAMES + _components():
+        assert extractor._detect_camera_model_from_name(name) == legacy_device_brand(
+            name
+        ), name
+        assert bool(extractor._BRAND_MATCHER.search(name.lower())) == legacy_has_brand(
+            name
+        ), name
+
+
+def run(repeat: int) -> None:
+    extractor = FilenameExtractor()
+    components = _components()
+
+    def legacy() -> None:
+        for name in NAMES:
+            legacy_device_brand(name)
+        for component in components:
+            legacy_device_brand(component)
+            legacy_has_brand(component)
+
+    def compiled() -> None:
+        for name in NAMES:
+            extractor._detect_camera_model_from_name(name)
+        for component in components:
+            extractor._detect_camera_model_from_name(component)
+            extractor._BRAND_MATCHER.search(component.lower())
+
+    calls = len(NAMES) + len(components)
+    for label, func in (("legacy", legacy), ("compiled", compiled)):
+        best = min(timeit.repeat(func, number=repeat, repeat=5))
+        per_call = best / repeat / calls * 1e6
+        print(f"{label:>10}: {best:.3f}s for {repeat} rounds ({per_call:.2f} us/name)")
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000, help="Rounds per timing")
+    parsed_args = parser.parse_args(args)
+
+    check_equivalence()
+    run(parsed_args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
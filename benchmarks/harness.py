@@ -0,0 +1,253 @@
+"""Benchmark: each stage, and the whole CLI, on a synthetic corpus.
+
+Generates (or reuses) a corpus from benchmarks.corpus, then times:
+
+- scan: scanner.scan_records over the source tree
+- extract: DateResolver.resolve on every file, on one thread
+- plan: Organizer.build_target_path and DuplicateHandler.resolve
+- transfer: Organizer.organize_file (copy) into a fresh output tree
+- end_to_end: cli.main, with its default worker pools
+
+Results, along with the run metrics of the end-to-end run, are written as
+JSON; pass an earlier result file with --compare to see the change per
+stage. Everything runs locally and offline. The corpus is read from the
+page cache after the first stage, so cold-cache costs are not measured.
+
+Run with:
+    python -m benchmarks.harness [--scale 10k|100k|1m | --count N]
+        [--shape wide|deep] [--repeat N] [--compare OLD.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.corpus import (
+    CorpusError,
+    add_corpus_arguments,
+    corpus_count,
+    ensure_corpus,
+)
+from photo_organizer import metrics
+from photo_organizer.cli import build_resolver, main as cli_main
+from photo_organizer.duplicates import DuplicateHandler, DuplicateStrategy
+from photo_organizer.extractors.base import ExtractionResult
+from photo_organizer.organizer import Organizer
+from photo_organizer.records import FileRecord
+from photo_organizer.scanner import scan_records
+
+DEFAULT_WORK_DIRECTORY = Path(tempfile.gettempdir()) / "photo-organizer-bench"
+
+STAGES = ("scan", "extract", "plan", "transfer", "end_to_end")
+
+# Stages that work on the results of another; it is run first (untimed)
+# when only the later one is selected
+REQUIRES = {"extract": "scan", "plan": "extract", "transfer": "plan"}
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree being measured, if it is a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short=12", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+class Harness:
+    """Run the stages in order; later stages reuse earlier results.
+
+    Each stage writing an output tree writes it to a directory of work named
+    after the stage; prepare() clears it before the stage is timed.
+    """
+
+    def __init__(self, source: Path, work: Path):
+        self.source = source
+        self.work = work
+        self.records: List[FileRecord] = []
+        self.metadata: List[Optional[ExtractionResult]] = []
+        self.targets: List[Path] = []
+        self.pipeline_metrics: Optional[dict] = None
+
+    def scan(self) -> int:
+        # The corpus manifest is not a media file, so it is never listed
+        self.records = list(scan_records(self.source))
+        return len(self.records)
+
+    def extract(self) -> int:
+        resolver = build_resolver()
+        self.metadata = [
+            resolver.resolve(record.path, record) for record in self.records
+        ]
+        return len(self.metadata)
+
+    def prepare(self, stage: str) -> None:
+        output = self.work / stage
+        if output.exists():
+            shutil.rmtree(output)
+
+    def plan(self) -> int:
+        organizer = Organizer(self.work / "plan", dry_run=True)
+        handler = DuplicateHandler(DuplicateStrategy.RENAME)
+        self.targets = []
+        for record, metadata in zip(self.records, self.metadata):
+            target = organizer.build_target_path(record.path, metadata)
+            self.targets.append(handler.resolve(target))
+        return len(self.targets)
+
+    def transfer(self) -> int:
+        output = self.work / "transfer"
+        organizer = Organizer(output)
+        count = 0
+        for record, metadata, target in zip(self.records, self.metadata, self.targets):
+            target = output / target.relative_to(self.work / "plan")
+            count += organizer.organize_file(record.path, target, record, metadata)
+        organizer.flush()
+        return count
+
+    def end_to_end(self) -> int:
+        args = [
+            "--source", str(self.source),
+            "--output", str(self.work / "end_to_end"),
+            "--log-level", "WARNING",
+        ]  # fmt: skip
+        if cli_main(args) != 0:
+            raise RuntimeError("photo-organizer run reported errors")
+        current = metrics.snapshot()
+        self.pipeline_metrics = current.to_json()
+        return current.counters[(metrics.FILES, "")]
+
+
+def time_stage(harness: Harness, stage: str, repeat: int) -> Dict[str, float]:
+    """Best of `repeat` runs of a stage."""
+    run: Callable[[], int] = getattr(harness, stage)
+    best = None
+    files = 0
+    for _ in range(repeat):
+        harness.prepare(stage)
+        started = time.perf_counter()
+        files = run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "seconds": best,
+        "files": files,
+        "files_per_second": files / best if best else 0.0,
+        "us_per_file": 1e6 * best / files if files else 0.0,
+    }
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print the change of each stage against an earlier result file."""
+    print(f"\nAgainst {baseline.get('commit') or 'baseline'}:")
+    for stage, current in results["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or not before["seconds"]:
+            continue
+        change = 100.0 * (current["seconds"] / before["seconds"] - 1)
+        print(
+            f"  {stage:<12} {before['seconds']:8.3f}s -> {current['seconds']:8.3f}s "
+            f"({change:+.1f}%)"
+        )
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_corpus_arguments(parser)
+    parser.add_argument(
+        "--work",
+        type=Path,
+        default=DEFAULT_WORK_DIRECTORY,
+        help=f"Corpus and output directory (default: {DEFAULT_WORK_DIRECTORY})",
+    )
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGES,
+        default=list(STAGES),
+        help="Stages to time (the stages they depend on run untimed)",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Best of N runs")
+    parser.add_argument(
+        "--results", type=Path, default=None, help="Result file (default: in --work)"
+    )
+    parser.add_argument(
+        "--compare", type=Path, default=None, help="Earlier result file to compare"
+    )
+    parsed_args = parser.parse_args(args)
+
+    # The CLI run logs at WARNING; keep the stages quiet too
+    logging.basicConfig(level=logging.WARNING)
+
+    count = corpus_count(parsed_args)
+    work = parsed_args.work / f"{parsed_args.shape}-{count}-{parsed_args.seed}"
+    source = work / "source"
+    try:
+        corpus = ensure_corpus(source, count, parsed_args.shape, parsed_args.seed)
+    except CorpusError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    needed = set(parsed_args.stages)
+    for stage in reversed(STAGES):
+        if stage in needed and stage in REQUIRES:
+            needed.add(REQUIRES[stage])
+
+    harness = Harness(source, work)
+    stages = {}
+    for stage in STAGES:
+        if stage not in needed:
+            continue
+        if stage not in parsed_args.stages:
+            harness.prepare(stage)
+            getattr(harness, stage)()
+        else:
+            stages[stage] = time_stage(harness, stage, parsed_args.repeat)
+            print(
+                f"{stage:<12} {stages[stage]['seconds']:8.3f}s  "
+                f"{stages[stage]['files_per_second']:10.0f} files/s  "
+                f"{stages[stage]['us_per_file']:8.1f} us/file"
+            )
+
+    commit = git_commit()
+    results = {
+        "commit": commit,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "corpus": corpus,
+        "repeat": parsed_args.repeat,
+        "stages": stages,
+        "pipeline_metrics": harness.pipeline_metrics,
+    }
+    results_path = parsed_args.results or (
+        parsed_args.work / "results" / f"{commit or 'local'}-{work.name}.json"
+    )
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results_path.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results written to {results_path}")
+
+    if parsed_args.compare is not None:
+        compare(results, json.loads(parsed_args.compare.read_text()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
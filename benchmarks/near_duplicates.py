@@ -0,0 +1,86 @@
+"""Micro-benchmark: NearDuplicateIndex lookups at library scale.
+
+Feeds the index synthetic 64-bit hashes the way the pipeline does (find,
+then add), with a share of them being near copies of earlier hashes, and
+compares the results against a brute-force scan on a sample.
+
+Run with:
+    python -m benchmarks.near_duplicates [--count N] [--radius BITS]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from photo_organizer import perceptual
+from photo_organizer.perceptual import HASH_BITS, NearDuplicateIndex, hamming
+
+# Share of the corpus that are near copies of an earlier image
+NEAR_SHARE = 0.1
+
+
+def make_hashes(count: int, radius: int, seed: int = 0) -> List[int]:
+    rng = random.Random(seed)
+    hashes = []
+    for _ in range(count):
+        if hashes and rng.random() < NEAR_SHARE:
+            value = rng.choice(hashes)
+            for bit in rng.sample(range(HASH_BITS), rng.randrange(radius + 1)):
+                value ^= 1 << bit
+        else:
+            value = rng.getrandbits(HASH_BITS)
+        hashes.append(value)
+    return hashes
+
+
+def check_sample(hashes: List[int], radius: int, sample: int = 200) -> None:
+    """Compare index answers with a brute-force scan for the last queries."""
+    index = NearDuplicateIndex(radius)
+    split = len(hashes) - sample
+    for i, value in enumerate(hashes[:split]):
+        index.add(value, Path(str(i)))
+    for value in hashes[split:]:
+        distances = [hamming(value, known) for known in hashes[:split]]
+        best = min(distances)
+        found = index.find(value)
+        expected = best if best <= radius else None
+        assert (found[1] if found else None) == expected, (value, found, expected)
+
+
+def run(hashes: List[int], radius: int) -> None:
+    index = NearDuplicateIndex(radius)
+    matches = 0
+    started = time.perf_counter()
+    for i, value in enumerate(hashes):
+        if index.find(value) is None:
+            index.add(value, Path(str(i)))
+        else:
+            matches += 1
+    elapsed = time.perf_counter() - started
+
+    backend = "numpy" if perceptual.np is not None else "pure Python"
+    print(
+        f"{len(hashes)} hashes, radius {radius} ({backend}): {elapsed:.2f}s, "
+        f"{1e6 * elapsed / len(hashes):.1f} us per image, {matches} near duplicates"
+    )
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="Images to index")
+    parser.add_argument(
+        "--radius", type=int, default=perceptual.DEFAULT_RADIUS, help="Match radius"
+    )
+    parsed_args = parser.parse_args(args)
+
+    hashes = make_hashes(parsed_args.count, parsed_args.radius)
+    check_sample(hashes[:20_000], parsed_args.radius)
+    run(hashes, parsed_args.radius)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,8 @@
 """Entry point for python -m photo_organizer."""
 
+import sys
+
 from photo_organizer.cli import main
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
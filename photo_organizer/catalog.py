@@ -0,0 +1,261 @@
+"""Persistent catalog of the organized library, stored in the output root."""
+
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Set
+
+from photo_organizer.extractors.base import ExtractionResult
+from photo_organizer.scanner import scan_records
+
+logger = logging.getLogger(__name__)
+
+# Catalog location, relative to the output root
+CATALOG_FILENAME = Path(".photo-organizer") / "catalog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    digest TEXT,
+    taken_at TEXT,
+    camera TEXT,
+    extractor TEXT,
+    added_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_directory ON files (directory);
+CREATE INDEX IF NOT EXISTS files_size ON files (size);
+CREATE INDEX IF NOT EXISTS files_taken_at ON files (taken_at);
+CREATE INDEX IF NOT EXISTS files_camera ON files (camera);
+"""
+
+
+class CatalogEntry:
+    """One file of the organized library, as recorded in the catalog."""
+
+    __slots__ = ("path", "size", "digest", "date", "camera", "extractor")
+
+    def __init__(
+        self,
+        path: Path,
+        size: int,
+        digest: Optional[str] = None,
+        date: Optional[datetime] = None,
+        camera: Optional[str] = None,
+        extractor: Optional[str] = None,
+    ):
+        self.path = path
+        self.size = size
+        # Full-content digest (duplicates.ContentIndex), filled in lazily
+        self.digest = digest
+        self.date = date
+        self.camera = camera
+        self.extractor = extractor
+
+
+class Catalog:
+    """SQLite catalog of every file in the output tree.
+
+    Records each file's size, content digest (once computed), date, camera
+    model and the extractor that found them, so duplicate checks and
+    date/camera queries need neither a walk of the library nor a stat of
+    its files. Paths are stored relative to the output root. The catalog is
+    only accurate while photo-organizer is the only writer to the tree; run
+    rebuild() after changing it by other means. Writes are committed in
+    batches. Safe to share between threads.
+    """
+
+    def __init__(
+        self, output_root: Path, path: Optional[Path] = None, commit_every: int = 500
+    ):
+        """Open (or create) the catalog of output_root.
+
+        Args:
+            output_root: Root of the organized tree
+            path: Database file (default: output_root / CATALOG_FILENAME)
+            commit_every: Records written between commits
+        """
+        self.output_root = output_root
+        self.path = path or output_root / CATALOG_FILENAME
+        self.commit_every = commit_every
+        # A new catalog knows nothing of files already in the output
+        self.created = not self.path.exists()
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def record(
+        self,
+        target: Path,
+        size: int,
+        metadata: Optional[ExtractionResult] = None,
+        digest: Optional[str] = None,
+    ) -> None:
+        """Record a file written (or replaced) at target."""
+        relative = self._relative(target)
+        if relative is None:
+            return
+        metadata = metadata or ExtractionResult()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (path, directory, name, size, digest, "
+                "taken_at, camera, extractor, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    relative.as_posix(),
+                    relative.parent.as_posix(),
+                    relative.name,
+                    size,
+                    digest,
+                    metadata.date.isoformat() if metadata.date else None,
+                    metadata.camera_model,
+                    metadata.extractor,
+                    time.time(),
+                ),
+            )
+            self._written()
+
+    def set_digest(self, target: Path, digest: str) -> None:
+        """Store the content digest of a cataloged file."""
+        relative = self._relative(target)
+        if relative is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE files SET digest = ? WHERE path = ?", (digest, relative.as_posix())
+            )
+            self._written()
+
+    def names_in(self, directory: Path) -> Optional[Set[str]]:
+        """File names cataloged in directory, or None if it is outside the tree."""
+        relative = self._relative(directory)
+        if relative is None:
+            return None
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM files WHERE directory = ?", (relative.as_posix(),)
+            ).fetchall()
+        return {name for (name,) in rows}
+
+    def entries(self) -> Iterator[CatalogEntry]:
+        """Every cataloged file."""
+        return self._select("", ())
+
+    def query(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        camera: Optional[str] = None,
+    ) -> List[CatalogEntry]:
+        """Files matching a date range and camera, ordered by date.
+
+        Args:
+            start: Earliest date, as an ISO prefix (2024, 2024-06, 2024-06-01)
+            end: Latest date, inclusive, as an ISO prefix
+            camera: Case-insensitive substring of the camera model
+
+        Returns:
+            Matching entries; files without a date only match when no date
+            bound is given
+        """
+        clauses = []
+        params = []
+        if start:
+            clauses.append("taken_at >= ?")
+            params.append(start)
+        if end:
+            # "~" sorts after every character of an ISO timestamp
+            clauses.append("taken_at < ?")
+            params.append(end + "~")
+        if camera:
+            clauses.append(r"camera LIKE ? ESCAPE '\'")
+            params.append(f"%{_escape_like(camera)}%")
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        return list(self._select(where + "ORDER BY taken_at, path", tuple(params)))
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM files").fetchone()
+        return count
+
+    def rebuild(self, resolver) -> int:
+        """Replace the catalog with a fresh walk of the output tree.
+
+        Dates and cameras are extracted again with resolver (a DateResolver);
+        digests are left to be computed when first needed.
+
+        Returns:
+            Number of files cataloged
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM files")
+        count = 0
+        for record in scan_records(self.output_root, ordered=True):
+            metadata = resolver.resolve(record.path, record)
+            self.record(record.path, record.size, metadata)
+            count += 1
+        self.commit()
+        return count
+
+    def commit(self) -> None:
+        """Flush pending records to disk."""
+        with self._lock:
+            self._commit()
+
+    def close(self) -> None:
+        """Commit pending records and close the database."""
+        with self._lock:
+            self._commit()
+            self._conn.close()
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _select(self, suffix: str, params: tuple) -> Iterator[CatalogEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, digest, taken_at, camera, extractor FROM files "
+                + suffix,
+                params,
+            ).fetchall()
+        for path, size, digest, taken_at, camera, extractor in rows:
+            yield CatalogEntry(
+                self.output_root / path,
+                size,
+                digest,
+                datetime.fromisoformat(taken_at) if taken_at else None,
+                camera,
+                extractor,
+            )
+
+    def _relative(self, path: Path) -> Optional[Path]:
+        try:
+            return path.relative_to(self.output_root)
+        except ValueError:
+            return None
+
+    def _written(self) -> None:
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_every:
+            self._commit()
+
+    def _commit(self) -> None:
+        self._conn.commit()
+        self._uncommitted = 0
+
+
+def _escape_like(text: str) -> str:
+    """Make text match literally inside a LIKE pattern (ESCAPE '\\')."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
@@ -2,21 +2,57 @@
 
 import argparse
 import logging
+import re
 import sys
+import time
 from pathlib import Path
 from typing import List, Optional
 
-from photo_organizer.scanner import scan_directory
+from photo_organizer import metrics, syscalls
+from photo_organizer.catalog import CATALOG_FILENAME, Catalog
+from photo_organizer.scanner import scan_directory, scan_records
 from photo_organizer.extractors.exif import ExifExtractor
 from photo_organizer.extractors.filename import FilenameExtractor
+from photo_organizer.extractors.isobmff import IsoBmffExtractor
 from photo_organizer.extractors.fallback import FallbackExtractor
 from photo_organizer.date_resolver import DateResolver
+from photo_organizer.filetypes import FileType
 from photo_organizer.organizer import Organizer, TransferMode
-from photo_organizer.duplicates import DuplicateHandler, DuplicateStrategy
+from photo_organizer.perceptual import (
+    DEFAULT_RADIUS,
+    HASH_BITS,
+    NearDuplicateIndex,
+    NearDuplicateStrategy,
+)
+from photo_organizer.profiling import DEFAULT_TOP_FILES, Profiler, SlowFiles
+from photo_organizer.pipeline import (
+    DEFAULT_IO_JOBS,
+    DEFAULT_JOBS,
+    Pipeline,
+    ProgressReporter,
+)
+from photo_organizer.durability import (
+    DEFAULT_BATCH_BYTES,
+    DEFAULT_BATCH_FILES,
+    Durability,
+    DurabilityManager,
+)
+from photo_organizer.duplicates import (
+    ContentDuplicateStrategy,
+    ContentIndex,
+    DuplicateHandler,
+    DuplicateStrategy,
+)
+from photo_organizer.index import INDEX_FILENAME, ScanIndex
+from photo_organizer.journal import JOURNAL_FILENAME, Journal, JournalState, load_journal
+from photo_organizer.metadata_cache import MetadataCache, default_cache_path
+from photo_organizer.verify import ALGORITHMS, Manifest
 from photo_organizer.utils import setup_logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_METRICS_INTERVAL = 30.0
+
 
 def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
     """Parse command-line arguments."""
@@ -28,6 +64,9 @@ Examples:
   %(prog)s --source /path/to/photos --output /organized
   %(prog)s --source /input --output /output --dry-run
   %(prog)s --source /input --output /output --on-duplicate skip
+  %(prog)s --source /input --output /output --incremental
+  %(prog)s --source /input --output /output --jobs 16 --io-jobs 8
+  %(prog)s catalog query --output /output --from 2024-06 --camera iPhone
         """,
     )
 
@@ -58,7 +97,61 @@ Examples:
         "--mode",
         choices=[mode.value for mode in TransferMode],
         default=TransferMode.COPY.value,
-        help="How to transfer files into output: copy (default) or move",
+        help=(
+            "How to transfer files into output: copy (default), move, "
+            "link (hardlink), symlink or reflink (copy-on-write clone)"
+        ),
+    )
+
+    parser.add_argument(
+        "--link-fallback",
+        choices=["copy", "fail"],
+        default="copy",
+        help=(
+            "What link, symlink and reflink modes do when the operation is not "
+            "possible, e.g. across filesystems: copy (default) or fail"
+        ),
+    )
+
+    parser.add_argument(
+        "--verify",
+        choices=sorted(ALGORITHMS),
+        default=None,
+        help=(
+            "Prove every copy is byte-identical: hash the source while copying, "
+            "re-read only the destination, and record digests in a "
+            "sha256sum/b2sum-style manifest under OUTPUT/.photo-organizer/"
+        ),
+    )
+
+    parser.add_argument(
+        "--durability",
+        choices=[level.value for level in Durability],
+        default=Durability.NONE.value,
+        help=(
+            "When transfers are fsynced: none (default, leave it to the OS), "
+            "batch (files and directories in groups; moved sources are only "
+            "removed once their batch is durable) or strict (every file)"
+        ),
+    )
+
+    parser.add_argument(
+        "--sync-batch-files",
+        type=int,
+        default=DEFAULT_BATCH_FILES,
+        metavar="N",
+        help=f"--durability batch: sync every N files (default: {DEFAULT_BATCH_FILES})",
+    )
+
+    parser.add_argument(
+        "--sync-batch-mb",
+        type=int,
+        default=DEFAULT_BATCH_BYTES // (1024 * 1024),
+        metavar="MB",
+        help=(
+            "--durability batch: sync every MB megabytes written "
+            f"(default: {DEFAULT_BATCH_BYTES // (1024 * 1024)})"
+        ),
     )
 
     parser.add_argument(
@@ -68,6 +161,171 @@ Examples:
         help="How to handle duplicate filenames (default: rename)",
     )
 
+    parser.add_argument(
+        "--on-content-duplicate",
+        choices=[strategy.value for strategy in ContentDuplicateStrategy],
+        default=ContentDuplicateStrategy.KEEP.value,
+        help=(
+            "How to handle files byte-identical to one already in the output "
+            "or earlier in this run: keep (default, transfer anyway), skip, "
+            "or link (hardlink to the existing copy). Sources are left in place."
+        ),
+    )
+
+    parser.add_argument(
+        "--near-duplicates",
+        choices=[strategy.value for strategy in NearDuplicateStrategy],
+        default=NearDuplicateStrategy.OFF.value,
+        help=(
+            "Detect visually similar images (recompressed, resized, converted) "
+            "with a perceptual hash: off (default), report (log them and "
+            "transfer anyway) or skip. The first one seen is kept."
+        ),
+    )
+
+    parser.add_argument(
+        "--near-radius",
+        type=int,
+        default=DEFAULT_RADIUS,
+        metavar="BITS",
+        help=(
+            "Largest perceptual hash difference, in bits out of 64, that "
+            f"counts as a near duplicate (default: {DEFAULT_RADIUS})"
+        ),
+    )
+
+    parser.add_argument(
+        "--incremental",
+        "-i",
+        action="store_true",
+        help="Skip source files already organized by a previous run",
+    )
+
+    parser.add_argument(
+        "--index",
+        type=Path,
+        default=None,
+        help=f"Incremental index database (default: OUTPUT/{INDEX_FILENAME})",
+    )
+
+    parser.add_argument(
+        "--catalog",
+        action="store_true",
+        help=(
+            f"Keep a catalog of the output (OUTPUT/{CATALOG_FILENAME}) and use it "
+            "for name and content duplicate checks instead of reading the tree; "
+            "query it with 'catalog query'"
+        ),
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Continue an interrupted run from its journal "
+            f"(OUTPUT/{JOURNAL_FILENAME}): finish or redo in-flight transfers "
+            "and skip files already completed"
+        ),
+    )
+
+    parser.add_argument(
+        "--metadata-cache",
+        type=Path,
+        nargs="?",
+        const=default_cache_path(),
+        default=None,
+        metavar="PATH",
+        help=(
+            "Cache extracted dates across runs, keyed by file identity "
+            f"(default location: {default_cache_path()})"
+        ),
+    )
+
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Parallel metadata extraction workers (default: {DEFAULT_JOBS})",
+    )
+
+    parser.add_argument(
+        "--io-jobs",
+        type=int,
+        default=DEFAULT_IO_JOBS,
+        help=f"Parallel file transfer workers (default: {DEFAULT_IO_JOBS})",
+    )
+
+    parser.add_argument(
+        "--precount",
+        action="store_true",
+        help=(
+            "Count source files in the background so progress can show a "
+            "total (costs a second directory walk)"
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Write run metrics (per-stage latency histograms, throughput, "
+            "extractor hit rates) to PATH, refreshed during the run"
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics-format",
+        choices=metrics.FORMATS,
+        default="json",
+        help=(
+            "Format of --metrics-file: json (default) or prometheus "
+            "(a textfile for node_exporter's textfile collector)"
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=DEFAULT_METRICS_INTERVAL,
+        metavar="SECONDS",
+        help=(
+            "Seconds between --metrics-file refreshes; 0 writes it only at the "
+            f"end (default: {DEFAULT_METRICS_INTERVAL:g})"
+        ),
+    )
+
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Profile the run with cProfile (every thread) and write a pstats "
+            "dump to PATH; the summary lists the slowest files"
+        ),
+    )
+
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="With --profile, also trace allocations and write a tracemalloc "
+        "snapshot to PATH.tracemalloc",
+    )
+
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_TOP_FILES,
+        metavar="N",
+        help=(
+            "With --profile, number of slowest files to list, with the stage "
+            f"or extractor that took the most time (default: {DEFAULT_TOP_FILES})"
+        ),
+    )
+
     parser.add_argument(
         "--log-level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
@@ -78,9 +336,49 @@ Examples:
     return parser.parse_args(args)
 
 
+def _heif_opener_registered() -> bool:
+    """Can Pillow open HEIF (a plugin such as pillow-heif is registered)?"""
+    from PIL import Image
+
+    return ".heic" in Image.registered_extensions()
+
+
+def build_resolver(cache: Optional[MetadataCache] = None) -> DateResolver:
+    """Build a DateResolver with an extractor chain per file type.
+
+    Each type only visits extractors that can succeed for it, so e.g. videos
+    never pay for an EXIF parse. PNG (eXIf chunk) carries EXIF, so it tries
+    it first. The native parser does not read HEIF, so HEIF only tries EXIF
+    when a Pillow plugin can open it.
+    """
+    exif = ExifExtractor()
+    video = IsoBmffExtractor()
+    filename = FilenameExtractor()
+    fallback = FallbackExtractor()
+
+    routes = {
+        FileType.JPEG: [exif, filename, fallback],
+        FileType.TIFF: [exif, filename, fallback],
+        FileType.ISOBMFF: [video, filename, fallback],
+        FileType.PNG: [exif, filename, fallback],
+        FileType.HEIF: (
+            [exif, filename, fallback]
+            if _heif_opener_registered()
+            else [filename, fallback]
+        ),
+        FileType.RIFF: [filename, fallback],
+        FileType.MATROSKA: [filename, fallback],
+    }
+    return DateResolver([exif, video, filename, fallback], routes=routes, cache=cache)
+
+
 def main(args: Optional[List[str]] = None) -> int:
     """Main entry point."""
-    parsed_args = parse_args(args)
+    argv = sys.argv[1:] if args is None else args
+    if argv and argv[0] == "catalog":
+        return catalog_main(argv[1:])
+
+    parsed_args = parse_args(argv)
 
     # Setup logging
     setup_logging(parsed_args.log_level)
@@ -90,74 +388,360 @@ def main(args: Optional[List[str]] = None) -> int:
         logger.error(f"Source directory not found: {parsed_args.source}")
         return 1
 
+    if not 0 <= parsed_args.near_radius < HASH_BITS:
+        logger.error(f"--near-radius must be between 0 and {HASH_BITS - 1}")
+        return 1
+
     if not parsed_args.output.exists():
         logger.info(f"Creating output directory: {parsed_args.output}")
         parsed_args.output.mkdir(parents=True, exist_ok=True)
 
+    journal_path = parsed_args.output / JOURNAL_FILENAME
+    resume_state = None
+    if not parsed_args.dry_run:
+        resume_state = _load_resume_state(parsed_args, journal_path)
+
+    if resume_state is not None:
+        other_modes = resume_state.modes - {parsed_args.mode}
+        if other_modes:
+            logger.error(
+                f"The interrupted run used --mode {', '.join(sorted(other_modes))}; "
+                "resume it with the same mode"
+            )
+            return 1
+
     # Initialize components
-    extractors = [
-        ExifExtractor(),
-        FilenameExtractor(),
-        FallbackExtractor(),
-    ]
-    resolver = DateResolver(extractors)
+    metadata_cache = None
+    if parsed_args.metadata_cache is not None:
+        logger.info(f"Using metadata cache: {parsed_args.metadata_cache}")
+        metadata_cache = MetadataCache(parsed_args.metadata_cache)
+    resolver = build_resolver(metadata_cache)
+
+    catalog = None
+    catalog_path = parsed_args.output / CATALOG_FILENAME
+    # A dry run may read an existing catalog, but never creates one
+    if parsed_args.catalog and (catalog_path.exists() or not parsed_args.dry_run):
+        catalog = Catalog(parsed_args.output)
+        if catalog.created:
+            count = catalog.rebuild(resolver)
+            logger.info(f"Created catalog {catalog.path} with {count} existing files")
 
     strategy = DuplicateStrategy(parsed_args.on_duplicate)
-    duplicate_handler = DuplicateHandler(strategy)
+    duplicate_handler = DuplicateHandler(strategy, catalog=catalog)
+
+    manifest = None
+    if parsed_args.verify and not parsed_args.dry_run:
+        manifest = Manifest(
+            parsed_args.output,
+            parsed_args.verify,
+            fsync=Durability(parsed_args.durability) is not Durability.NONE,
+        )
+        logger.info(
+            f"Verifying transfers with {parsed_args.verify}; manifest: {manifest.path}"
+        )
+
+    durability = DurabilityManager(
+        Durability(parsed_args.durability),
+        batch_files=parsed_args.sync_batch_files,
+        batch_bytes=parsed_args.sync_batch_mb * 1024 * 1024,
+        # A file journaled as done must not lose its manifest line
+        before_durable=manifest.flush if manifest is not None else None,
+    )
 
     organizer = Organizer(
         output_root=parsed_args.output,
         dry_run=parsed_args.dry_run,
         mode=TransferMode(parsed_args.mode),
+        fallback_to_copy=parsed_args.link_fallback == "copy",
+        verify=parsed_args.verify,
+        manifest=manifest,
+        durability=durability,
+        catalog=catalog,
     )
 
-    # Process files
-    logger.info(f"Scanning {parsed_args.source}...")
-    files = list(scan_directory(parsed_args.source))
-    logger.info(f"Found {len(files)} supported files")
+    index = None
+    index_path = parsed_args.index or parsed_args.output / INDEX_FILENAME
+    # A dry run may read an existing index, but never creates one
+    if parsed_args.incremental and (index_path.exists() or not parsed_args.dry_run):
+        logger.info(f"Using incremental index: {index_path}")
+        index = ScanIndex(index_path)
+
+    content_index = None
+    content_strategy = ContentDuplicateStrategy(parsed_args.on_content_duplicate)
+    if content_strategy != ContentDuplicateStrategy.KEEP:
+        content_index = ContentIndex()
+        if catalog is not None:
+            count = content_index.add_catalog(catalog)
+        else:
+            count = content_index.add_directory(parsed_args.output)
+        logger.info(f"Indexed {count} existing files for content duplicates")
+
+    near_index = None
+    near_strategy = NearDuplicateStrategy(parsed_args.near_duplicates)
+    if near_strategy != NearDuplicateStrategy.OFF:
+        near_index = NearDuplicateIndex(parsed_args.near_radius)
+
+    pipeline = Pipeline(
+        resolver,
+        organizer,
+        duplicate_handler,
+        index=index,
+        content_index=content_index,
+        content_strategy=content_strategy,
+        jobs=parsed_args.jobs,
+        io_jobs=parsed_args.io_jobs,
+        near_index=near_index,
+        near_strategy=near_strategy,
+    )
+    if parsed_args.profile is not None:
+        pipeline.slow_files = SlowFiles(parsed_args.profile_top)
+    if not parsed_args.dry_run:
+        pipeline.journal = Journal(
+            journal_path,
+            next_id=resume_state.next_id if resume_state else 1,
+            # Journal writes are as durable as the transfers they describe
+            fsync=durability.level is not Durability.NONE,
+        )
+
+    profiler = None
+    if parsed_args.profile is not None:
+        profiler = Profiler(parsed_args.profile, memory=parsed_args.profile_memory)
+        profiler.start()
+
+    finished = False
+    try:
+        result = _run(parsed_args, pipeline, resume_state)
+        finished = True
+        return result
+    finally:
+        # Sync what was transferred (and remove moved sources) before the
+        # journal can be deleted
+        durability.close()
+        if profiler is not None:
+            profiler.stop()
+        # Keep the journal unless the run completed, so --resume can use it
+        if pipeline.journal is not None:
+            pipeline.journal.close(remove=finished)
+        if index is not None:
+            index.close()
+        if metadata_cache is not None:
+            metadata_cache.close()
+        if manifest is not None:
+            manifest.close()
+        if catalog is not None:
+            catalog.close()
+
+
+def _load_resume_state(
+    parsed_args: argparse.Namespace, journal_path: Path
+) -> Optional[JournalState]:
+    """Replay the journal for --resume, or clear a stale one.
+
+    Returns:
+        JournalState to resume, or None for a fresh run
+    """
+    if not journal_path.exists():
+        if parsed_args.resume:
+            logger.warning(f"No journal found at {journal_path}; starting a full run")
+        return None
+
+    if not parsed_args.resume:
+        logger.warning(
+            f"A previous run was interrupted ({journal_path}); starting over. "
+            "Use --resume to continue it instead."
+        )
+        journal_path.unlink()
+        return None
+
+    resume_state = load_journal(journal_path)
+    logger.info(
+        f"Resuming from {journal_path}: {len(resume_state.in_flight())} "
+        f"transfers in flight, {len(resume_state.handled_sources())} files handled"
+    )
+    return resume_state
+
+
+def _run(
+    parsed_args: argparse.Namespace,
+    pipeline: Pipeline,
+    resume_state: Optional[JournalState] = None,
+) -> int:
+    """Scan the source tree and organize every supported file."""
+    syscalls.reset()
+    metrics.reset()
+    files = scan_records(parsed_args.source)
+    if resume_state is not None:
+        pipeline.replay(resume_state.in_flight())
+        handled = resume_state.handled_sources()
+        files = (record for record in files if str(record.path) not in handled)
 
-    if not files:
+    logger.info(f"Scanning {parsed_args.source}...")
+    progress = ProgressReporter()
+    if parsed_args.precount:
+        progress.precount(scan_directory(parsed_args.source))
+
+    metrics_writer = None
+    if parsed_args.metrics_file is not None:
+        metrics_writer = metrics.MetricsWriter(
+            parsed_args.metrics_file,
+            parsed_args.metrics_format,
+            parsed_args.metrics_interval,
+        )
+        metrics_writer.start()
+
+    started = time.perf_counter()
+    try:
+        stats = pipeline.run(files, progress)
+    finally:
+        progress.close()
+        if metrics_writer is not None:
+            metrics_writer.stop()
+    elapsed = time.perf_counter() - started
+
+    if not stats.scanned and not stats.resumed:
         logger.warning("No files to process")
         return 0
 
-    processed = 0
-    skipped = 0
-    errors = 0
-
-    for i, file_path in enumerate(files, 1):
-        logger.debug(f"Processing ({i}/{len(files)}): {file_path}")
-
-        # Extract metadata
-        metadata = resolver.resolve(file_path)
-        if not metadata:
-            logger.warning(f"Could not determine date for: {file_path}")
-            errors += 1
-            continue
-
-        # Build target path
-        target_path = organizer.build_target_path(file_path, metadata)
-
-        # Handle duplicates
-        resolved_path = duplicate_handler.resolve(target_path)
-        if resolved_path is None:
-            logger.info(f"Skipped (duplicate): {file_path.name}")
-            skipped += 1
-            continue
-
-        # Organize file
-        if organizer.organize_file(file_path, resolved_path):
-            processed += 1
-        else:
-            errors += 1
-
     # Summary
     logger.info("=" * 50)
     logger.info("Processing complete!")
-    logger.info(f"  Processed: {processed}")
-    logger.info(f"  Skipped:   {skipped}")
-    logger.info(f"  Errors:    {errors}")
+    logger.info(f"  Found:     {stats.scanned}")
+    if resume_state is not None:
+        logger.info(f"  Resumed:   {stats.resumed}")
+    logger.info(f"  Processed: {stats.processed}")
+    logger.info(f"  Skipped:   {stats.skipped}")
+    if pipeline.index is not None:
+        logger.info(f"  Unchanged: {stats.unchanged}")
+    if pipeline.near_index is not None:
+        logger.info(f"  Near duplicates: {stats.near_duplicates}")
+    logger.info(f"  Errors:    {stats.errors}")
+    if pipeline.organizer.verify:
+        logger.info(f"  Verified:  {pipeline.organizer.verified}")
+    if pipeline.organizer.copy_methods:
+        methods = ", ".join(
+            f"{method}={count}"
+            for method, count in pipeline.organizer.copy_methods.most_common()
+        )
+        logger.info(f"Copy methods: {methods}")
+    run_metrics = metrics.snapshot()
+    rate = stats.processed / max(elapsed, 1e-9)
+    megabytes = run_metrics.counters[(metrics.BYTES, "")] / (1024 * 1024)
+    logger.info(
+        f"Throughput: {rate:.1f} files/s, {megabytes / max(elapsed, 1e-9):.1f} MB/s "
+        f"({elapsed:.2f}s)"
+    )
+    durability = pipeline.organizer.durability
+    if durability.level is not Durability.NONE:
+        logger.info(f"Durability {durability.summary(elapsed)}")
+    calls = syscalls.snapshot()
+    if calls:
+        per_file = sum(calls.values()) / max(stats.scanned, 1)
+        counts = ", ".join(f"{name}={count}" for name, count in calls.most_common())
+        logger.info(f"Filesystem calls: {counts} ({per_file:.1f} per file)")
+    cache = pipeline.resolver.cache
+    if cache is not None:
+        logger.info(f"Metadata cache: {cache.hits} hits, {cache.misses} misses")
+    logger.info("Extractor routes:")
+    for route, route_stats in sorted(pipeline.resolver.stats.items()):
+        logger.info(f"  {route}: {route_stats.summary()}")
+    hit_rates = run_metrics.hit_rates()
+    if hit_rates:
+        rates = ", ".join(
+            f"{name} {100.0 * hits / attempts:.0f}% ({hits}/{attempts})"
+            for name, (hits, attempts) in sorted(hit_rates.items())
+        )
+        logger.info(f"Extractor hit rates: {rates}")
+    logger.info("Stage timings:")
+    for key, histogram in sorted(run_metrics.histograms.items()):
+        logger.info(f"  {metrics.stage_name(key)}: {histogram.summary()}")
+    if pipeline.slow_files is not None:
+        logger.info("Slowest files:")
+        for slow in pipeline.slow_files.slowest():
+            logger.info(
+                f"  {slow.seconds * 1000:.1f}ms {slow.path} "
+                f"({slow.stage}: {slow.stage_seconds * 1000:.1f}ms)"
+            )
+
+    # Files transferred but not made durable (--durability batch)
+    return 0 if stats.errors == 0 and durability.errors == 0 else 1
+
+
+def _date_prefix(value: str) -> str:
+    """argparse type for catalog dates: YYYY, YYYY-MM or YYYY-MM-DD."""
+    if not re.fullmatch(r"\d{4}(-\d{2}(-\d{2})?)?", value):
+        raise argparse.ArgumentTypeError(f"expected YYYY, YYYY-MM or YYYY-MM-DD: {value}")
+    return value
+
+
+def parse_catalog_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse arguments of the catalog subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="photo-organizer catalog",
+        description="Query or rebuild the catalog of an organized library.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query = commands.add_parser(
+        "query", help="List cataloged files by date and camera (reads only the catalog)"
+    )
+    query.add_argument(
+        "--from", dest="start", type=_date_prefix, help="Earliest date (YYYY[-MM[-DD]])"
+    )
+    query.add_argument(
+        "--to",
+        dest="end",
+        type=_date_prefix,
+        help="Latest date, inclusive (YYYY[-MM[-DD]])",
+    )
+    query.add_argument("--camera", help="Camera model contains this text (any case)")
+    query.add_argument(
+        "--count", action="store_true", help="Print only the number of matching files"
+    )
+
+    commands.add_parser(
+        "rebuild", help="Re-create the catalog from the files in the output tree"
+    )
+
+    for command in commands.choices.values():
+        command.add_argument(
+            "--output", "-o", type=Path, required=True, help="Organized output directory"
+        )
+        command.add_argument(
+            "--log-level",
+            choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+            default="INFO",
+            help="Logging verbosity (default: INFO)",
+        )
+
+    return parser.parse_args(args)
+
+
+def catalog_main(args: Optional[List[str]] = None) -> int:
+    """Entry point of the catalog subcommands."""
+    parsed_args = parse_catalog_args(args)
+    setup_logging(parsed_args.log_level)
+
+    catalog_path = parsed_args.output / CATALOG_FILENAME
+    if parsed_args.command == "query" and not catalog_path.exists():
+        logger.error(
+            f"No catalog at {catalog_path}; run with --catalog or 'catalog rebuild'"
+        )
+        return 1
 
-    return 0 if errors == 0 else 1
+    with Catalog(parsed_args.output) as catalog:
+        if parsed_args.command == "rebuild":
+            count = catalog.rebuild(build_resolver())
+            logger.info(f"Cataloged {count} files in {catalog.path}")
+            return 0
+
+        entries = catalog.query(parsed_args.start, parsed_args.end, parsed_args.camera)
+        if parsed_args.count:
+            print(len(entries))
+            return 0
+        for entry in entries:
+            date = entry.date.isoformat() if entry.date else "-"
+            print(f"{date}\t{entry.camera or '-'}\t{entry.path}")
+    return 0
 
 
 if __name__ == "__main__":
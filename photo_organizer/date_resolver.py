@@ -1,25 +1,115 @@
 """Date resolution with priority chain of extractors."""
 
+import hashlib
 import logging
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, List, Optional, Tuple
 
+from photo_organizer import metrics, syscalls
 from photo_organizer.extractors.base import ExtractionResult, MetadataExtractor
+from photo_organizer.filetypes import SNIFF_BYTES, FileType, detect_file_type
+from photo_organizer.metadata_cache import MetadataCache
+from photo_organizer.probe import FileProbe
 
 logger = logging.getLogger(__name__)
 
+# Route name used for files without a dedicated chain
+DEFAULT_ROUTE = "default"
+
+# Bump when the way results are keyed in the metadata cache changes
+# (2: results that depend on the path are cached per path)
+CACHE_FORMAT = 2
+
+
+@dataclass
+class RouteStats:
+    """Hit/miss counters for one extractor route."""
+
+    files: int = 0
+    resolved: int = 0
+    unresolved: int = 0
+    extractor_hits: Counter = field(default_factory=Counter)
+    extractor_misses: Counter = field(default_factory=Counter)
+
+    def summary(self) -> str:
+        """One-line summary suitable for logging."""
+        hits = ", ".join(f"{name}={count}" for name, count in self.extractor_hits.items())
+        return (
+            f"{self.files} files, {self.resolved} resolved ({hits or 'none'}), "
+            f"{self.unresolved} unresolved"
+        )
+
 
 class DateResolver:
     """Resolves file date using a priority chain of extractors."""
 
-    def __init__(self, extractors: List[MetadataExtractor]):
+    def __init__(
+        self,
+        extractors: List[MetadataExtractor],
+        routes: Optional[Dict[FileType, List[MetadataExtractor]]] = None,
+        cache: Optional[MetadataCache] = None,
+    ):
         """Initialize with ordered list of extractors.
 
-        Extractors are tried in order until one succeeds.
+        Extractors are tried in order until one succeeds. When routes are
+        given, each file's type is detected (magic bytes, then extension)
+        and the matching chain is used instead; types without a route fall
+        back to the default extractors. With a cache, results of unchanged
+        files are reused without opening them.
         """
         self.extractors = extractors
+        self.routes = routes or {}
+        self.cache = cache
+        self.stats: Dict[str, RouteStats] = {}
+        # resolve() may be called from several metadata workers at once
+        self._stats_lock = threading.Lock()
+        self._chain = self.chain_signature()
+
+    def chain_signature(self) -> str:
+        """Fingerprint of the extractor chains, used to version cache entries.
+
+        Changes whenever an extractor is added, removed, reordered, rerouted
+        or has its version bumped.
+        """
+        parts = [
+            f"format={CACHE_FORMAT}",
+            _describe_chain(DEFAULT_ROUTE, self.extractors),
+        ]
+        for file_type in sorted(self.routes, key=lambda t: t.value):
+            parts.append(_describe_chain(file_type.value, self.routes[file_type]))
+        return hashlib.blake2b("\n".join(parts).encode(), digest_size=8).hexdigest()
+
+    def route_for(
+        self, file_path: Path, probe: Optional[FileProbe] = None
+    ) -> Tuple[str, List[MetadataExtractor]]:
+        """Return the route name and extractor chain for a file.
+
+        With a probe, the file type is sniffed from its header buffer.
+        """
+        if not self.routes:
+            return DEFAULT_ROUTE, self.extractors
+
+        header = None
+        if probe is not None:
+            try:
+                header = probe.header[:SNIFF_BYTES]
+            except OSError as e:
+                logger.debug(f"Cannot sniff {file_path}: {e}")
+                header = b""
+        file_type = detect_file_type(file_path, header)
+        chain = self.routes.get(file_type)
+        if chain is None:
+            return DEFAULT_ROUTE, self.extractors
+        return file_type.value, chain
 
-    def resolve(self, file_path: Path) -> Optional[ExtractionResult]:
+    def resolve(
+        self, file_path: Path, stat: Optional[os.stat_result] = None
+    ) -> Optional[ExtractionResult]:
         """Resolve date and camera model for a file.
 
         Tries each extractor in priority order:
@@ -29,22 +119,100 @@ class DateResolver:
 
         Args:
             file_path: Path to the media file
+            stat: Stat result of the file, if already known (cache key)
 
         Returns:
-            ExtractionResult with date and optional camera_model, or None
+            ExtractionResult with date, optional camera_model and the name of
+            the winning extractor, or None
         """
-        for extractor in self.extractors:
+        if self.cache is None:
+            return self._resolve(file_path, stat)[0]
+
+        if stat is None:
+            syscalls.count(syscalls.STAT)
+            stat = file_path.stat()
+        cached = self.cache.get(stat, self._chain, file_path)
+        if cached is not None:
+            logger.debug(f"Metadata cache hit for {file_path.name}")
+            return cached if cached.date is not None else None
+
+        result, reads_path = self._resolve(file_path, stat)
+        # A renamed or moved file must not get the date of its old path
+        self.cache.put(stat, self._chain, result, file_path if reads_path else None)
+        return result
+
+    def _resolve(
+        self, file_path: Path, stat: Optional[os.stat_result]
+    ) -> Tuple[Optional[ExtractionResult], bool]:
+        """Run the extractor chain for a file.
+
+        All extractors share one FileProbe, so the file is opened and its
+        header read at most once for the whole chain.
+
+        Returns:
+            The result (or None), and whether an extractor that reads the
+            file's path was consulted, making the result depend on it
+        """
+        with FileProbe(file_path, stat) as probe:
+            return self._run_chain(file_path, probe)
+
+    def _run_chain(
+        self, file_path: Path, probe: FileProbe
+    ) -> Tuple[Optional[ExtractionResult], bool]:
+        route, extractors = self.route_for(file_path, probe)
+        misses = []
+        reads_path = False
+
+        for extractor in extractors:
+            if isinstance(extractor, MetadataExtractor) and extractor.reads_path:
+                reads_path = True
+            started = time.perf_counter()
             try:
-                result = extractor.extract(file_path)
+                if isinstance(extractor, MetadataExtractor):
+                    result = extractor.extract_probe(probe)
+                else:
+                    result = extractor.extract(file_path)
+                metrics.observe(
+                    metrics.EXTRACT, time.perf_counter() - started, extractor.name
+                )
                 if result:
                     logger.debug(
                         f"{extractor.name} succeeded for {file_path.name}: "
                         f"{result.date}, camera={result.camera_model}"
                     )
-                    return result
+                    self._record(route, misses, extractor.name)
+                    result.extractor = extractor.name
+                    return result, reads_path
             except Exception as e:
+                metrics.observe(
+                    metrics.EXTRACT, time.perf_counter() - started, extractor.name
+                )
                 logger.debug(f"{extractor.name} failed for {file_path}: {e}")
-                continue
+            misses.append(extractor.name)
 
+        self._record(route, misses, None)
         logger.warning(f"Could not extract date for {file_path}")
-        return None
+        return None, reads_path
+
+    def _record(self, route: str, misses: List[str], winner: Optional[str]) -> None:
+        """Update the route counters for one resolved (or unresolved) file."""
+        for name in misses:
+            metrics.count(metrics.EXTRACTOR_MISSES, label=name)
+        if winner is not None:
+            metrics.count(metrics.EXTRACTOR_HITS, label=winner)
+        with self._stats_lock:
+            stats = self.stats.setdefault(route, RouteStats())
+            stats.files += 1
+            stats.extractor_misses.update(misses)
+            if winner is None:
+                stats.unresolved += 1
+            else:
+                stats.resolved += 1
+                stats.extractor_hits[winner] += 1
+
+
+def _describe_chain(route: str, extractors: List[MetadataExtractor]) -> str:
+    names = ",".join(
+        f"{extractor.name}@{getattr(extractor, 'version', 0)}" for extractor in extractors
+    )
+    return f"{route}={names}"
@@ -1,9 +1,15 @@
 """Duplicate file handling strategies."""
 
+import hashlib
 import logging
+import os
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
+
+from photo_organizer import syscalls
+from photo_organizer.catalog import Catalog
+from photo_organizer.scanner import scan_records
 
 logger = logging.getLogger(__name__)
 
@@ -17,10 +23,27 @@ class DuplicateStrategy(Enum):
 
 
 class DuplicateHandler:
-    """Handle duplicate filename conflicts."""
+    """Handle duplicate filename conflicts.
+
+    Occupied names are tracked in memory per target directory: each
+    directory is listed once, the first time it is touched, and every path
+    handed out by resolve() is claimed immediately. This assumes the handler
+    is the only writer to the output tree during a run.
+
+    With a catalog, occupied names come from it instead of directory
+    listings. The catalog can be stale (files added by hand or by a run
+    without --catalog), so a name it reports as free is confirmed with an
+    lstat before it is handed out; nothing is ever overwritten on its word.
+    """
 
-    def __init__(self, strategy: DuplicateStrategy):
+    def __init__(self, strategy: DuplicateStrategy, catalog: Optional[Catalog] = None):
         self.strategy = strategy
+        self.catalog = catalog
+        self._names: Dict[Path, Set[str]] = {}
+        # Directories whose names came from the catalog rather than a listing
+        self._cataloged: Set[Path] = set()
+        self._stale_warned = False
+        self._next_counter: Dict[Tuple[Path, str, str], int] = {}
 
     def resolve(self, target_path: Path) -> Optional[Path]:
         """Resolve duplicate filename conflict.
@@ -31,7 +54,9 @@ class DuplicateHandler:
         Returns:
             Resolved path (may be modified), or None if skipping
         """
-        if not target_path.exists():
+        names = self._directory_names(target_path.parent)
+        if not self._is_taken(target_path.parent, names, target_path.name):
+            names.add(target_path.name)
             return target_path
 
         if self.strategy == DuplicateStrategy.SKIP:
@@ -47,17 +72,200 @@ class DuplicateHandler:
 
         return target_path
 
+    def claim(self, target_path: Path) -> None:
+        """Mark a path as occupied, e.g. a transfer planned by an earlier run."""
+        self._directory_names(target_path.parent).add(target_path.name)
+
+    def release(self, target_path: Path) -> None:
+        """Give back a name returned by resolve() that was never written."""
+        names = self._names.get(target_path.parent)
+        if names is not None:
+            names.discard(target_path.name)
+
+    def _directory_names(self, directory: Path) -> Set[str]:
+        """Return the set of occupied names in directory, listing it once."""
+        names = self._names.get(directory)
+        if names is None and self.catalog is not None:
+            names = self.catalog.names_in(directory)
+            if names is not None:
+                self._names[directory] = names
+                self._cataloged.add(directory)
+        if names is None:
+            syscalls.count(syscalls.SCANDIR)
+            try:
+                with os.scandir(directory) as entries:
+                    names = {entry.name for entry in entries}
+            except FileNotFoundError:
+                names = set()
+            self._names[directory] = names
+        return names
+
+    def _is_taken(self, directory: Path, names: Set[str], name: str) -> bool:
+        """Whether name is occupied, checking the disk if the catalog says not."""
+        if name in names:
+            return True
+        if directory not in self._cataloged:
+            return False
+        syscalls.count(syscalls.LSTAT)
+        if not os.path.lexists(directory / name):
+            return False
+        names.add(name)
+        if not self._stale_warned:
+            self._stale_warned = True
+            logger.warning(
+                f"Catalog is out of date ({directory / name} is not in it); "
+                "run 'catalog rebuild'"
+            )
+        return True
+
     def _generate_unique_path(self, target_path: Path) -> Path:
         """Generate a unique path by appending _N before extension."""
         stem = target_path.stem
         suffix = target_path.suffix
         parent = target_path.parent
+        names = self._directory_names(parent)
 
-        counter = 1
-        while True:
-            new_name = f"{stem}_{counter}{suffix}"
-            new_path = parent / new_name
-            if not new_path.exists():
-                logger.info(f"Renaming duplicate to: {new_path.name}")
-                return new_path
+        # Resume from the last counter handed out for this name
+        key = (parent, stem, suffix)
+        counter = self._next_counter.get(key, 1)
+        while self._is_taken(parent, names, f"{stem}_{counter}{suffix}"):
             counter += 1
+
+        new_name = f"{stem}_{counter}{suffix}"
+        names.add(new_name)
+        self._next_counter[key] = counter + 1
+
+        new_path = parent / new_name
+        logger.info(f"Renaming duplicate to: {new_path.name}")
+        return new_path
+
+
+class ContentDuplicateStrategy(Enum):
+    """Strategy for files whose content already exists in the output."""
+
+    KEEP = "keep"
+    SKIP = "skip"
+    LINK = "link"
+
+
+class _ContentEntry:
+    """A known file: where to read its bytes, and where it lives in output."""
+
+    __slots__ = ("path", "target")
+
+    def __init__(self, path: Path, target: Path):
+        self.path = path
+        self.target = target
+
+
+class ContentIndex:
+    """Find byte-identical files while hashing as little data as possible.
+
+    Candidates are compared in stages: first by size, then by a hash of the
+    first and last block, and only files that still collide are hashed in
+    full. Digests are cached, so each file is read at most once per stage.
+    """
+
+    def __init__(self, block_size: int = 64 * 1024):
+        self.block_size = block_size
+        # Where full digests of cataloged files are read from and saved to
+        self.catalog: Optional[Catalog] = None
+        self._by_size: Dict[int, List[_ContentEntry]] = {}
+        self._partial: Dict[Path, bytes] = {}
+        self._full: Dict[Path, bytes] = {}
+
+    def add(
+        self, path: Path, size: Optional[int] = None, target: Optional[Path] = None
+    ) -> None:
+        """Register a known file.
+
+        Args:
+            path: Where the file's bytes can be read now
+            size: File size, if already known
+            target: Location reported for matches (defaults to path); it is
+                also read if path disappears, e.g. after a move
+        """
+        if size is None:
+            syscalls.count(syscalls.STAT)
+            size = path.stat().st_size
+        entry = _ContentEntry(path, target or path)
+        self._by_size.setdefault(size, []).append(entry)
+
+    def add_directory(self, root: Path) -> int:
+        """Register every supported file under root. Returns the count."""
+        count = 0
+        # Sizes come from the scan's own stat calls, made in parallel
+        for record in scan_records(root):
+            self.add(record.path, record.size)
+            count += 1
+        return count
+
+    def add_catalog(self, catalog: Catalog) -> int:
+        """Register every file of a catalog, without touching the filesystem.
+
+        Digests the catalog already knows are reused, and full digests
+        computed later are saved back to it. Returns the count.
+        """
+        self.catalog = catalog
+        count = 0
+        for entry in catalog.entries():
+            self.add(entry.path, entry.size)
+            if entry.digest:
+                self._full[entry.path] = bytes.fromhex(entry.digest)
+            count += 1
+        return count
+
+    def find(self, path: Path, size: Optional[int] = None) -> Optional[Path]:
+        """Return the target of a known file byte-identical to path, if any."""
+        if size is None:
+            syscalls.count(syscalls.STAT)
+            size = path.stat().st_size
+
+        candidates = self._by_size.get(size)
+        if not candidates:
+            return None
+
+        partial = self._digest(path, path, full=False)
+        for entry in candidates:
+            if entry.path == path:
+                continue
+            try:
+                if self._digest(entry.path, entry.target, full=False) != partial:
+                    continue
+                if self._digest(entry.path, entry.target, full=True) == self._digest(
+                    path, path, full=True
+                ):
+                    return entry.target
+            except OSError as e:
+                logger.debug(f"Cannot compare {path} with {entry.target}: {e}")
+        return None
+
+    def _digest(self, path: Path, alternate: Path, full: bool) -> bytes:
+        cache = self._full if full else self._partial
+        digest = cache.get(path)
+        if digest is None:
+            try:
+                digest = self._hash_file(path, full)
+            except FileNotFoundError:
+                if alternate == path:
+                    raise
+                digest = self._hash_file(alternate, full)
+            cache[path] = digest
+            if full and self.catalog is not None:
+                self.catalog.set_digest(alternate, digest.hex())
+        return digest
+
+    def _hash_file(self, path: Path, full: bool) -> bytes:
+        hasher = hashlib.blake2b(digest_size=32)
+        syscalls.count(syscalls.OPEN)
+        with open(path, "rb") as fh:
+            if full:
+                for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+            else:
+                hasher.update(fh.read(self.block_size))
+                fh.seek(0, os.SEEK_END)
+                if fh.tell() > self.block_size:
+                    fh.seek(-self.block_size, os.SEEK_END)
+                    hasher.update(fh.read(self.block_size))
+        return hasher.digest()
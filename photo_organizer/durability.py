@@ -0,0 +1,277 @@
+"""fsync policy for transferred files and deferred removal of moved sources."""
+
+import errno
+import logging
+import os
+import threading
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Callable, List, Optional, Set, Tuple
+
+from photo_organizer import metrics, syscalls
+
+logger = logging.getLogger(__name__)
+
+
+class Durability(Enum):
+    """When transferred files are forced to stable storage."""
+
+    NONE = "none"  # leave it to the OS (fastest, a crash can lose moves)
+    BATCH = "batch"  # fsync in groups; moved sources removed once synced
+    STRICT = "strict"  # fsync every file and directory before moving on
+
+
+DEFAULT_BATCH_FILES = 256
+DEFAULT_BATCH_BYTES = 256 * 1024 * 1024
+
+# A committed transfer: (target, source, unlink source once durable,
+# callback once durable)
+_Pending = Tuple[Path, Optional[Path], bool, Optional[Callable[[], None]]]
+
+# Open flag that refuses symlinks with ELOOP (POSIX)
+_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
+# Can directories be opened for fsync (POSIX)?
+_CAN_SYNC_DIRECTORIES = hasattr(os, "O_DIRECTORY")
+
+
+class DurabilityManager:
+    """Apply a Durability level to transfers reported through commit().
+
+    With BATCH, targets are collected until batch_files files or
+    batch_bytes bytes are pending; the files are then fsynced, followed by
+    their directories, and only then are the sources of cross-device moves
+    unlinked. A power loss therefore never loses a file: either the target
+    is durable or the source still exists. Safe to share between threads.
+
+    A file that cannot be synced (or whose source cannot be removed) is
+    logged and counted in errors; the rest of its batch is unaffected. Its
+    on_durable callback is not called, so a journaled transfer stays in
+    flight and is redone by --resume.
+    """
+
+    def __init__(
+        self,
+        level: Durability = Durability.NONE,
+        batch_files: int = DEFAULT_BATCH_FILES,
+        batch_bytes: int = DEFAULT_BATCH_BYTES,
+        before_durable: Optional[Callable[[], None]] = None,
+    ):
+        """Initialize the manager.
+
+        Args:
+            level: When transferred files are synced
+            batch_files: Files per batch with Durability.BATCH
+            batch_bytes: Bytes per batch with Durability.BATCH
+            before_durable: Called before transfers are reported durable
+                (see commit), to persist what they depend on, such as the
+                manifest lines of verified files
+        """
+        self.level = level
+        self.batch_files = max(1, batch_files)
+        self.batch_bytes = batch_bytes
+        self.before_durable = before_durable
+        self.files_synced = 0
+        self.directories_synced = 0
+        self.batches = 0
+        self.errors = 0
+        self.sync_seconds = 0.0
+        self._pending: List[_Pending] = []
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+
+    def commit(
+        self,
+        target: Path,
+        size: Optional[int] = None,
+        source: Optional[Path] = None,
+        unlink_source: bool = False,
+        on_durable: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Report a finished transfer.
+
+        Args:
+            target: File written (or renamed/linked) into the output
+            size: Bytes written, if known (counts towards batch_bytes)
+            source: Source of a move; its directory is synced too, since
+                the rename or unlink changed it
+            unlink_source: Remove source once target is durable (a move
+                that had to copy the data)
+            on_durable: Called once the transfer is complete under this
+                policy: target synced and source removed (e.g. to journal
+                it as done); right away with Durability.NONE
+
+        Raises:
+            OSError: With Durability.STRICT, if this transfer cannot be
+                made durable
+        """
+        if self.level is Durability.NONE:
+            if unlink_source:
+                _unlink(source)
+            if on_durable is not None:
+                if self.before_durable is not None:
+                    self.before_durable()
+                on_durable()
+            return
+
+        entry = (target, source, unlink_source, on_durable)
+        if self.level is Durability.STRICT:
+            failures = self._sync([entry])
+            if failures:
+                raise failures[0]
+            return
+
+        if size is None:
+            syscalls.count(syscalls.STAT)
+            size = os.stat(target).st_size
+
+        with self._lock:
+            self._pending.append(entry)
+            self._pending_bytes += size
+            full = (
+                len(self._pending) >= self.batch_files
+                or self._pending_bytes >= self.batch_bytes
+            )
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Make every pending transfer durable and remove deferred sources.
+
+        Entries that fail are logged and counted in errors, not raised: the
+        caller is whichever transfer happened to fill the batch.
+        """
+        with self._lock:
+            batch = self._pending
+            self._pending = []
+            self._pending_bytes = 0
+        if batch:
+            failures = self._sync(batch)
+            if failures:
+                with self._lock:
+                    self.errors += len(failures)
+
+    def close(self) -> None:
+        """Flush what is pending; errors are logged, never raised."""
+        try:
+            self.flush()
+        except Exception as e:
+            # Let the caller go on closing the journal and indexes
+            logger.error(f"Cannot flush pending transfers: {e}")
+
+    def summary(self, elapsed: float) -> str:
+        """One-line cost report for the run summary."""
+        share = 100.0 * self.sync_seconds / elapsed if elapsed > 0 else 0.0
+        summary = (
+            f"{self.level.value}: {self.files_synced} file and "
+            f"{self.directories_synced} directory fsyncs in {self.batches} "
+            f"batches, {self.sync_seconds:.2f}s in fsync ({share:.1f}% of run time)"
+        )
+        if self.errors:
+            summary += f", {self.errors} files failed to sync"
+        return summary
+
+    def _sync(self, batch: List[_Pending]) -> List[OSError]:
+        """Sync a batch, entry by entry; returns the errors of failed entries."""
+        started = time.perf_counter()
+        failures: List[OSError] = []
+        synced: List[_Pending] = []
+        directories: Set[Path] = set()
+        for entry in batch:
+            target, source, unlink_source, _ = entry
+            try:
+                _fsync_file(target)
+            except OSError as e:
+                # Keep any deferred source: the target may not be durable
+                logger.error(f"Cannot sync {target}: {e}")
+                failures.append(e)
+                continue
+            synced.append(entry)
+            directories.add(target.parent)
+            if source is not None and not unlink_source:
+                # Renamed: the old directory entry is gone as well
+                directories.add(source.parent)
+        for directory in sorted(directories):
+            _fsync_directory(directory)
+
+        # Targets are durable: now the sources can go
+        durable: List[_Pending] = []
+        unlinked: Set[Path] = set()
+        for entry in synced:
+            _, source, unlink_source, _ = entry
+            if unlink_source:
+                try:
+                    _unlink(source)
+                except OSError as e:
+                    logger.error(f"Cannot remove moved source {source}: {e}")
+                    failures.append(e)
+                    continue
+                unlinked.add(source.parent)
+            durable.append(entry)
+        for directory in sorted(unlinked):
+            _fsync_directory(directory)
+        if self.before_durable is not None and durable:
+            try:
+                self.before_durable()
+            except OSError as e:
+                logger.error(f"Cannot persist state of {len(durable)} transfers: {e}")
+                failures.extend(e for _ in durable)
+                durable = []
+        for _, _, _, on_durable in durable:
+            if on_durable is not None:
+                on_durable()
+
+        elapsed = time.perf_counter() - started
+        metrics.observe(metrics.FSYNC, elapsed)
+        with self._lock:
+            self.files_synced += len(synced)
+            self.directories_synced += len(directories) + len(unlinked)
+            self.batches += 1
+            self.sync_seconds += elapsed
+        logger.debug(f"Synced {len(synced)} files in {elapsed:.3f}s")
+        return failures
+
+
+def _fsync_file(path: Path) -> None:
+    """Persist a transferred file; a symlink is left to its directory's fsync.
+
+    Opening a symlink would follow it (and fail if it dangles), syncing a
+    file that is not part of the output at all.
+    """
+    try:
+        _fsync_path(path, _NOFOLLOW)
+    except OSError as e:
+        if e.errno != errno.ELOOP:
+            raise
+        # A symlink: its target string is written with its directory entry
+
+
+def _fsync_path(path: Path, flags: int = 0) -> None:
+    syscalls.count(syscalls.OPEN)
+    fd = os.open(path, os.O_RDONLY | flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist directory entries (new names, renames, unlinks)."""
+    if not _CAN_SYNC_DIRECTORIES:
+        return
+    try:
+        _fsync_path(directory)
+    except OSError as e:
+        # Some filesystems (e.g. certain network mounts) refuse this
+        logger.debug(f"Cannot fsync directory {directory}: {e}")
+
+
+def _unlink(path: Optional[Path]) -> None:
+    if path is None:
+        return
+    try:
+        syscalls.count(syscalls.UNLINK)
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
@@ -6,6 +6,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from photo_organizer.probe import FileProbe
+
 
 @dataclass
 class ExtractionResult:
@@ -13,11 +15,20 @@ class ExtractionResult:
 
     date: Optional[datetime] = None
     camera_model: Optional[str] = None
+    # Name of the extractor that produced this result (set by DateResolver)
+    extractor: Optional[str] = None
 
 
 class MetadataExtractor(ABC):
     """Abstract base class for metadata extractors."""
 
+    # Bump when an extractor's results change, to invalidate cached results
+    version = 1
+
+    # Results depend on the file's path (name or folders), not only on its
+    # contents and stat, so a cached result must not outlive a rename
+    reads_path = False
+
     @abstractmethod
     def extract(self, file_path: Path) -> Optional[ExtractionResult]:
         """Extract metadata from a file.
@@ -30,6 +41,22 @@ class MetadataExtractor(ABC):
         """
         pass
 
+    def extract_probe(self, probe: FileProbe) -> Optional[ExtractionResult]:
+        """Extract metadata through a probe shared with other extractors.
+
+        Extractors that read file contents or stat the file override this
+        to use the probe's handle, header buffer and cached stat result.
+        The default suits path-only extractors and keeps older extractors
+        that only implement extract() working.
+
+        Args:
+            probe: Open probe of the media file
+
+        Returns:
+            ExtractionResult if successful, None otherwise
+        """
+        return self.extract(probe.path)
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -1,14 +1,14 @@
-"""EXIF metadata extractor using Pillow."""
+"""EXIF metadata extractor with a native header parser and Pillow fallback."""
 
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from PIL import Image
-from PIL.ExifTags import TAGS
-
 from photo_organizer.extractors.base import ExtractionResult, MetadataExtractor
+from photo_organizer.extractors.exif_parser import ExifParseError, read_exif
+from photo_organizer.probe import FileProbe
+from photo_organizer.utils import combine_make_model
 
 logger = logging.getLogger(__name__)
 
@@ -22,26 +22,59 @@ class ExifExtractor(MetadataExtractor):
 
     def extract(self, file_path: Path) -> Optional[ExtractionResult]:
         """Extract metadata from image EXIF data."""
+        with FileProbe(file_path) as probe:
+            return self.extract_probe(probe)
+
+    def extract_probe(self, probe: FileProbe) -> Optional[ExtractionResult]:
+        """Extract metadata from image EXIF data.
+
+        JPEG and TIFF-based files (including most RAW formats) are parsed
+        natively from their headers. Other formats, or headers the native
+        parser rejects, are handed to Pillow. Both read through the probe.
+        """
+        file_path = probe.path
         try:
-            with Image.open(file_path) as img:
-                exif = img._getexif()
-                if not exif:
-                    return None
+            exif = self._read_native(probe)
+            if exif is None:
+                exif = self._read_with_pillow(probe)
+            if not exif:
+                return None
 
-                # Extract date
-                date = self._extract_date(exif)
-                if not date:
-                    return None
+            # Extract date
+            date = self._extract_date(exif)
+            if not date:
+                return None
 
-                # Extract camera model
-                camera_model = self._extract_camera_model(exif)
+            # Extract camera model
+            camera_model = self._extract_camera_model(exif)
 
-                return ExtractionResult(date=date, camera_model=camera_model)
+            return ExtractionResult(date=date, camera_model=camera_model)
 
         except Exception as e:
             logger.debug(f"EXIF extraction failed for {file_path}: {e}")
             return None
 
+    def _read_native(self, probe: FileProbe) -> Optional[dict]:
+        """Read EXIF tags with the header-only parser.
+
+        Returns None when the format is unsupported or the header is malformed.
+        """
+        try:
+            return read_exif(probe)
+        except ExifParseError as e:
+            logger.debug(f"Native EXIF parse failed for {probe.path}: {e}")
+            return None
+
+    def _read_with_pillow(self, probe: FileProbe) -> Optional[dict]:
+        """Read EXIF tags through Pillow (slow path)."""
+        # Imported lazily: Pillow is only needed for formats the native
+        # parser does not handle
+        from PIL import Image
+
+        probe.seek(0)
+        with Image.open(probe) as img:
+            return img._getexif()
+
     def _extract_date(self, exif: dict) -> Optional[datetime]:
         """Extract date from EXIF tags."""
         # Priority: DateTimeOriginal > DateTimeDigitized > DateTime
@@ -64,21 +97,7 @@ class ExifExtractor(MetadataExtractor):
 
     def _extract_camera_model(self, exif: dict) -> Optional[str]:
         """Extract camera make and model from EXIF."""
-        make = exif.get(0x010F, "")  # Make
-        model = exif.get(0x0110, "")  # Model
-
-        make = make.strip() if make else ""
-        model = model.strip() if model else ""
-
-        if make and model:
-            if model.startswith(make):
-                return model
-            return f"{make} {model}".strip()
-
-        if model:
-            return model
-
-        if make:
-            return make
-
-        return None
+        return combine_make_model(
+            exif.get(0x010F, ""),  # Make
+            exif.get(0x0110, ""),  # Model
+        )
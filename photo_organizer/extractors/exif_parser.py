@@ -0,0 +1,206 @@
+"""Minimal header-only EXIF reader for JPEG and TIFF-based files.
+
+Only the handful of tags needed for organizing are decoded. The reader walks
+JPEG segment headers up to the APP1 "Exif" segment, or the IFD chain of a
+TIFF container (TIFF, NEF, CR2, ARW, DNG), reading a few KB at most and never
+touching image data.
+"""
+
+import struct
+from typing import BinaryIO, Callable, Dict, Optional
+
+# IFD0 tags
+TAG_MAKE = 0x010F
+TAG_MODEL = 0x0110
+TAG_DATETIME = 0x0132
+TAG_EXIF_IFD = 0x8769
+# Exif sub-IFD tags
+TAG_DATETIME_ORIGINAL = 0x9003
+TAG_DATETIME_DIGITIZED = 0x9004
+
+# Tags are accepted from either IFD (some writers put dates in IFD0);
+# values in the Exif IFD win, as with Pillow's _getexif()
+WANTED_TAGS = {
+    TAG_MAKE,
+    TAG_MODEL,
+    TAG_DATETIME,
+    TAG_DATETIME_ORIGINAL,
+    TAG_DATETIME_DIGITIZED,
+}
+
+TYPE_ASCII = 2
+TYPE_LONG = 4
+TYPE_IFD = 13
+
+# Read-ahead for TIFF containers; IFD0 and the Exif IFD normally live here
+TIFF_HEADER_READ = 64 * 1024
+# Give up on files with an absurd number of IFD entries (corrupt data)
+MAX_IFD_ENTRIES = 1024
+
+JPEG_SOI = b"\xff\xd8"
+TIFF_LITTLE_ENDIAN = b"II*\x00"
+TIFF_BIG_ENDIAN = b"MM\x00*"
+EXIF_HEADER = b"Exif\x00\x00"
+
+
+class ExifParseError(ValueError):
+    """Raised when a JPEG/TIFF header is malformed."""
+
+
+ReadAt = Callable[[int, int], bytes]
+
+
+def read_exif(fh: BinaryIO) -> Optional[Dict[int, str]]:
+    """Read date and camera tags from an open binary file.
+
+    Args:
+        fh: File object positioned anywhere; it is seeked as needed
+
+    Returns:
+        Mapping of tag id to string value (possibly empty) for JPEG and TIFF
+        files, or None if the file is neither and another reader should be
+        used.
+
+    Raises:
+        ExifParseError: If the file looks like JPEG/TIFF but is malformed
+    """
+    fh.seek(0)
+    head = fh.read(4)
+
+    if head[:2] == JPEG_SOI:
+        segment = _find_jpeg_exif_segment(fh)
+        if segment is None:
+            return {}
+        return _parse_tiff(_bytes_reader(segment))
+
+    if head in (TIFF_LITTLE_ENDIAN, TIFF_BIG_ENDIAN):
+        fh.seek(0)
+        return _parse_tiff(_file_reader(fh, fh.read(TIFF_HEADER_READ)))
+
+    return None
+
+
+def _find_jpeg_exif_segment(fh: BinaryIO) -> Optional[bytes]:
+    """Walk JPEG marker segments and return the TIFF payload of APP1 Exif."""
+    fh.seek(2)
+    while True:
+        marker = fh.read(2)
+        if len(marker) < 2:
+            return None
+        if marker[0] != 0xFF:
+            raise ExifParseError(f"Invalid JPEG marker {marker!r}")
+
+        # Skip fill bytes between segments
+        code = marker[1]
+        while code == 0xFF:
+            byte = fh.read(1)
+            if not byte:
+                return None
+            code = byte[0]
+
+        # Start of scan / end of image: no more metadata segments follow
+        if code in (0xDA, 0xD9):
+            return None
+        # Standalone markers carry no length
+        if code == 0x01 or 0xD0 <= code <= 0xD7:
+            continue
+
+        length_bytes = fh.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+        if length < 2:
+            raise ExifParseError(f"Invalid JPEG segment length {length}")
+
+        if code == 0xE1:
+            payload = fh.read(length - 2)
+            if payload.startswith(EXIF_HEADER):
+                return payload[len(EXIF_HEADER) :]
+        else:
+            fh.seek(length - 2, 1)
+
+
+def _bytes_reader(data: bytes) -> ReadAt:
+    def read_at(offset: int, size: int) -> bytes:
+        return data[offset : offset + size]
+
+    return read_at
+
+
+def _file_reader(fh: BinaryIO, head: bytes) -> ReadAt:
+    """Serve reads from the read-ahead buffer, seeking only past its end."""
+
+    def read_at(offset: int, size: int) -> bytes:
+        if offset + size <= len(head):
+            return head[offset : offset + size]
+        fh.seek(offset)
+        return fh.read(size)
+
+    return read_at
+
+
+def _parse_tiff(read_at: ReadAt) -> Dict[int, str]:
+    """Parse IFD0 and the Exif sub-IFD of a TIFF structure."""
+    header = read_at(0, 8)
+    if len(header) < 8:
+        raise ExifParseError("Truncated TIFF header")
+
+    if header[:4] == TIFF_LITTLE_ENDIAN:
+        endian = "<"
+    elif header[:4] == TIFF_BIG_ENDIAN:
+        endian = ">"
+    else:
+        raise ExifParseError(f"Invalid TIFF header {header[:4]!r}")
+
+    (ifd0_offset,) = struct.unpack(endian + "I", header[4:8])
+
+    tags: Dict[int, str] = {}
+    pointers = _read_ifd(read_at, endian, ifd0_offset, tags)
+
+    exif_offset = pointers.get(TAG_EXIF_IFD)
+    if exif_offset:
+        _read_ifd(read_at, endian, exif_offset, tags)
+
+    return tags
+
+
+def _read_ifd(
+    read_at: ReadAt,
+    endian: str,
+    offset: int,
+    tags: Dict[int, str],
+) -> Dict[int, int]:
+    """Read wanted ASCII tags from one IFD into tags.
+
+    Returns:
+        Sub-IFD pointers found in this IFD, by tag id
+    """
+    count_bytes = read_at(offset, 2)
+    if len(count_bytes) < 2:
+        raise ExifParseError(f"IFD offset {offset} out of range")
+
+    (count,) = struct.unpack(endian + "H", count_bytes)
+    if count > MAX_IFD_ENTRIES:
+        raise ExifParseError(f"Implausible IFD entry count {count}")
+
+    entries = read_at(offset + 2, count * 12)
+    if len(entries) < count * 12:
+        raise ExifParseError("Truncated IFD")
+
+    pointers: Dict[int, int] = {}
+    for i in range(count):
+        tag, field_type, value_count, value = struct.unpack(
+            endian + "HHI4s", entries[i * 12 : i * 12 + 12]
+        )
+
+        if tag == TAG_EXIF_IFD and field_type in (TYPE_LONG, TYPE_IFD):
+            (pointers[tag],) = struct.unpack(endian + "I", value)
+        elif tag in WANTED_TAGS and field_type == TYPE_ASCII:
+            if value_count <= 4:
+                raw = value[:value_count]
+            else:
+                (value_offset,) = struct.unpack(endian + "I", value)
+                raw = read_at(value_offset, value_count)
+            tags[tag] = raw.split(b"\x00", 1)[0].decode("latin-1", "replace")
+
+    return pointers
@@ -6,6 +6,7 @@ from pathlib import Path
 from typing import Optional
 
 from photo_organizer.extractors.base import ExtractionResult, MetadataExtractor
+from photo_organizer.probe import FileProbe
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +19,19 @@ class FallbackExtractor(MetadataExtractor):
         return "FileSystem"
 
     def extract(self, file_path: Path) -> Optional[ExtractionResult]:
+        """Extract date from file modification time."""
+        return self.extract_probe(FileProbe(file_path))
+
+    def extract_probe(self, probe: FileProbe) -> Optional[ExtractionResult]:
         """Extract date from file modification time.
 
         This is the fallback method when no metadata is available.
         Uses the most recent of ctime (change time) and mtime (modification time).
+        Only the probe's cached stat result is used; the file is never opened.
         """
+        file_path = probe.path
         try:
-            stat = file_path.stat()
+            stat = probe.stat()
             # Use the earlier of ctime and mtime (more likely to be the original)
             timestamp = min(stat.st_ctime, stat.st_mtime)
             date = datetime.fromtimestamp(timestamp)
@@ -1,19 +1,61 @@
 """Filename pattern extractor."""
 
+import functools
 import re
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Pattern
 
 from photo_organizer.extractors.base import ExtractionResult, MetadataExtractor
 
 logger = logging.getLogger(__name__)
 
+FULL_DATE_PATTERN = re.compile(r"(?:IMG|VID)_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})")
+DATE_PATTERN = re.compile(r"(\d{4})(\d{2})(\d{2})")
+
+# Folder names that never identify a camera
+GENERIC_FOLDERS = frozenset(
+    {"photos", "videos", "camera", "pictures", "images", "media", "dcim"}
+)
+
+DEFAULT_FOLDER_CACHE_SIZE = 4096
+
+
+def _compile_device_matcher(patterns: Dict[str, str]) -> Pattern:
+    """Combine device patterns into one regex that reports every match.
+
+    Each pattern becomes a named group g<priority> inside a lookahead, so
+    finditer() visits every position, and at each position the
+    highest-priority pattern matching there wins the alternation. Patterns
+    are lowercased and matched against lowercased names, as before.
+    """
+    alternatives = "|".join(
+        f"(?P<g{priority}>{pattern.lower()})"
+        for priority, pattern in enumerate(patterns.values())
+    )
+    return re.compile(f"(?=(?:{alternatives}))")
+
+
+def _device_brands(patterns: Dict[str, str], brand_names: Dict[str, str]) -> List[str]:
+    """Display brand for each device pattern, in priority order."""
+    brands = []
+    for pattern_name in patterns:
+        brand = pattern_name.split("_")[0].lower()
+        brands.append(brand_names.get(brand, brand.capitalize()))
+    return brands
+
+
+def _compile_brand_matcher(brands: List[str]) -> Pattern:
+    """One word-bounded alternation matching any camera brand."""
+    return re.compile(r"\b(?:" + "|".join(re.escape(brand) for brand in brands) + r")\b")
+
 
 class FilenameExtractor(MetadataExtractor):
     """Extract date from filename patterns and folder structure."""
 
+    reads_path = True
+
     # Device-specific camera patterns for common manufacturers
     DEVICE_PATTERNS = {
         # Samsung
@@ -90,6 +132,23 @@ class FilenameExtractor(MetadataExtractor):
         "samsung",
     ]
 
+    # Compiled once at class load; see _detect_camera_model_from_name
+    _DEVICE_MATCHER = _compile_device_matcher(DEVICE_PATTERNS)
+    _DEVICE_BRANDS = _device_brands(DEVICE_PATTERNS, BRAND_NAME_MAP)
+    _BRAND_MATCHER = _compile_brand_matcher(CAMERA_BRANDS)
+
+    def __init__(self, folder_cache_size: int = DEFAULT_FOLDER_CACHE_SIZE):
+        """Initialize the extractor.
+
+        Args:
+            folder_cache_size: Directories whose folder scan is memoized
+                (LRU); ancestors are cached too, so deep trees only parse
+                each leading component once
+        """
+        self._folder_state = functools.lru_cache(maxsize=folder_cache_size)(
+            self._compute_folder_state
+        )
+
     @property
     def name(self) -> str:
         return "Filename"
@@ -116,24 +175,26 @@ class FilenameExtractor(MetadataExtractor):
         return None
 
     def _detect_camera_model_from_name(self, name: str) -> Optional[str]:
-        """Detect camera model from device-specific patterns."""
-        name_lower = name.lower()
-
-        for pattern_name, pattern in self.DEVICE_PATTERNS.items():
-            if re.search(pattern.lower(), name_lower):
-                parts = pattern_name.split("_")
-                if len(parts) >= 2:
-                    brand = parts[0].lower()
-                    return self.BRAND_NAME_MAP.get(brand, brand.capitalize())
-                brand = pattern_name.split("_")[0].lower()
-                return self.BRAND_NAME_MAP.get(brand, brand.capitalize())
+        """Detect camera model from device-specific patterns.
 
-        return None
+        The first pattern in DEVICE_PATTERNS order that matches anywhere in
+        the name decides the brand; all patterns are tried in a single pass.
+        """
+        best = None
+        for match in self._DEVICE_MATCHER.finditer(name.lower()):
+            priority = int(match.lastgroup[1:])
+            if best is None or priority < best:
+                best = priority
+                if best == 0:
+                    break
+
+        if best is None:
+            return None
+        return self._DEVICE_BRANDS[best]
 
     def _extract_from_filename(self, filename: str) -> Optional[datetime]:
         """Extract date from common filename patterns."""
-        pattern = r"(?:IMG|VID)_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})"
-        match = re.search(pattern, filename)
+        match = FULL_DATE_PATTERN.search(filename)
 
         if match:
             year, month, day, hour, minute, second = match.groups()
@@ -144,8 +205,7 @@ class FilenameExtractor(MetadataExtractor):
             except ValueError:
                 pass
 
-        pattern = r"(\d{4})(\d{2})(\d{2})"
-        match = re.search(pattern, filename)
+        match = DATE_PATTERN.search(filename)
 
         if match:
             year, month, day = match.groups()
@@ -156,6 +216,10 @@ class FilenameExtractor(MetadataExtractor):
 
         return None
 
+    def folder_cache_info(self):
+        """Hit/miss statistics of the per-directory cache (functools format)."""
+        return self._folder_state.cache_info()
+
     def _extract_from_folder(
         self, folder: Path
     ) -> tuple[Optional[datetime], Optional[str]]:
@@ -166,57 +230,81 @@ class FilenameExtractor(MetadataExtractor):
         - /YYYY/MM/DD/camera_name/
         - /Photos/Nikon/ (camera-only folder)
         - /YYYY/MM/DD/camera1/camera2/ (nested camera folders)
+
+        The first date triple from the left wins, with the component right
+        after it as camera; otherwise the camera is the right-most
+        non-generic component naming a device or brand.
         """
-        date = None
-        camera_model = None
-        generic_folders = {
-            "photos",
-            "videos",
-            "camera",
-            "pictures",
-            "images",
-            "media",
-            "dcim",
-        }
-
-        parts = list(folder.parts)
-
-        for i in range(len(parts) - 2):
+        state = self._folder_state(folder)
+        return state.date, state.date_camera or state.fallback_camera
+
+    def _compute_folder_state(self, folder: Path) -> "_FolderState":
+        """Scan a directory path, reusing the cached state of its parent."""
+        parent = folder.parent
+        if parent == folder:
+            state = _FolderState()
+            parts = folder.parts
+            for depth, name in enumerate(parts):
+                state = self._extend_folder_state(state, parts[:depth], name)
+            return state
+        return self._extend_folder_state(
+            self._folder_state(parent), parent.parts, folder.name
+        )
+
+    def _extend_folder_state(
+        self, state: "_FolderState", parent_parts: tuple, name: str
+    ) -> "_FolderState":
+        """State of parent_parts + (name,) given the state of parent_parts."""
+        depth = len(parent_parts)
+        date = state.date
+        date_end = state.date_end
+        date_camera = state.date_camera
+        fallback_camera = state.fallback_camera
+        generic = name.lower() in GENERIC_FOLDERS
+
+        if date is not None:
+            # Component right after the date triple names the camera
+            if date_end + 1 == depth and not generic:
+                date_camera = name
+        elif depth >= 2:
             try:
-                year = int(parts[i])
-                month = int(parts[i + 1])
-                day = int(parts[i + 2])
+                year = int(parent_parts[-2])
+                month = int(parent_parts[-1])
+                day = int(name)
 
                 if 1900 <= year <= 2100 and 1 <= month <= 12 and 1 <= day <= 31:
                     date = datetime(year, month, day)
-                    if i + 3 < len(parts):
-                        potential_camera = parts[i + 3]
-                        if potential_camera.lower() not in generic_folders:
-                            camera_model = potential_camera
-                    break
+                    date_end = depth
             except ValueError:
-                continue
+                pass
 
-        if not camera_model:
-            for i in range(len(parts) - 1, -1, -1):
-                folder_name = parts[i]
+        if not generic:
+            detected_camera = self._detect_camera_model_from_name(name)
+            if detected_camera:
+                fallback_camera = detected_camera
+            elif self._BRAND_MATCHER.search(name.lower()):
+                fallback_camera = name
 
-                if folder_name.lower() in generic_folders:
-                    continue
+        return _FolderState(date, date_end, date_camera, fallback_camera)
 
-                detected_camera = self._detect_camera_model_from_name(folder_name)
-                if detected_camera:
-                    camera_model = detected_camera
-                    break
 
-                folder_name_lower = folder_name.lower()
-                for brand in self.CAMERA_BRANDS:
-                    pattern = r"\b" + re.escape(brand) + r"\b"
-                    if re.search(pattern, folder_name_lower):
-                        camera_model = folder_name
-                        break
+class _FolderState:
+    """Result of scanning a directory path from the root down.
 
-                if camera_model:
-                    break
+    date_end is the index of the day component of the first date triple;
+    fallback_camera is the right-most component naming a device or brand.
+    """
+
+    __slots__ = ("date", "date_end", "date_camera", "fallback_camera")
 
-        return date, camera_model
+    def __init__(
+        self,
+        date: Optional[datetime] = None,
+        date_end: int = -1,
+        date_camera: Optional[str] = None,
+        fallback_camera: Optional[str] = None,
+    ):
+        self.date = date
+        self.date_end = date_end
+        self.date_camera = date_camera
+        self.fallback_camera = fallback_camera
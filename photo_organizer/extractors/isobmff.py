@@ -0,0 +1,274 @@
+"""Creation date extractor for ISO-BMFF / QuickTime videos (MP4, MOV, M4V, QT)."""
+
+import logging
+import struct
+from datetime import datetime, timedelta
+from itertools import chain
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from photo_organizer.extractors.base import ExtractionResult, MetadataExtractor
+from photo_organizer.probe import FileProbe
+from photo_organizer.utils import combine_make_model
+
+logger = logging.getLogger(__name__)
+
+# Seconds between the QuickTime epoch (1904-01-01) and the Unix epoch
+QUICKTIME_EPOCH_OFFSET = 2082844800
+
+# Box types that may legitimately start an ISO-BMFF / QuickTime file
+TOP_LEVEL_BOXES = {
+    b"ftyp",
+    b"moov",
+    b"mdat",
+    b"free",
+    b"skip",
+    b"wide",
+    b"pnot",
+    b"uuid",
+    b"pdin",
+}
+
+# Metadata items (udta / ilst) are tiny; never read more than this per item
+MAX_ITEM_READ = 4096
+
+# Metadata keys, most reliable first
+APPLE_CREATION_DATE = "com.apple.quicktime.creationdate"
+APPLE_MAKE = "com.apple.quicktime.make"
+APPLE_MODEL = "com.apple.quicktime.model"
+DATE_KEYS = [APPLE_CREATION_DATE, "\xa9day"]
+MAKE_KEYS = [APPLE_MAKE, "\xa9mak"]
+MODEL_KEYS = [APPLE_MODEL, "\xa9mod"]
+
+Box = Tuple[bytes, int, int]  # (type, payload start, box end)
+
+
+class IsoBmffExtractor(MetadataExtractor):
+    """Extract creation date and device model from MP4/QuickTime boxes.
+
+    Only box headers are read while walking the file: large boxes such as
+    mdat are skipped with a seek, so the cost is independent of file size.
+    """
+
+    @property
+    def name(self) -> str:
+        return "ISO-BMFF"
+
+    def extract(self, file_path: Path) -> Optional[ExtractionResult]:
+        """Extract metadata from the moov box of a video file."""
+        with FileProbe(file_path) as probe:
+            return self.extract_probe(probe)
+
+    def extract_probe(self, probe: FileProbe) -> Optional[ExtractionResult]:
+        """Extract metadata from the moov box of a video file.
+
+        Box headers near the start of the file come from the probe's header
+        buffer; later boxes are read at their offsets.
+        """
+        try:
+            boxes = _iter_boxes(probe, 0, probe.size)
+            first = next(boxes, None)
+            if first is None or first[0] not in TOP_LEVEL_BOXES:
+                return None
+
+            for box_type, start, end in chain([first], boxes):
+                if box_type == b"moov":
+                    return self._extract_from_moov(probe, start, end)
+
+            return None
+
+        except Exception as e:
+            logger.debug(f"ISO-BMFF extraction failed for {probe.path}: {e}")
+            return None
+
+    def _extract_from_moov(
+        self, fh: BinaryIO, start: int, end: int
+    ) -> Optional[ExtractionResult]:
+        """Collect mvhd creation time and user metadata from a moov box."""
+        movie_date = None
+        items: Dict[str, str] = {}
+
+        for box_type, box_start, box_end in _iter_boxes(fh, start, end):
+            if box_type == b"mvhd":
+                movie_date = _read_mvhd_date(fh, box_start, box_end)
+            elif box_type == b"udta":
+                items.update(_read_udta(fh, box_start, box_end))
+            elif box_type == b"meta":
+                items.update(_read_meta(fh, box_start, box_end))
+
+        date = None
+        for key in DATE_KEYS:
+            if key in items:
+                date = _parse_iso_date(items[key])
+                if date:
+                    break
+        if date is None:
+            date = movie_date
+        if date is None:
+            return None
+
+        make = next((items[key] for key in MAKE_KEYS if key in items), None)
+        model = next((items[key] for key in MODEL_KEYS if key in items), None)
+
+        return ExtractionResult(date=date, camera_model=combine_make_model(make, model))
+
+
+def _iter_boxes(fh: BinaryIO, start: int, end: int) -> Iterator[Box]:
+    """Iterate over the boxes between start and end, reading headers only."""
+    offset = start
+    while offset + 8 <= end:
+        fh.seek(offset)
+        header = fh.read(8)
+        if len(header) < 8:
+            return
+
+        size, box_type = struct.unpack(">I4s", header)
+        header_size = 8
+        if size == 1:
+            large_size = fh.read(8)
+            if len(large_size) < 8:
+                return
+            (size,) = struct.unpack(">Q", large_size)
+            header_size = 16
+        elif size == 0:
+            # Box extends to the end of its container
+            size = end - offset
+
+        if size < header_size or offset + size > end:
+            logger.debug(f"Invalid {box_type!r} box size {size} at offset {offset}")
+            return
+
+        yield box_type, offset + header_size, offset + size
+        offset += size
+
+
+def _read_payload(fh: BinaryIO, start: int, end: int) -> bytes:
+    fh.seek(start)
+    return fh.read(min(end - start, MAX_ITEM_READ))
+
+
+def _read_mvhd_date(fh: BinaryIO, start: int, end: int) -> Optional[datetime]:
+    """Read the movie creation time (UTC seconds since 1904) as local time."""
+    payload = _read_payload(fh, start, end)
+    if len(payload) < 12:
+        return None
+
+    if payload[0] == 1:
+        (created,) = struct.unpack(">Q", payload[4:12])
+    else:
+        (created,) = struct.unpack(">I", payload[4:8])
+
+    # Many encoders leave the field zeroed
+    if created <= QUICKTIME_EPOCH_OFFSET:
+        return None
+    return datetime.fromtimestamp(created - QUICKTIME_EPOCH_OFFSET)
+
+
+def _read_udta(fh: BinaryIO, start: int, end: int) -> Dict[str, str]:
+    """Read QuickTime (c)xxx text items and any nested meta box from udta."""
+    items: Dict[str, str] = {}
+    for box_type, box_start, box_end in _iter_boxes(fh, start, end):
+        if box_type == b"meta":
+            items.update(_read_meta(fh, box_start, box_end))
+        elif box_type[:1] == b"\xa9":
+            payload = _read_payload(fh, box_start, box_end)
+            if len(payload) >= 4:
+                (length,) = struct.unpack(">H", payload[:2])
+                text = payload[4 : 4 + length]
+                items[box_type.decode("latin-1")] = _decode_text(text)
+    return items
+
+
+def _read_meta(fh: BinaryIO, start: int, end: int) -> Dict[str, str]:
+    """Read a meta box: Apple mdta keys or iTunes-style ilst items."""
+    # ISO meta is a full box (version/flags); QuickTime meta is not
+    fh.seek(start)
+    if fh.read(8)[4:8] != b"hdlr":
+        start += 4
+
+    keys: List[str] = []
+    values: Dict[bytes, str] = {}
+    for box_type, box_start, box_end in _iter_boxes(fh, start, end):
+        if box_type == b"keys":
+            keys = _read_keys(fh, box_start, box_end)
+        elif box_type == b"ilst":
+            for item_type, item_start, item_end in _iter_boxes(fh, box_start, box_end):
+                value = _read_data_box(fh, item_start, item_end)
+                if value is not None:
+                    values[item_type] = value
+
+    items: Dict[str, str] = {}
+    for item_type, value in values.items():
+        if keys and item_type[:1] != b"\xa9":
+            # mdta items are 1-based indexes into the keys box
+            (index,) = struct.unpack(">I", item_type)
+            if 1 <= index <= len(keys):
+                items[keys[index - 1]] = value
+        else:
+            items[item_type.decode("latin-1")] = value
+    return items
+
+
+def _read_keys(fh: BinaryIO, start: int, end: int) -> List[str]:
+    """Read key names from an Apple keys box."""
+    fh.seek(start)
+    header = fh.read(8)
+    if len(header) < 8:
+        return []
+    (count,) = struct.unpack(">I", header[4:8])
+
+    keys = []
+    offset = start + 8
+    for _ in range(count):
+        if offset + 8 > end:
+            break
+        fh.seek(offset)
+        key_header = fh.read(8)
+        (key_size,) = struct.unpack(">I", key_header[:4])
+        if key_size < 8:
+            break
+        keys.append(_decode_text(fh.read(min(key_size - 8, MAX_ITEM_READ))))
+        offset += key_size
+    return keys
+
+
+def _read_data_box(fh: BinaryIO, start: int, end: int) -> Optional[str]:
+    """Read the text value of the data box inside an ilst item."""
+    for box_type, box_start, box_end in _iter_boxes(fh, start, end):
+        if box_type == b"data":
+            payload = _read_payload(fh, box_start, box_end)
+            # 4 bytes type indicator, 4 bytes locale, then the value
+            if len(payload) < 8:
+                return None
+            return _decode_text(payload[8:])
+    return None
+
+
+def _decode_text(raw: bytes) -> str:
+    return raw.split(b"\x00", 1)[0].decode("utf-8", "replace").strip()
+
+
+def _parse_iso_date(text: str) -> Optional[datetime]:
+    """Parse an ISO 8601 metadata date.
+
+    Dates with a non-UTC offset keep their wall-clock time (the capture
+    time in the camera's timezone, as with EXIF). UTC dates are converted
+    to local time, like the mvhd creation time.
+    """
+    text = text.strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    # Apple writes offsets as +HHMM; fromisoformat needs +HH:MM on 3.10
+    if len(text) >= 5 and text[-5] in "+-" and text[-4:].isdigit():
+        text = f"{text[:-2]}:{text[-2:]}"
+
+    try:
+        date = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+    if date.tzinfo is None:
+        return date
+    if date.utcoffset() == timedelta(0):
+        return date.astimezone().replace(tzinfo=None)
+    return date.replace(tzinfo=None)
@@ -0,0 +1,96 @@
+"""File type detection from magic bytes and extensions."""
+
+import logging
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FileType(Enum):
+    """Container format of a media file."""
+
+    JPEG = "jpeg"
+    TIFF = "tiff"  # TIFF and TIFF-based RAW (NEF, CR2, ARW, DNG)
+    PNG = "png"
+    HEIF = "heif"
+    ISOBMFF = "isobmff"  # MP4, M4V, MOV, QT
+    RIFF = "riff"  # AVI
+    MATROSKA = "matroska"  # MKV, WebM
+    UNKNOWN = "unknown"
+
+
+EXTENSION_TYPES = {
+    ".jpg": FileType.JPEG,
+    ".jpeg": FileType.JPEG,
+    ".jpe": FileType.JPEG,
+    ".png": FileType.PNG,
+    ".tif": FileType.TIFF,
+    ".tiff": FileType.TIFF,
+    ".nef": FileType.TIFF,
+    ".cr2": FileType.TIFF,
+    ".arw": FileType.TIFF,
+    ".dng": FileType.TIFF,
+    ".heic": FileType.HEIF,
+    ".heif": FileType.HEIF,
+    ".mp4": FileType.ISOBMFF,
+    ".m4v": FileType.ISOBMFF,
+    ".mov": FileType.ISOBMFF,
+    ".qt": FileType.ISOBMFF,
+    ".avi": FileType.RIFF,
+    ".mkv": FileType.MATROSKA,
+    ".webm": FileType.MATROSKA,
+}
+
+# Enough header bytes to recognize every supported container
+SNIFF_BYTES = 16
+
+HEIF_BRANDS = {b"heic", b"heix", b"heim", b"heis", b"hevc", b"hevx", b"mif1", b"msf1"}
+QUICKTIME_BOXES = {b"moov", b"mdat", b"free", b"skip", b"wide", b"pnot"}
+
+
+def sniff_file_type(header: bytes) -> FileType:
+    """Identify a file from its first SNIFF_BYTES bytes."""
+    if header[:3] == b"\xff\xd8\xff":
+        return FileType.JPEG
+    if header[:4] in (b"II*\x00", b"MM\x00*"):
+        return FileType.TIFF
+    if header[:8] == b"\x89PNG\r\n\x1a\n":
+        return FileType.PNG
+    if header[4:8] == b"ftyp":
+        if header[8:12] in HEIF_BRANDS:
+            return FileType.HEIF
+        return FileType.ISOBMFF
+    if header[4:8] in QUICKTIME_BOXES:
+        return FileType.ISOBMFF
+    if header[:4] == b"RIFF" and header[8:12] == b"AVI ":
+        return FileType.RIFF
+    if header[:4] == b"\x1a\x45\xdf\xa3":
+        return FileType.MATROSKA
+    return FileType.UNKNOWN
+
+
+def detect_file_type(file_path: Path, header: Optional[bytes] = None) -> FileType:
+    """Detect the type of a file, preferring magic bytes over the extension.
+
+    Args:
+        file_path: Path to the media file
+        header: First bytes of the file, if already read
+
+    Returns:
+        Sniffed type, or the type implied by the extension when the header
+        is unrecognized or unreadable
+    """
+    if header is None:
+        try:
+            with open(file_path, "rb") as fh:
+                header = fh.read(SNIFF_BYTES)
+        except OSError as e:
+            logger.debug(f"Cannot sniff {file_path}: {e}")
+            header = b""
+
+    file_type = sniff_file_type(header)
+    if file_type is FileType.UNKNOWN:
+        file_type = EXTENSION_TYPES.get(file_path.suffix.lower(), FileType.UNKNOWN)
+    return file_type
@@ -0,0 +1,109 @@
+"""Persistent index of already organized files for incremental runs."""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Default index location, relative to the output root
+INDEX_FILENAME = Path(".photo-organizer") / "index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS organized (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    organized_at REAL NOT NULL,
+    PRIMARY KEY (dev, ino)
+)
+"""
+
+
+class ScanIndex:
+    """SQLite index of source files that were already organized.
+
+    Files are identified by (st_dev, st_ino) and considered unchanged while
+    their size and mtime_ns still match the recorded values. Writes are
+    committed in batches; call close() (or use as a context manager) to
+    flush the last batch. Safe to share between threads.
+    """
+
+    def __init__(self, path: Path, commit_every: int = 500):
+        self.path = path
+        self.commit_every = commit_every
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def lookup(self, st: os.stat_result) -> Optional[Path]:
+        """Return the recorded target if the file is unchanged, else None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, target FROM organized WHERE dev = ? AND ino = ?",
+                (st.st_dev, st.st_ino),
+            ).fetchone()
+        if row is None:
+            return None
+
+        size, mtime_ns, target = row
+        if size != st.st_size or mtime_ns != st.st_mtime_ns:
+            return None
+        return Path(target)
+
+    def is_unchanged(self, st: os.stat_result) -> bool:
+        """Check whether a file with this stat result was already organized."""
+        return self.lookup(st) is not None
+
+    def record(self, source: Path, st: os.stat_result, target: Path) -> None:
+        """Record that a source file was organized into target."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO organized "
+                "(dev, ino, size, mtime_ns, source, target, organized_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    st.st_dev,
+                    st.st_ino,
+                    st.st_size,
+                    st.st_mtime_ns,
+                    str(source),
+                    str(target),
+                    time.time(),
+                ),
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._commit()
+
+    def commit(self) -> None:
+        """Flush pending records to disk."""
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        self._conn.commit()
+        self._uncommitted = 0
+
+    def close(self) -> None:
+        """Commit pending records and close the database."""
+        with self._lock:
+            self._commit()
+            self._conn.close()
+
+    def __enter__(self) -> "ScanIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
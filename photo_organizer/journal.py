@@ -0,0 +1,238 @@
+"""Append-only journal of planned transfers, for resuming interrupted runs."""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set, TextIO
+
+logger = logging.getLogger(__name__)
+
+# Default journal location, relative to the output root
+JOURNAL_FILENAME = Path(".photo-organizer") / "journal.jsonl"
+
+# Records written between syncs of start/done/fail records. Plan records
+# are always synced before their batch of transfers is submitted.
+DEFAULT_SYNC_EVERY = 256
+
+PLANNED = "plan"
+STARTED = "start"
+DONE = "done"
+FAILED = "fail"
+
+
+class JournalEntry:
+    """Latest known state of one planned transfer."""
+
+    __slots__ = ("id", "source", "target", "mode", "link_to", "status")
+
+    def __init__(
+        self,
+        entry_id: int,
+        source: Path,
+        target: Path,
+        mode: str,
+        link_to: Optional[Path] = None,
+        status: str = PLANNED,
+    ):
+        self.id = entry_id
+        self.source = source
+        self.target = target
+        self.mode = mode
+        self.link_to = link_to
+        self.status = status
+
+    @property
+    def in_flight(self) -> bool:
+        """Planned or started, but neither finished nor failed."""
+        return self.status in (PLANNED, STARTED)
+
+
+class JournalState:
+    """Entries replayed from an existing journal."""
+
+    def __init__(self, entries: Dict[int, JournalEntry]):
+        self.entries = entries
+
+    @property
+    def next_id(self) -> int:
+        return max(self.entries, default=0) + 1
+
+    @property
+    def modes(self) -> Set[str]:
+        """Transfer modes used by regular (non-link) entries."""
+        return {entry.mode for entry in self.entries.values() if entry.link_to is None}
+
+    def in_flight(self) -> List[JournalEntry]:
+        """Entries that may have been interrupted, in planning order."""
+        return [entry for _, entry in sorted(self.entries.items()) if entry.in_flight]
+
+    def handled_sources(self) -> Set[str]:
+        """Sources that need no fresh extraction: done or about to be replayed."""
+        return {
+            str(entry.source)
+            for entry in self.entries.values()
+            if entry.status != FAILED
+        }
+
+
+def load_journal(path: Path) -> JournalState:
+    """Replay a journal file into the latest state of every entry.
+
+    A truncated last line (the process died mid-write) is ignored.
+    """
+    entries: Dict[int, JournalEntry] = {}
+    with open(path, encoding="utf-8") as fh:
+        for line_number, line in enumerate(fh, 1):
+            try:
+                record = json.loads(line)
+                op = record["op"]
+                entry_id = record["id"]
+                if op == PLANNED:
+                    link_to = record.get("link_to")
+                    entries[entry_id] = JournalEntry(
+                        entry_id,
+                        Path(record["src"]),
+                        Path(record["dst"]),
+                        record["mode"],
+                        Path(link_to) if link_to else None,
+                    )
+                elif entry_id in entries:
+                    entries[entry_id].status = op
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Ignoring unreadable journal line {line_number} in {path}")
+    return JournalState(entries)
+
+
+def reconcile(entry: JournalEntry) -> bool:
+    """Bring an interrupted entry back to a state where it can be redone.
+
+    Copies and links never touch the source, so any target left behind may
+    be partial and is removed. A move is complete once the source is gone
+    and the target exists; otherwise a partial target is removed as well.
+
+    Returns:
+        True if the transfer must be (re)done, False if it already completed
+
+    Raises:
+        FileNotFoundError: If a move lost both its source and its target
+    """
+    source_exists = os.path.lexists(entry.source)
+    target_exists = os.path.lexists(entry.target)
+
+    if entry.link_to is None and entry.mode == "move" and not source_exists:
+        if target_exists:
+            return False
+        raise FileNotFoundError(
+            f"Neither {entry.source} nor {entry.target} exists; the move was lost"
+        )
+
+    if target_exists:
+        logger.info(f"Removing partial transfer: {entry.target}")
+        entry.target.unlink()
+    return True
+
+
+class Journal:
+    """Append-only JSON-lines journal of transfers.
+
+    Each transfer is recorded as plan -> start -> done/fail. Plan records
+    are synced in batches before the transfers they describe are started
+    (write-ahead); start/done/fail records are synced every sync_every
+    records. "done" is written once the transfer is durable under the
+    run's durability policy. Safe to share between threads.
+
+    Without fsync, syncing only flushes to the OS: the journal then survives
+    a crash of the process but not of the machine, which matches
+    --durability none and costs no round trip per batch on NFS.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        next_id: int = 1,
+        sync_every: int = DEFAULT_SYNC_EVERY,
+        fsync: bool = True,
+    ):
+        """Open a journal for appending.
+
+        Args:
+            path: Journal file; created (with its directory) if missing
+            next_id: First entry id to hand out (continue after a replay)
+            sync_every: Records written between syncs
+            fsync: Force synced records to stable storage
+        """
+        self.path = path
+        self.sync_every = sync_every
+        self.fsync = fsync
+        self._next_id = next_id
+        self._unsynced = 0
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh: Optional[TextIO] = open(path, "a", encoding="utf-8")
+
+    def plan(
+        self, source: Path, target: Path, mode: str, link_to: Optional[Path] = None
+    ) -> int:
+        """Record a planned transfer. Returns its entry id.
+
+        Call sync() before starting the transfer to make the plan durable.
+        """
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            record = {
+                "op": PLANNED,
+                "id": entry_id,
+                "src": str(source),
+                "dst": str(target),
+                "mode": mode,
+            }
+            if link_to is not None:
+                record["link_to"] = str(link_to)
+            self._write(record)
+        return entry_id
+
+    def start(self, entry_id: int) -> None:
+        self._append({"op": STARTED, "id": entry_id})
+
+    def done(self, entry_id: int) -> None:
+        self._append({"op": DONE, "id": entry_id})
+
+    def fail(self, entry_id: int) -> None:
+        self._append({"op": FAILED, "id": entry_id})
+
+    def sync(self) -> None:
+        """Flush (and fsync, if enabled) everything written so far."""
+        with self._lock:
+            self._sync()
+
+    def close(self, remove: bool = False) -> None:
+        """Sync and close; remove=True deletes the journal (clean finish)."""
+        with self._lock:
+            if self._fh is None:
+                return
+            self._sync()
+            self._fh.close()
+            self._fh = None
+        if remove:
+            self.path.unlink(missing_ok=True)
+
+    def _append(self, record: dict) -> None:
+        with self._lock:
+            self._write(record)
+            if self._unsynced >= self.sync_every:
+                self._sync()
+
+    def _write(self, record: dict) -> None:
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._unsynced += 1
+
+    def _sync(self) -> None:
+        if self._unsynced:
+            self._fh.flush()
+            if self.fsync:
+                os.fsync(self._fh.fileno())
+            self._unsynced = 0
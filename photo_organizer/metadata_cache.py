@@ -0,0 +1,216 @@
+"""Persistent cache of extraction results keyed by file identity."""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from photo_organizer.extractors.base import ExtractionResult
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_path() -> Path:
+    """Per-user cache location, shared by runs with different outputs."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "photo-organizer" / "metadata.sqlite3"
+
+
+DEFAULT_MAX_ENTRIES = 5_000_000
+DEFAULT_MAX_AGE_DAYS = 180
+DEFAULT_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    chain TEXT NOT NULL,
+    date TEXT,
+    camera_model TEXT,
+    extractor TEXT,
+    -- Last stored or hit (named before hits refreshed it)
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (dev, ino, size, mtime_ns, chain)
+)
+"""
+
+_Key = Tuple[int, int, int, int, str]
+
+
+class MetadataCache:
+    """SQLite cache of DateResolver results.
+
+    Entries are keyed by (st_dev, st_ino, size, mtime_ns) plus the resolver's
+    extractor-chain signature, so they stop matching as soon as the file or
+    the extractors change. Results that depend on the file's path (e.g. a
+    date parsed from its name) are stored with the path appended to the
+    signature, so they stop matching once the file is renamed or moved.
+    Unresolved files are cached too (date is NULL).
+    Writes are buffered and committed in batches, as are the timestamps of
+    hits; entries unused for max_age_days, and the least recently used
+    entries beyond max_entries, are evicted when the cache is opened and
+    closed. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[_Key, tuple] = {}
+        # Entries hit since the last flush, whose timestamps need refreshing
+        self._used: Set[_Key] = set()
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._evict()
+
+    def get(
+        self, st: os.stat_result, chain: str, path: Optional[Path] = None
+    ) -> Optional[ExtractionResult]:
+        """Return the cached result, or None on a cache miss.
+
+        An unresolved file is returned as an ExtractionResult without a date.
+        With path, a result stored for that path (see put) matches as well.
+        """
+        keys = [_make_key(st, chain)]
+        if path is not None:
+            keys.append(_make_key(st, chain, path))
+        with self._lock:
+            key, row = self._lookup(keys)
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if key not in self._pending:
+                self._used.add(key)
+                self._flush_if_full()
+
+        date, camera_model, extractor = row
+        return ExtractionResult(
+            date=datetime.fromisoformat(date) if date else None,
+            camera_model=camera_model,
+            extractor=extractor,
+        )
+
+    def put(
+        self,
+        st: os.stat_result,
+        chain: str,
+        result: Optional[ExtractionResult],
+        path: Optional[Path] = None,
+    ) -> None:
+        """Store a result (None for an unresolved file).
+
+        Pass the file's path if the result depends on it; it is then only
+        returned for the same path.
+        """
+        key = _make_key(st, chain, path)
+        result = result or ExtractionResult()
+        row = key + (
+            result.date.isoformat() if result.date else None,
+            result.camera_model,
+            result.extractor,
+            time.time(),
+        )
+        with self._lock:
+            self._pending[key] = row
+            self._used.discard(key)
+            self._flush_if_full()
+
+    def flush(self) -> None:
+        """Write buffered results and hit timestamps to disk."""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """Flush, evict stale entries and close the database."""
+        with self._lock:
+            self._flush()
+            self._evict()
+            self._conn.close()
+
+    def _lookup(self, keys: List[_Key]) -> Tuple[Optional[_Key], Optional[tuple]]:
+        """Find the first of keys that has a result; returns it and the row."""
+        for key in keys:
+            row = self._pending.get(key)
+            if row is not None:
+                return key, row[len(key) : -1]
+
+        identity = keys[0][:-1]
+        chains = [key[-1] for key in keys]
+        placeholders = ", ".join("?" * len(chains))
+        row = self._conn.execute(
+            "SELECT chain, date, camera_model, extractor FROM results "
+            "WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ? "
+            f"AND chain IN ({placeholders})",
+            identity + tuple(chains),
+        ).fetchone()
+        if row is None:
+            return None, None
+        return identity + (row[0],), row[1:]
+
+    def _flush_if_full(self) -> None:
+        if len(self._pending) + len(self._used) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending and not self._used:
+            return
+        if self._pending:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._pending.values(),
+            )
+        if self._used:
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE results SET stored_at = ? "
+                "WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ? AND chain = ?",
+                ((now,) + key for key in self._used),
+            )
+        self._conn.commit()
+        self._pending.clear()
+        self._used.clear()
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.max_age_days * 86400
+        self._conn.execute("DELETE FROM results WHERE stored_at < ?", (cutoff,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM results WHERE rowid IN "
+                "(SELECT rowid FROM results ORDER BY stored_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            logger.debug(f"Evicted {count - self.max_entries} metadata cache entries")
+        self._conn.commit()
+
+    def __enter__(self) -> "MetadataCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _make_key(st: os.stat_result, chain: str, path: Optional[Path] = None) -> _Key:
+    if path is not None:
+        # The signature is hex, so the separator cannot be ambiguous
+        chain = f"{chain}|{path}"
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, chain)
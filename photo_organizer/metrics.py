@@ -0,0 +1,338 @@
+"""Run metrics: per-stage latency histograms and throughput counters.
+
+Like syscalls, this is a process-wide registry: stages report how long each
+call took with observe() (or the timed() context manager), and counters are
+bumped with count(). The run summary, and optionally a JSON or Prometheus
+textfile (for node_exporter's textfile collector), are built from
+snapshot().
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stage names
+SCAN = "scan"  # one directory listing
+METADATA = "metadata"  # whole metadata stage of one file
+EXTRACT = "extract"  # one extractor call (label: extractor name)
+PERCEPTUAL_HASH = "perceptual_hash"
+DUPLICATES = "duplicates"  # one duplicate check (label: name, content, near)
+MKDIR = "mkdir"
+TRANSFER = "transfer"
+FSYNC = "fsync"  # one durability batch
+
+# Counter names
+FILES = "files"  # files organized
+BYTES = "bytes"  # bytes of the files organized
+EXTRACTOR_HITS = "extractor_hits"  # label: extractor name
+EXTRACTOR_MISSES = "extractor_misses"
+
+FORMATS = ("json", "prometheus")
+
+# Histogram bucket upper bounds, in seconds (1-2.5-5 steps, 10us to 60s)
+BUCKETS = (
+    0.00001, 0.000025, 0.00005,
+    0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0,
+    10.0, 30.0, 60.0,
+)  # fmt: skip
+
+# A stage or counter, with an optional label (e.g. the extractor name)
+Key = Tuple[str, str]
+
+
+class Histogram:
+    """Latency distribution of one stage, in fixed buckets."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        # counts[i] is the number of observations in (BUCKETS[i-1], BUCKETS[i]];
+        # the extra last slot holds everything above BUCKETS[-1]
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def copy(self) -> "Histogram":
+        other = Histogram()
+        other.counts = list(self.counts)
+        other.count = self.count
+        other.sum = self.sum
+        other.max = self.max
+        return other
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile: the upper bound of the bucket holding it."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(BUCKETS, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, observations <= bound) pairs, Prometheus style."""
+        pairs = []
+        seen = 0
+        for bound, bucket_count in zip(BUCKETS, self.counts):
+            seen += bucket_count
+            pairs.append((bound, seen))
+        return pairs
+
+    def summary(self) -> str:
+        """One-line summary suitable for logging."""
+        return (
+            f"{self.count} calls, {self.sum:.2f}s total, "
+            f"p50 {_ms(self.quantile(0.5))}, p95 {_ms(self.quantile(0.95))}, "
+            f"max {_ms(self.max)}"
+        )
+
+
+class Snapshot:
+    """Copy of the registry at one point in time."""
+
+    def __init__(
+        self, histograms: Dict[Key, Histogram], counters: Counter, elapsed: float
+    ):
+        self.histograms = histograms
+        self.counters = counters
+        self.elapsed = elapsed
+
+    def rate(self, name: str) -> float:
+        """Per-second rate of a counter over the run so far."""
+        return self.counters[(name, "")] / self.elapsed if self.elapsed > 0 else 0.0
+
+    def hit_rates(self) -> Dict[str, Tuple[int, int]]:
+        """(hits, attempts) per extractor."""
+        rates = {}
+        for (name, label), value in self.counters.items():
+            if name in (EXTRACTOR_HITS, EXTRACTOR_MISSES):
+                hits, attempts = rates.get(label, (0, 0))
+                if name == EXTRACTOR_HITS:
+                    hits += value
+                rates[label] = (hits, attempts + value)
+        return rates
+
+    def to_json(self) -> dict:
+        return {
+            "elapsed_seconds": self.elapsed,
+            "files": self.counters[(FILES, "")],
+            "bytes": self.counters[(BYTES, "")],
+            "files_per_second": self.rate(FILES),
+            "bytes_per_second": self.rate(BYTES),
+            "extractors": {
+                name: {"hits": hits, "attempts": attempts}
+                for name, (hits, attempts) in sorted(self.hit_rates().items())
+            },
+            "stages": {
+                stage_name(key): {
+                    "count": histogram.count,
+                    "sum_seconds": histogram.sum,
+                    "max_seconds": histogram.max,
+                    "p50_seconds": histogram.quantile(0.5),
+                    "p95_seconds": histogram.quantile(0.95),
+                    "p99_seconds": histogram.quantile(0.99),
+                    "buckets": {str(bound): n for bound, n in histogram.cumulative()},
+                }
+                for key, histogram in sorted(self.histograms.items())
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        lines = [
+            "# HELP photo_organizer_elapsed_seconds Time since the run started.",
+            "# TYPE photo_organizer_elapsed_seconds gauge",
+            f"photo_organizer_elapsed_seconds {self.elapsed}",
+            "# HELP photo_organizer_files_total Files organized.",
+            "# TYPE photo_organizer_files_total counter",
+            f"photo_organizer_files_total {self.counters[(FILES, '')]}",
+            "# HELP photo_organizer_bytes_total Bytes of the files organized.",
+            "# TYPE photo_organizer_bytes_total counter",
+            f"photo_organizer_bytes_total {self.counters[(BYTES, '')]}",
+            "# HELP photo_organizer_extractor_results_total Extractor calls by outcome.",
+            "# TYPE photo_organizer_extractor_results_total counter",
+        ]
+        for name, (hits, attempts) in sorted(self.hit_rates().items()):
+            for result, value in (("hit", hits), ("miss", attempts - hits)):
+                lines.append(
+                    f'photo_organizer_extractor_results_total{{extractor="{name}",'
+                    f'result="{result}"}} {value}'
+                )
+        lines += [
+            "# HELP photo_organizer_stage_seconds Latency of each pipeline stage.",
+            "# TYPE photo_organizer_stage_seconds histogram",
+        ]
+        for key, histogram in sorted(self.histograms.items()):
+            labels = f'stage="{stage_name(key)}"'
+            for bound, seen in histogram.cumulative():
+                lines.append(
+                    f'photo_organizer_stage_seconds_bucket{{{labels},le="{bound}"}} {seen}'
+                )
+            lines += [
+                f'photo_organizer_stage_seconds_bucket{{{labels},le="+Inf"}} '
+                f"{histogram.count}",
+                f"photo_organizer_stage_seconds_sum{{{labels}}} {histogram.sum}",
+                f"photo_organizer_stage_seconds_count{{{labels}}} {histogram.count}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+_histograms: Dict[Key, Histogram] = {}
+_counters: Counter = Counter()
+_started = time.perf_counter()
+_lock = threading.Lock()
+# Per-thread timings of the file being processed (see attribute())
+_local = threading.local()
+
+
+def observe(stage: str, seconds: float, label: str = "") -> None:
+    """Record how long one call of a stage took."""
+    key = (stage, label)
+    timings = getattr(_local, "timings", None)
+    if timings is not None:
+        timings[key] = timings.get(key, 0.0) + seconds
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+
+@contextmanager
+def timed(stage: str, label: str = "") -> Iterator[None]:
+    """Time the enclosed block as one call of a stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - started, label)
+
+
+@contextmanager
+def attribute(timings: Optional[Dict[Key, float]]) -> Iterator[None]:
+    """Also add what this thread observes in the enclosed block to timings.
+
+    Used to break down the time spent on one file by stage; a no-op when
+    timings is None.
+    """
+    if timings is None:
+        yield
+        return
+    previous = getattr(_local, "timings", None)
+    _local.timings = timings
+    try:
+        yield
+    finally:
+        _local.timings = previous
+
+
+def count(name: str, value: int = 1, label: str = "") -> None:
+    """Add to a counter."""
+    with _lock:
+        _counters[(name, label)] += value
+
+
+def snapshot() -> Snapshot:
+    """Return a copy of the registry."""
+    with _lock:
+        return Snapshot(
+            {key: histogram.copy() for key, histogram in _histograms.items()},
+            Counter(_counters),
+            time.perf_counter() - _started,
+        )
+
+
+def reset() -> None:
+    """Clear the registry and restart the clock (at the start of a run)."""
+    global _started
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _started = time.perf_counter()
+
+
+def write_metrics(path: Path, metrics_format: str = "json") -> None:
+    """Write a snapshot to path, atomically (textfile collectors may read it).
+
+    Args:
+        path: Output file
+        metrics_format: One of FORMATS
+    """
+    current = snapshot()
+    if metrics_format == "prometheus":
+        text = current.to_prometheus()
+    else:
+        text = json.dumps(current.to_json(), indent=2) + "\n"
+    temporary = path.with_name(f".{path.name}.tmp")
+    temporary.write_text(text, encoding="utf-8")
+    os.replace(temporary, path)
+
+
+class MetricsWriter:
+    """Rewrite a metrics file periodically during a run, and once at the end."""
+
+    def __init__(self, path: Path, metrics_format: str = "json", interval: float = 30.0):
+        self.path = path
+        self.metrics_format = metrics_format
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.interval > 0:
+            self._thread = threading.Thread(
+                target=self._loop, name="metrics", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop refreshing and write the final metrics."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._write()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._write()
+
+    def _write(self) -> None:
+        try:
+            write_metrics(self.path, self.metrics_format)
+        except OSError as e:
+            logger.warning(f"Cannot write metrics to {self.path}: {e}")
+
+
+def stage_name(key: Key) -> str:
+    """Display name of a stage: "extract.EXIF" for a labelled one."""
+    stage, label = key
+    return f"{stage}.{label}" if label else stage
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.2f}ms"
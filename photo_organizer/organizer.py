@@ -1,11 +1,27 @@
 """File organization logic."""
 
+import errno
 import logging
-import shutil
+import os
+import threading
+import time
+from collections import Counter
 from enum import Enum
 from pathlib import Path
+from typing import Callable, Iterable, Optional, Set, Union
 
+from photo_organizer import metrics, syscalls
+from photo_organizer.catalog import Catalog
+from photo_organizer.durability import DurabilityManager
 from photo_organizer.extractors.base import ExtractionResult
+from photo_organizer.records import FileRecord
+from photo_organizer.transfer import (
+    CopyUnsupported,
+    copy_file,
+    copy_file_verified,
+    reflink_file,
+)
+from photo_organizer.verify import Manifest, hash_file
 from photo_organizer.utils import sanitize_filename
 
 logger = logging.getLogger(__name__)
@@ -14,6 +30,33 @@ logger = logging.getLogger(__name__)
 class TransferMode(Enum):
     COPY = "copy"
     MOVE = "move"
+    LINK = "link"  # hardlink
+    SYMLINK = "symlink"
+    REFLINK = "reflink"  # copy-on-write clone (btrfs, XFS)
+
+
+# Modes that share the source's data instead of copying it; when the
+# operation is impossible (e.g. a cross-device hardlink) they fall back to a
+# regular copy unless fallback_to_copy is disabled
+LINK_MODES = {TransferMode.LINK, TransferMode.SYMLINK, TransferMode.REFLINK}
+
+# Errors meaning a link cannot be made between these paths; anything else
+# (e.g. EACCES, ENOSPC) is a real failure and is not papered over by a copy
+_LINK_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EMLINK,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+}
+
+_PAST_TENSE = {
+    TransferMode.COPY: "Copied",
+    TransferMode.MOVE: "Moved",
+    TransferMode.LINK: "Hardlinked",
+    TransferMode.SYMLINK: "Symlinked",
+    TransferMode.REFLINK: "Reflinked",
+}
 
 
 class Organizer:
@@ -24,10 +67,42 @@ class Organizer:
         output_root: Path,
         dry_run: bool = False,
         mode: TransferMode = TransferMode.COPY,
+        fallback_to_copy: bool = True,
+        verify: Optional[str] = None,
+        manifest: Optional[Manifest] = None,
+        durability: Optional[DurabilityManager] = None,
+        catalog: Optional[Catalog] = None,
     ):
+        """Initialize the organizer.
+
+        Args:
+            output_root: Root of the organized tree
+            dry_run: Only log what would be done
+            mode: How files are transferred
+            fallback_to_copy: Copy when a link mode is impossible
+            verify: Digest algorithm (verify.ALGORITHMS) to prove copies are
+                byte-identical to their sources; None disables verification
+            manifest: Where the digest of every transferred file is recorded
+            durability: fsync policy for transfers; moved sources are only
+                removed once their copies are durable (default: no fsync)
+            catalog: Catalog of the output tree, updated with every file
+                written into it
+        """
         self.output_root = output_root
         self.dry_run = dry_run
         self.mode = mode
+        self.fallback_to_copy = fallback_to_copy
+        self.verify = verify
+        self.manifest = manifest
+        self.durability = durability or DurabilityManager()
+        self.catalog = catalog
+        self.verified = 0
+        # How many files each copy mechanism handled (reflink, sendfile, ...)
+        self.copy_methods: Counter = Counter()
+        self._lock = threading.Lock()
+        # Directories known to exist (created or seen by this organizer); like
+        # DuplicateHandler, this assumes nothing else removes them mid-run
+        self._known_dirs: Set[Path] = set()
 
     def build_target_path(self, source_path: Path, metadata: ExtractionResult) -> Path:
         """Build target path based on metadata.
@@ -50,28 +125,233 @@ class Organizer:
 
         return target_path
 
-    def organize_file(self, source_path: Path, target_path: Path) -> bool:
+    def organize_file(
+        self,
+        source_path: Path,
+        target_path: Path,
+        stat: Optional[Union[os.stat_result, FileRecord]] = None,
+        metadata: Optional[ExtractionResult] = None,
+        on_durable: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """Transfer source_path to target_path using the configured mode.
+
+        stat, when known (e.g. the scanner's FileRecord), spares the copy
+        engine from stat'ing the source again. metadata is recorded in the
+        catalog, if any. on_durable is called once the transfer is complete
+        under the durability policy (see DurabilityManager.commit).
+        """
         try:
             if self.dry_run:
-                verb = "move" if self.mode == TransferMode.MOVE else "copy"
-                logger.info(f"[DRY RUN] Would {verb}: {source_path} -> {target_path}")
+                logger.info(
+                    f"[DRY RUN] Would {self.mode.value}: {source_path} -> {target_path}"
+                )
                 return True
 
-            # Create target directory if needed
-            target_path.parent.mkdir(parents=True, exist_ok=True)
+            self._ensure_directory(target_path.parent)
 
             if self.mode == TransferMode.MOVE:
-                if target_path.exists():
-                    target_path.unlink()
+                copied = self._move(source_path, target_path, stat)
+            elif self.mode in LINK_MODES:
+                copied = self._link(source_path, target_path, self.mode)
+            else:
+                copied = self._copy(source_path, target_path, stat)
+
+            if self.verify and not copied:
+                # Renamed or linked: no bytes were copied, only record them
+                self._record_digest(target_path, hash_file(target_path, self.verify))
 
-                shutil.move(str(source_path), str(target_path))
-                logger.info(f"Moved: {source_path.name} -> {target_path}")
+            if self.mode == TransferMode.MOVE:
+                # A copied move removes its source only once the copy is durable
+                self.durability.commit(
+                    target_path,
+                    _written_size(copied, stat),
+                    source=source_path,
+                    unlink_source=copied,
+                    on_durable=on_durable,
+                )
             else:
-                shutil.copy2(source_path, target_path)
-                logger.info(f"Copied: {source_path.name} -> {target_path}")
+                self.durability.commit(
+                    target_path, _written_size(copied, stat), on_durable=on_durable
+                )
+            self._catalog(target_path, stat, metadata)
+
+            logger.info(f"{_PAST_TENSE[self.mode]}: {source_path.name} -> {target_path}")
             return True
 
         except Exception as e:
-            verb = "move" if self.mode == TransferMode.MOVE else "copy"
-            logger.error(f"Failed to {verb} {source_path}: {e}")
+            logger.error(f"Failed to {self.mode.value} {source_path}: {e}")
+            return False
+
+    def link_existing(
+        self,
+        existing_path: Path,
+        target_path: Path,
+        metadata: Optional[ExtractionResult] = None,
+        on_durable: Optional[Callable[[], None]] = None,
+    ) -> bool:
+        """Hardlink target_path to an identical file already in the output.
+
+        Follows the same copy fallback policy as the link modes. The source
+        file is never touched. on_durable is as for organize_file.
+        """
+        try:
+            if self.dry_run:
+                logger.info(f"[DRY RUN] Would link: {target_path} -> {existing_path}")
+                return True
+
+            self._ensure_directory(target_path.parent)
+            copied = self._link(existing_path, target_path, TransferMode.LINK)
+            if not copied and self.verify:
+                self._record_digest(target_path, hash_file(target_path, self.verify))
+            self.durability.commit(
+                target_path, _written_size(copied, None), on_durable=on_durable
+            )
+            self._catalog(target_path, None, metadata)
+            logger.info(f"Linked duplicate: {target_path} -> {existing_path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to link {target_path} to {existing_path}: {e}")
+            return False
+
+    def flush(self) -> None:
+        """Make pending transfers durable (per the durability policy)."""
+        self.durability.flush()
+
+    def prepare_directories(self, directories: Iterable[Path]) -> int:
+        """Create a batch of target directories ahead of their transfers.
+
+        Directories already known to exist are skipped without touching the
+        filesystem; the rest are created parents first, so each costs about
+        one mkdir. Returns the number of directories that were not known.
+        """
+        if self.dry_run:
+            return 0
+
+        with self._lock:
+            missing = {d for d in directories if d not in self._known_dirs}
+        created = 0
+        for directory in sorted(missing):
+            created += self._ensure_directory(directory)
+        return created
+
+    def _ensure_directory(self, directory: Path) -> bool:
+        """Create directory unless known to exist. Returns False if known."""
+        with self._lock:
+            if directory in self._known_dirs:
+                return False
+
+        started = time.perf_counter()
+        syscalls.count(syscalls.MKDIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        metrics.observe(metrics.MKDIR, time.perf_counter() - started)
+
+        with self._lock:
+            # mkdir(parents=True) made every ancestor exist as well
+            for known in (directory, *directory.parents):
+                if known in self._known_dirs:
+                    break
+                self._known_dirs.add(known)
+        return True
+
+    def _copy(
+        self,
+        source_path: Path,
+        target_path: Path,
+        stat: Optional[Union[os.stat_result, FileRecord]] = None,
+    ) -> bool:
+        """Copy data and metadata, verifying it if enabled. Returns True."""
+        if self.verify:
+            method, digest = copy_file_verified(source_path, target_path, self.verify)
+            self._record_digest(target_path, digest)
+        else:
+            size = stat.st_size if stat is not None else None
+            method = copy_file(source_path, target_path, size)
+        with self._lock:
+            self.copy_methods[method] += 1
+        logger.debug(f"Copy method for {source_path.name}: {method}")
+        return True
+
+    def _move(
+        self,
+        source_path: Path,
+        target_path: Path,
+        stat: Optional[Union[os.stat_result, FileRecord]] = None,
+    ) -> bool:
+        """Rename source_path to target_path, copying across filesystems.
+
+        Like shutil.move for files, except that a cross-device move goes
+        through _copy (and so is verified) and leaves the source in place:
+        organize_file hands its removal to the durability policy.
+        Returns True if the data was copied.
+        """
+        syscalls.count(syscalls.STAT)
+        if target_path.exists():
+            syscalls.count(syscalls.UNLINK)
+            target_path.unlink()
+
+        try:
+            os.rename(source_path, target_path)
             return False
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        return self._copy(source_path, target_path, stat)
+
+    def _catalog(
+        self,
+        target_path: Path,
+        stat: Optional[Union[os.stat_result, FileRecord]],
+        metadata: Optional[ExtractionResult],
+    ) -> None:
+        if self.catalog is None:
+            return
+        if stat is None:
+            syscalls.count(syscalls.STAT)
+            stat = target_path.stat()
+        self.catalog.record(target_path, stat.st_size, metadata)
+
+    def _record_digest(self, target_path: Path, digest: str) -> None:
+        if self.manifest is not None:
+            self.manifest.add(target_path, digest)
+        with self._lock:
+            self.verified += 1
+
+    def _link(self, source_path: Path, target_path: Path, mode: TransferMode) -> bool:
+        """Hardlink, symlink or reflink source_path to target_path.
+
+        Returns True if it fell back to copying the data, which it only does
+        when the link is impossible here (a reflink is unsupported, or the
+        errno is in _LINK_UNSUPPORTED_ERRNOS).
+        """
+        # Links cannot replace an existing file (overwrite strategy)
+        syscalls.count(syscalls.LSTAT)
+        if os.path.lexists(target_path):
+            syscalls.count(syscalls.UNLINK)
+            target_path.unlink()
+
+        try:
+            if mode == TransferMode.LINK:
+                os.link(source_path, target_path)
+            elif mode == TransferMode.SYMLINK:
+                os.symlink(os.path.abspath(source_path), target_path)
+            else:
+                reflink_file(source_path, target_path)
+            return False
+        except OSError as e:
+            unsupported = (
+                isinstance(e, CopyUnsupported) or e.errno in _LINK_UNSUPPORTED_ERRNOS
+            )
+            if not (self.fallback_to_copy and unsupported):
+                raise
+            logger.warning(f"Cannot {mode.value} {source_path} ({e}), copying instead")
+            return self._copy(source_path, target_path)
+
+
+def _written_size(
+    copied: bool, stat: Optional[Union[os.stat_result, FileRecord]]
+) -> Optional[int]:
+    """Bytes a transfer wrote: 0 for a rename or link, else the source size."""
+    if not copied:
+        return 0
+    return stat.st_size if stat is not None else None
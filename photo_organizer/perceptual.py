@@ -0,0 +1,233 @@
+"""Perceptual hashes and a near-duplicate index for images.
+
+Byte comparison (duplicates.ContentIndex) misses recompressed, resized or
+converted copies of the same picture. A 64-bit difference hash (dHash) of a
+tiny grayscale thumbnail survives those, and near-duplicates are images
+whose hashes differ in at most `radius` bits.
+"""
+
+import logging
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from PIL import Image, ImageOps
+
+from photo_organizer.filetypes import EXTENSION_TYPES, FileType
+
+try:
+    import numpy as np
+except ImportError:  # optional: pure-Python candidate checks instead
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# dHash compares HASH_SIZE + 1 columns in HASH_SIZE rows: 64 bits
+HASH_SIZE = 8
+HASH_BITS = HASH_SIZE * HASH_SIZE
+
+# Recompressions and resizes typically land within a few bits
+DEFAULT_RADIUS = 5
+
+# Types Pillow can decode (HEIF only with a plugin such as pillow-heif)
+IMAGE_TYPES = {FileType.JPEG, FileType.PNG, FileType.TIFF, FileType.HEIF}
+
+try:
+    _popcount = int.bit_count  # Python 3.10+
+except AttributeError:
+
+    def _popcount(value: int) -> int:
+        return bin(value).count("1")
+
+
+class NearDuplicateStrategy(Enum):
+    """What to do with an image that looks like one already seen."""
+
+    OFF = "off"
+    REPORT = "report"  # log it and transfer anyway
+    SKIP = "skip"
+
+
+def is_image(path: Path) -> bool:
+    """Whether path has an image extension worth hashing."""
+    return EXTENSION_TYPES.get(path.suffix.lower()) in IMAGE_TYPES
+
+
+def dhash(path: Path) -> Optional[int]:
+    """64-bit difference hash of an image, or None if it cannot be decoded.
+
+    JPEGs are decoded at reduced scale (draft mode), so the cost is a
+    fraction of a full decode. EXIF orientation is applied first, so a
+    rotated export matches its original.
+    """
+    try:
+        with Image.open(path) as image:
+            image.draft("L", (HASH_SIZE + 1, HASH_SIZE))
+            image = ImageOps.exif_transpose(image)
+            pixels = (
+                image.convert("L")
+                .resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.BOX)
+                .tobytes()
+            )
+    except Exception as e:
+        logger.debug(f"Cannot hash {path}: {e}")
+        return None
+
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] < pixels[offset + col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return _popcount(a ^ b)
+
+
+def _chunk_layout(radius: int) -> List[Tuple[int, int, Tuple[int, ...]]]:
+    """Split the hash into chunks for NearDuplicateIndex.
+
+    With radius // 2 + 1 chunks, any two hashes within the radius differ in
+    at most radius // (radius // 2 + 1) <= 1 bits of at least one chunk
+    (pigeonhole principle). Returns (shift, mask, probes) per chunk, where
+    probes are the XOR masks of the chunk keys to look up: the key itself,
+    and each single-bit flip when one differing bit is allowed.
+    """
+    count = radius // 2 + 1
+    base, extra = divmod(HASH_BITS, count)
+    layout = []
+    shift = 0
+    for i in range(count):
+        width = base + (1 if i < extra else 0)
+        probes = (0,)
+        if radius // count:
+            probes += tuple(1 << bit for bit in range(width))
+        layout.append((shift, (1 << width) - 1, probes))
+        shift += width
+    return layout
+
+
+class NearDuplicateIndex:
+    """Find the closest known image hash within a Hamming radius.
+
+    Uses multi-index hashing: the 64 bits are split into a few wide chunks
+    (see _chunk_layout), each with a dict from chunk value to the images
+    having it. A query looks up its own chunk values and their one-bit
+    neighbours, which yields every hash within the radius plus a handful of
+    false candidates, instead of comparing against every known hash. Hashes
+    are kept in a packed NumPy uint64 array (when NumPy is installed) so the
+    candidates are checked with one vectorized XOR and popcount.
+    """
+
+    def __init__(self, radius: int = DEFAULT_RADIUS):
+        """Create an empty index.
+
+        Args:
+            radius: Largest Hamming distance (0-63) that counts as a match
+
+        Raises:
+            ValueError: If radius is out of range
+        """
+        if not 0 <= radius < HASH_BITS:
+            raise ValueError(f"radius must be between 0 and {HASH_BITS - 1}: {radius}")
+        self.radius = radius
+        self._layout = _chunk_layout(radius)
+        # Chunk value -> entry id, or a list of ids once several share it
+        # (most values are unique, and a bare int is far smaller than a list)
+        self._buckets: List[Dict[int, Union[int, List[int]]]] = [
+            {} for _ in self._layout
+        ]
+        self._targets: List[Path] = []
+        if np is not None:
+            self._hashes = np.empty(1024, dtype=np.uint64)
+        else:
+            self._hashes = []
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def add(self, phash: int, target: Path) -> None:
+        """Register the hash of an image that lives (or will live) at target."""
+        entry_id = len(self._targets)
+        self._targets.append(target)
+        if np is not None:
+            if entry_id == len(self._hashes):
+                grown = np.empty(2 * len(self._hashes), dtype=np.uint64)
+                grown[:entry_id] = self._hashes
+                self._hashes = grown
+            self._hashes[entry_id] = phash
+        else:
+            self._hashes.append(phash)
+        for (shift, mask, _), buckets in zip(self._layout, self._buckets):
+            key = (phash >> shift) & mask
+            known = buckets.get(key)
+            if known is None:
+                buckets[key] = entry_id
+            elif isinstance(known, list):
+                known.append(entry_id)
+            else:
+                buckets[key] = [known, entry_id]
+
+    def find(self, phash: int) -> Optional[Tuple[Path, int]]:
+        """Return (target, distance) of the closest match within the radius.
+
+        Ties go to the image added first.
+        """
+        candidates: List[int] = []
+        for (shift, mask, probes), buckets in zip(self._layout, self._buckets):
+            key = (phash >> shift) & mask
+            for probe in probes:
+                known = buckets.get(key ^ probe)
+                if known is None:
+                    continue
+                if isinstance(known, list):
+                    candidates.extend(known)
+                else:
+                    candidates.append(known)
+        if not candidates:
+            return None
+
+        if np is not None:
+            best = self._closest_vectorized(phash, candidates)
+        else:
+            best = self._closest(phash, candidates)
+        if best is None:
+            return None
+        entry_id, distance = best
+        return self._targets[entry_id], distance
+
+    def _closest_vectorized(
+        self, phash: int, candidates: List[int]
+    ) -> Optional[Tuple[int, int]]:
+        ids = np.array(candidates, dtype=np.intp)
+        distances = _popcount_array(self._hashes[ids] ^ np.uint64(phash))
+        distance = int(distances.min())
+        if distance > self.radius:
+            return None
+        return int(ids[distances == distance].min()), distance
+
+    def _closest(self, phash: int, candidates: List[int]) -> Optional[Tuple[int, int]]:
+        best = None
+        for entry_id in set(candidates):
+            distance = _popcount(self._hashes[entry_id] ^ phash)
+            if distance <= self.radius and (best is None or (distance, entry_id) < best):
+                best = (distance, entry_id)
+        if best is None:
+            return None
+        return best[1], best[0]
+
+
+if np is not None:
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+
+        def _popcount_array(values):
+            return np.bitwise_count(values)
+
+    else:
+        _BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+        def _popcount_array(values):
+            counts = _BYTE_POPCOUNT[values.view(np.uint8)]
+            return counts.reshape(-1, 8).sum(axis=1)
@@ -0,0 +1,457 @@
+"""Concurrent processing pipeline: extract, name, transfer."""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from photo_organizer import metrics, syscalls
+from photo_organizer.date_resolver import DateResolver
+from photo_organizer.duplicates import (
+    ContentDuplicateStrategy,
+    ContentIndex,
+    DuplicateHandler,
+)
+from photo_organizer.extractors.base import ExtractionResult
+from photo_organizer.index import ScanIndex
+from photo_organizer.journal import Journal, JournalEntry, reconcile
+from photo_organizer.organizer import Organizer
+from photo_organizer.perceptual import (
+    NearDuplicateIndex,
+    NearDuplicateStrategy,
+    dhash,
+    is_image,
+)
+from photo_organizer.profiling import SlowFiles
+from photo_organizer.records import FileRecord
+from photo_organizer.scanner import ScanItem
+
+logger = logging.getLogger(__name__)
+
+# Queue depth per worker; bounds memory while keeping every worker busy
+QUEUE_DEPTH_PER_WORKER = 4
+
+DEFAULT_JOBS = os.cpu_count() or 1
+DEFAULT_IO_JOBS = 4
+
+# Seconds between progress log lines
+DEFAULT_PROGRESS_INTERVAL = 10.0
+
+
+@dataclass
+class RunStats:
+    """Outcome counters for a run."""
+
+    scanned: int = 0
+    processed: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    errors: int = 0
+    # In-flight transfers of an interrupted run finished by replay()
+    resumed: int = 0
+    # Images that looked like one seen earlier (reported or skipped)
+    near_duplicates: int = 0
+
+
+class ProgressReporter:
+    """Log a running file count at a fixed interval.
+
+    The total is unknown while the scan streams in; precount() can fill it
+    in from a separate background walk of the source tree.
+    """
+
+    def __init__(self, interval: float = DEFAULT_PROGRESS_INTERVAL):
+        self.interval = interval
+        self.count = 0
+        self.total: Optional[int] = None
+        self._started = time.monotonic()
+        self._last_report = self._started
+        self._stop = threading.Event()
+
+    def precount(self, files: Iterable[Path]) -> None:
+        """Count files on a daemon thread; the total shows up once done."""
+
+        def count() -> None:
+            total = 0
+            for _ in files:
+                if self._stop.is_set():
+                    return
+                total += 1
+            self.total = total
+            logger.info(f"Pre-count complete: {total} supported files")
+
+        threading.Thread(target=count, name="precount", daemon=True).start()
+
+    def advance(self) -> None:
+        """Count one more file and log progress if the interval has passed."""
+        self.count += 1
+        now = time.monotonic()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            logger.info(f"Progress: {self.describe()}")
+
+    def describe(self) -> str:
+        rate = self.count / max(time.monotonic() - self._started, 1e-9)
+        if self.total:
+            percent = 100.0 * self.count / self.total
+            return f"{self.count}/{self.total} files ({percent:.1f}%, {rate:.0f} files/s)"
+        return f"{self.count} files ({rate:.0f} files/s)"
+
+    def close(self) -> None:
+        """Stop a running pre-count."""
+        self._stop.set()
+
+
+class _Task:
+    """State of one file as it moves through the pipeline."""
+
+    __slots__ = (
+        "path",
+        "stat",
+        "metadata",
+        "existing",
+        "target",
+        "unchanged",
+        "journal_id",
+        "phash",
+        "timings",
+    )
+
+    def __init__(self, path: Path):
+        self.path = path
+        # os.stat_result or the scanner's FileRecord
+        self.stat: Optional[Union[os.stat_result, FileRecord]] = None
+        self.metadata: Optional[ExtractionResult] = None
+        self.existing: Optional[Path] = None
+        self.target: Optional[Path] = None
+        self.unchanged = False
+        self.journal_id: Optional[int] = None
+        # Perceptual hash, when near-duplicate detection is on
+        self.phash: Optional[int] = None
+        # Seconds spent per stage, when the slowest files are tracked
+        self.timings: Optional[Dict[metrics.Key, float]] = None
+
+
+class Pipeline:
+    """Process files in three stages connected by bounded queues.
+
+    1. A pool of `jobs` metadata workers stats each file (unless it comes
+       with a FileRecord from scanner.scan_records), checks the incremental
+       index, runs DateResolver.resolve and, for near-duplicate detection,
+       computes the image's perceptual hash.
+    2. A single naming stage, in input order, looks for content and near
+       duplicates and resolves the target name, so DuplicateHandler and the
+       indexes never see concurrent updates and results are deterministic.
+    3. A pool of `io_jobs` transfer workers runs Organizer.organize_file.
+       Planned transfers are submitted in batches, after creating the
+       batch's target directories in one pass.
+    """
+
+    def __init__(
+        self,
+        resolver: DateResolver,
+        organizer: Organizer,
+        duplicate_handler: DuplicateHandler,
+        index: Optional[ScanIndex] = None,
+        content_index: Optional[ContentIndex] = None,
+        content_strategy: ContentDuplicateStrategy = ContentDuplicateStrategy.KEEP,
+        jobs: int = DEFAULT_JOBS,
+        io_jobs: int = DEFAULT_IO_JOBS,
+        journal: Optional[Journal] = None,
+        near_index: Optional[NearDuplicateIndex] = None,
+        near_strategy: NearDuplicateStrategy = NearDuplicateStrategy.REPORT,
+        slow_files: Optional[SlowFiles] = None,
+    ):
+        self.resolver = resolver
+        self.organizer = organizer
+        self.duplicate_handler = duplicate_handler
+        self.index = index
+        self.content_index = content_index
+        self.content_strategy = content_strategy
+        self.jobs = max(1, jobs)
+        self.io_jobs = max(1, io_jobs)
+        self.journal = journal
+        self.near_index = near_index
+        self.near_strategy = near_strategy
+        self.slow_files = slow_files
+        self.stats = RunStats()
+        # Transfers not yet finished, by target, so links can wait for them
+        self._in_flight: Dict[Path, Future] = {}
+
+    def run(
+        self, files: Iterable[ScanItem], progress: Optional[ProgressReporter] = None
+    ) -> RunStats:
+        """Process every file and return the outcome counters.
+
+        files (paths or FileRecords) is consumed lazily, so a streaming scan
+        starts being processed immediately and memory stays bounded by the
+        queue depths.
+        """
+        progress = progress or ProgressReporter()
+        metadata_queue: Deque[Future] = deque()
+        transfer_queue: Deque[Tuple[_Task, Future]] = deque()
+        metadata_depth = self.jobs * QUEUE_DEPTH_PER_WORKER
+        transfer_depth = self.io_jobs * QUEUE_DEPTH_PER_WORKER
+
+        with ThreadPoolExecutor(
+            max_workers=self.jobs, thread_name_prefix="metadata"
+        ) as metadata_pool, ThreadPoolExecutor(
+            max_workers=self.io_jobs, thread_name_prefix="transfer"
+        ) as transfer_pool:
+
+            # Planned transfers not yet submitted; their target directories
+            # are created in one pass before the batch is submitted
+            planned: List[_Task] = []
+
+            def plan_next() -> None:
+                task = metadata_queue.popleft().result()
+                progress.advance()
+                with metrics.attribute(task.timings):
+                    needs_transfer = self._plan(task)
+                if needs_transfer:
+                    planned.append(task)
+                    if len(planned) >= transfer_depth:
+                        submit_planned()
+                else:
+                    self._track_time(task)
+
+            def submit_planned() -> None:
+                self.organizer.prepare_directories(
+                    {task.target.parent for task in planned}
+                )
+                if self.journal is not None:
+                    for task in planned:
+                        self._journal_plan(task)
+                    # Write-ahead: plans are durable before any transfer starts
+                    self.journal.sync()
+                for task in planned:
+                    # Never run two transfers to the same target (overwrite)
+                    while task.target in self._in_flight:
+                        self._finish(*transfer_queue.popleft())
+                    while len(transfer_queue) >= transfer_depth:
+                        self._finish(*transfer_queue.popleft())
+                    future = transfer_pool.submit(self._transfer, task)
+                    self._in_flight[task.target] = future
+                    transfer_queue.append((task, future))
+                planned.clear()
+
+            for file_path in files:
+                self.stats.scanned += 1
+                if len(metadata_queue) >= metadata_depth:
+                    plan_next()
+                metadata_queue.append(metadata_pool.submit(self._analyze, file_path))
+
+            while metadata_queue:
+                plan_next()
+            submit_planned()
+            while transfer_queue:
+                self._finish(*transfer_queue.popleft())
+
+        # The last partial batch under --durability batch
+        self.organizer.flush()
+        return self.stats
+
+    def _analyze(self, item: ScanItem) -> _Task:
+        """Metadata stage (worker thread): stat, index check, extraction."""
+        if isinstance(item, FileRecord):
+            task = _Task(item.path)
+            task.stat = item
+        else:
+            task = _Task(item)
+        if self.slow_files is not None:
+            task.timings = {}
+        file_path = task.path
+        with metrics.attribute(task.timings), metrics.timed(metrics.METADATA):
+            try:
+                if task.stat is None and (
+                    self.index is not None
+                    or self.content_index is not None
+                    or self.resolver.cache is not None
+                ):
+                    syscalls.count(syscalls.STAT)
+                    task.stat = file_path.stat()
+
+                if self.index is not None and self.index.is_unchanged(task.stat):
+                    task.unchanged = True
+                    return task
+
+                task.metadata = self.resolver.resolve(file_path, task.stat)
+                if self.near_index is not None and is_image(file_path):
+                    with metrics.timed(metrics.PERCEPTUAL_HASH):
+                        task.phash = dhash(file_path)
+            except Exception as e:
+                logger.error(f"Failed to read {file_path}: {e}")
+        return task
+
+    def _plan(self, task: _Task) -> bool:
+        """Naming stage (main thread). Returns True if a transfer is needed."""
+        file_path = task.path
+        logger.debug(f"Planning: {file_path}")
+
+        if task.unchanged:
+            logger.debug(f"Unchanged since last run: {file_path}")
+            self.stats.unchanged += 1
+            return False
+
+        if not task.metadata:
+            logger.warning(f"Could not determine date for: {file_path}")
+            self.stats.errors += 1
+            return False
+
+        # Look for byte-identical content already organized
+        if self.content_index is not None:
+            try:
+                with metrics.timed(metrics.DUPLICATES, "content"):
+                    task.existing = self.content_index.find(
+                        file_path, task.stat.st_size
+                    )
+            except OSError as e:
+                logger.error(f"Cannot read {file_path}: {e}")
+                self.stats.errors += 1
+                return False
+            if (
+                task.existing is not None
+                and self.content_strategy == ContentDuplicateStrategy.SKIP
+            ):
+                logger.info(f"Skipped (identical to {task.existing}): {file_path.name}")
+                self.stats.skipped += 1
+                return False
+
+        # Look for a perceptually similar image (recompressed, resized, ...)
+        near = None
+        if task.phash is not None and task.existing is None:
+            with metrics.timed(metrics.DUPLICATES, "near"):
+                near = self.near_index.find(task.phash)
+            if near is not None:
+                self.stats.near_duplicates += 1
+                if self.near_strategy == NearDuplicateStrategy.SKIP:
+                    logger.info(
+                        f"Skipped (near duplicate of {near[0]}, distance {near[1]}): "
+                        f"{file_path.name}"
+                    )
+                    self.stats.skipped += 1
+                    return False
+                logger.warning(
+                    f"Near duplicate of {near[0]} (distance {near[1]}): {file_path}"
+                )
+
+        # Build target path
+        target_path = self.organizer.build_target_path(file_path, task.metadata)
+        if task.existing == target_path:
+            logger.info(f"Skipped (already organized): {file_path.name}")
+            self.stats.skipped += 1
+            return False
+
+        # Handle duplicates
+        with metrics.timed(metrics.DUPLICATES, "name"):
+            task.target = self.duplicate_handler.resolve(target_path)
+        if task.target is None:
+            logger.info(f"Skipped (duplicate): {file_path.name}")
+            self.stats.skipped += 1
+            return False
+
+        # Register now so later files in this run match it even while the
+        # transfer is still in flight
+        if self.content_index is not None and task.existing is None:
+            self.content_index.add(file_path, task.stat.st_size, target=task.target)
+        if task.phash is not None and task.existing is None and near is None:
+            self.near_index.add(task.phash, task.target)
+
+        return True
+
+    def replay(self, entries: List[JournalEntry]) -> None:
+        """Finish transfers a previous, interrupted run left in flight.
+
+        Targets are claimed first, so newly planned files never take their
+        names. Each entry is then reconciled with what is on disk and redone
+        if needed, without re-extracting its metadata.
+        """
+        for entry in entries:
+            self.duplicate_handler.claim(entry.target)
+
+        for entry in entries:
+            self.stats.resumed += 1
+            task = _Task(entry.source)
+            task.target = entry.target
+            task.existing = entry.link_to
+            task.journal_id = entry.id
+            try:
+                if not reconcile(entry):
+                    logger.info(f"Already completed before interruption: {entry.target}")
+                    self.journal.done(entry.id)
+                    self.stats.processed += 1
+                    continue
+                if self.index is not None:
+                    task.stat = entry.source.stat()
+                self.organizer.prepare_directories([entry.target.parent])
+                success = self._transfer(task)
+            except OSError as e:
+                logger.error(f"Cannot resume {entry.source}: {e}")
+                success = False
+            self._record_outcome(task, success)
+
+    def _journal_plan(self, task: _Task) -> None:
+        if task.existing is not None:
+            mode, link_to = "link", task.existing
+        else:
+            mode, link_to = self.organizer.mode.value, None
+        task.journal_id = self.journal.plan(task.path, task.target, mode, link_to)
+
+    def _transfer(self, task: _Task) -> bool:
+        """Transfer stage (worker thread)."""
+        with metrics.attribute(task.timings), metrics.timed(metrics.TRANSFER):
+            return self._transfer_task(task)
+
+    def _transfer_task(self, task: _Task) -> bool:
+        on_durable = None
+        if task.journal_id is not None:
+            self.journal.start(task.journal_id)
+            # Only "done" once durable: a batched move still holds its source
+            on_durable = partial(self.journal.done, task.journal_id)
+        if task.existing is not None:
+            # The identical file may have been planned earlier in this run;
+            # transfers start in submission order, so it is running or done
+            original = self._in_flight.get(task.existing)
+            if original is not None:
+                original.result()
+            return self.organizer.link_existing(
+                task.existing, task.target, task.metadata, on_durable
+            )
+        return self.organizer.organize_file(
+            task.path, task.target, task.stat, task.metadata, on_durable
+        )
+
+    def _finish(self, task: _Task, future: Future) -> None:
+        """Collect a transfer result (main thread)."""
+        success = future.result()
+        del self._in_flight[task.target]
+        self._record_outcome(task, success)
+
+    def _record_outcome(self, task: _Task, success: bool) -> None:
+        # Successful transfers are journaled as done by the durability policy
+        if task.journal_id is not None and not success:
+            self.journal.fail(task.journal_id)
+
+        if success:
+            self.stats.processed += 1
+            metrics.count(metrics.FILES)
+            if task.stat is not None:
+                metrics.count(metrics.BYTES, task.stat.st_size)
+            if self.index is not None and not self.organizer.dry_run:
+                self.index.record(task.path, task.stat, task.target)
+        else:
+            if not task.target.exists():
+                self.duplicate_handler.release(task.target)
+            self.stats.errors += 1
+        self._track_time(task)
+
+    def _track_time(self, task: _Task) -> None:
+        """Offer a file that is done with to the slowest-files list."""
+        if task.timings is not None:
+            self.slow_files.add(task.path, task.timings)
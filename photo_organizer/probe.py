@@ -0,0 +1,148 @@
+"""Shared per-file I/O for the extractor chain."""
+
+import logging
+import mmap
+import os
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+from photo_organizer import syscalls
+from photo_organizer.records import FileRecord
+
+logger = logging.getLogger(__name__)
+
+# Read-ahead buffer: covers the sniff bytes, JPEG APP1 segments, TIFF IFDs
+# and the leading boxes of most videos
+HEADER_SIZE = 64 * 1024
+
+# Files at least this large are memory-mapped instead of read with pread
+MMAP_THRESHOLD = 1024 * 1024
+
+
+class FileProbe:
+    """One open handle, header buffer and stat result shared by extractors.
+
+    DateResolver creates a probe per file and passes it to every extractor,
+    so a file is opened and its header read at most once however many
+    extractors look at it. Nothing is opened until data is first requested,
+    so stat-only extractors cost no open at all.
+
+    The probe is also a read-only binary file object (read/seek/tell), so
+    parsers written against open() handles, and Pillow, can use it directly.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        stat: Optional[Union[os.stat_result, FileRecord]] = None,
+        header_size: int = HEADER_SIZE,
+        mmap_threshold: int = MMAP_THRESHOLD,
+    ):
+        self.path = path
+        self.header_size = header_size
+        self.mmap_threshold = mmap_threshold
+        self._stat = stat
+        self._fh: Optional[BinaryIO] = None
+        self._map: Optional[mmap.mmap] = None
+        self._header: Optional[bytes] = None
+        self._position = 0
+
+    def stat(self) -> Union[os.stat_result, FileRecord]:
+        """Stat result of the file (or the scanner's record), fetched once."""
+        if self._stat is None:
+            if self._fh is not None:
+                syscalls.count(syscalls.FSTAT)
+                self._stat = os.fstat(self._fh.fileno())
+            else:
+                syscalls.count(syscalls.STAT)
+                self._stat = self.path.stat()
+        return self._stat
+
+    @property
+    def size(self) -> int:
+        return self.stat().st_size
+
+    @property
+    def header(self) -> bytes:
+        """First header_size bytes of the file (fewer for small files).
+
+        Raises:
+            OSError: If the file cannot be opened or read
+        """
+        if self._header is None:
+            self._open()
+        return self._header
+
+    def read_at(self, offset: int, size: int) -> bytes:
+        """Read up to size bytes at offset without moving the position."""
+        header = self.header
+        end = offset + size
+        if end <= len(header) or len(header) < self.header_size:
+            # Inside the buffer, or the buffer already holds the whole file
+            return header[offset:end]
+        if self._map is not None:
+            return self._map[offset:end]
+        if hasattr(os, "pread"):
+            return os.pread(self._fh.fileno(), size, offset)
+        self._fh.seek(offset)
+        return self._fh.read(size)
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = max(self.size - self._position, 0)
+        data = self.read_at(self._position, size)
+        self._position += len(data)
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def seekable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        """Release the mapping and the handle; the probe can be reopened."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        self._header = None
+
+    def _open(self) -> None:
+        syscalls.count(syscalls.OPEN)
+        self._fh = open(self.path, "rb")
+        try:
+            size = self.stat().st_size
+            if size >= self.mmap_threshold:
+                try:
+                    self._map = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError) as e:
+                    logger.debug(f"Cannot mmap {self.path}: {e}")
+            if self._map is not None:
+                self._header = self._map[: self.header_size]
+            else:
+                self._header = self._fh.read(self.header_size)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> "FileProbe":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
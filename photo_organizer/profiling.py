@@ -0,0 +1,153 @@
+"""Profiling hooks for --profile: cProfile, tracemalloc and the slowest files.
+
+Finding the one pathological input (a huge TIFF, a folder name that makes
+the filename patterns work hard) otherwise means rerunning the whole job
+under a profiler by hand.
+"""
+
+import cProfile
+import heapq
+import logging
+import pstats
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from photo_organizer import metrics
+from photo_organizer.metrics import Key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_FILES = 20
+
+# Stages timed inside another one, whose own time excludes theirs
+_ENCLOSING = {
+    metrics.EXTRACT: (metrics.METADATA, ""),
+    metrics.PERCEPTUAL_HASH: (metrics.METADATA, ""),
+    metrics.MKDIR: (metrics.TRANSFER, ""),
+    metrics.FSYNC: (metrics.TRANSFER, ""),
+}
+
+
+class Profiler:
+    """cProfile every thread of a run, optionally with a tracemalloc snapshot.
+
+    cProfile only sees the thread that enabled it before Python 3.12, so
+    each thread started while profiling gets its own profiler, and the
+    results are merged into one pstats dump. From 3.12 on, a single
+    profiler sees every thread.
+    """
+
+    def __init__(self, path: Path, memory: bool = False):
+        """Create a profiler.
+
+        Args:
+            path: pstats dump to write (python -m pstats can read it)
+            memory: Also trace allocations and dump a tracemalloc snapshot to
+                path with a .tracemalloc suffix added
+        """
+        self.path = path
+        self.memory = memory
+        self._main = cProfile.Profile()
+        self._threads: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    @property
+    def memory_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".tracemalloc")
+
+    def start(self) -> None:
+        if self.memory:
+            tracemalloc.start()
+        if sys.version_info < (3, 12):
+            threading.setprofile(self._profile_thread)
+        self._main.enable()
+
+    def stop(self) -> None:
+        """Stop profiling and write the dumps."""
+        self._main.disable()
+        threading.setprofile(None)
+        stats = pstats.Stats(self._main)
+        with self._lock:
+            for profile in self._threads:
+                stats.add(profile)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(self.path)
+        logger.info(f"Profile written to {self.path} (inspect with python -m pstats)")
+
+        if self.memory:
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            snapshot.dump(str(self.memory_path))
+            logger.info(
+                f"Memory snapshot written to {self.memory_path} "
+                f"(peak {peak / (1024 * 1024):.1f} MB traced)"
+            )
+
+    def _profile_thread(self, frame, event, arg) -> None:
+        # Runs as the first profile event of each new thread; enabling
+        # replaces this hook with the thread's own profiler
+        profile = cProfile.Profile()
+        with self._lock:
+            self._threads.append(profile)
+        profile.enable()
+
+
+class SlowFile:
+    """Where one file spent its time."""
+
+    __slots__ = ("path", "seconds", "stage", "stage_seconds")
+
+    def __init__(self, path: Path, seconds: float, stage: str, stage_seconds: float):
+        self.path = path
+        # Total over every stage
+        self.seconds = seconds
+        # The stage (or extractor, as "extract.<name>") that took the longest
+        self.stage = stage
+        self.stage_seconds = stage_seconds
+
+
+class SlowFiles:
+    """Keep the `limit` slowest files of a run. Safe to share between threads."""
+
+    def __init__(self, limit: int = DEFAULT_TOP_FILES):
+        self.limit = limit
+        # Min-heap of (seconds, insertion order, SlowFile)
+        self._heap: List[Tuple[float, int, SlowFile]] = []
+        self._added = 0
+        self._lock = threading.Lock()
+
+    def add(self, path: Path, timings: Dict[Key, float]) -> None:
+        """Consider a file, given its stage timings (see metrics.attribute)."""
+        own = _own_times(timings)
+        if not own or self.limit <= 0:
+            return
+        total = sum(own.values())
+        with self._lock:
+            if len(self._heap) >= self.limit and total <= self._heap[0][0]:
+                return
+            key, seconds = max(own.items(), key=lambda item: item[1])
+            entry = SlowFile(path, total, metrics.stage_name(key), seconds)
+            self._added += 1
+            if len(self._heap) < self.limit:
+                heapq.heappush(self._heap, (total, self._added, entry))
+            else:
+                heapq.heapreplace(self._heap, (total, self._added, entry))
+
+    def slowest(self) -> List[SlowFile]:
+        """The recorded files, slowest first."""
+        with self._lock:
+            return [entry for _, _, entry in sorted(self._heap, reverse=True)]
+
+
+def _own_times(timings: Dict[Key, float]) -> Dict[Key, float]:
+    """Per-stage times with nested stages subtracted from their enclosing one."""
+    own = dict(timings)
+    for (stage, _), seconds in timings.items():
+        outer = _ENCLOSING.get(stage)
+        if outer in own:
+            own[outer] = max(0.0, own[outer] - seconds)
+    return own
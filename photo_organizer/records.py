@@ -0,0 +1,62 @@
+"""Lightweight per-file records produced by the scanner."""
+
+import os
+from pathlib import Path
+
+
+class FileRecord:
+    """Identity and timestamps of a scanned file, fetched with one stat.
+
+    Produced by scanner.scan_records() and carried through the pipeline so
+    later stages do not stat the file again. The st_* properties mirror the
+    os.stat_result fields the rest of the package reads, so a record can be
+    passed wherever a stat result is expected (ScanIndex, MetadataCache,
+    FileProbe, ContentIndex).
+    """
+
+    __slots__ = ("path", "size", "mtime_ns", "ctime_ns", "ino", "dev")
+
+    def __init__(
+        self, path: Path, size: int, mtime_ns: int, ctime_ns: int, ino: int, dev: int
+    ):
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.ctime_ns = ctime_ns
+        self.ino = ino
+        self.dev = dev
+
+    @classmethod
+    def from_stat(cls, path: Path, st: os.stat_result) -> "FileRecord":
+        return cls(path, st.st_size, st.st_mtime_ns, st.st_ctime_ns, st.st_ino, st.st_dev)
+
+    @property
+    def st_size(self) -> int:
+        return self.size
+
+    @property
+    def st_mtime_ns(self) -> int:
+        return self.mtime_ns
+
+    @property
+    def st_ctime_ns(self) -> int:
+        return self.ctime_ns
+
+    @property
+    def st_mtime(self) -> float:
+        return self.mtime_ns / 1e9
+
+    @property
+    def st_ctime(self) -> float:
+        return self.ctime_ns / 1e9
+
+    @property
+    def st_ino(self) -> int:
+        return self.ino
+
+    @property
+    def st_dev(self) -> int:
+        return self.dev
+
+    def __repr__(self) -> str:
+        return f"FileRecord({str(self.path)!r}, size={self.size})"
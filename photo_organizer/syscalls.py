@@ -0,0 +1,38 @@
+"""Counters for the filesystem metadata calls made during a run.
+
+Call sites that stat, open, list or create paths report them here, so the
+run summary can show how many calls each file cost.
+"""
+
+import threading
+from collections import Counter
+
+STAT = "stat"
+LSTAT = "lstat"
+FSTAT = "fstat"
+OPEN = "open"
+SCANDIR = "scandir"
+MKDIR = "mkdir"
+UNLINK = "unlink"
+COPYSTAT = "copystat"
+
+_counts: Counter = Counter()
+_lock = threading.Lock()
+
+
+def count(name: str, calls: int = 1) -> None:
+    """Record calls to a filesystem operation."""
+    with _lock:
+        _counts[name] += calls
+
+
+def snapshot() -> Counter:
+    """Return a copy of the counters."""
+    with _lock:
+        return Counter(_counts)
+
+
+def reset() -> None:
+    """Clear the counters (at the start of a run)."""
+    with _lock:
+        _counts.clear()
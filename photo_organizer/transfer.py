@@ -0,0 +1,234 @@
+"""Fast file copy engine: reflink, in-kernel copy, then buffered fallback."""
+
+import errno
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional, Tuple
+
+from photo_organizer import syscalls
+from photo_organizer.verify import VerificationError, drop_cache, hash_file, new_hasher
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ioctl request number for FICLONE (linux/fs.h): share extents, copy nothing
+FICLONE = 0x40049409
+
+REFLINK = "reflink"
+COPY_FILE_RANGE = "copy_file_range"
+SENDFILE = "sendfile"
+BUFFERED = "buffered"
+
+# Errors meaning "this mechanism is not available here", as opposed to a real
+# I/O failure that should be reported
+_UNSUPPORTED_ERRNOS = {
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.ENOTSUP,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EBADF,
+    errno.EPERM,
+    errno.ETXTBSY,
+}
+
+# Upper bound per in-kernel copy call
+_CHUNK_SIZE = 1024 * 1024 * 1024
+_BUFFER_SIZE = 1024 * 1024
+
+
+class CopyUnsupported(OSError):
+    """Raised when a copy mechanism is unavailable for a file pair."""
+
+
+def copy_file(source: Path, target: Path, size: Optional[int] = None) -> str:
+    """Copy data and metadata like shutil.copy2, using the cheapest mechanism.
+
+    Tries, in order: an FICLONE reflink (btrfs, XFS), os.copy_file_range,
+    os.sendfile, and finally a buffered read/write loop. Permission bits and
+    timestamps are then copied with shutil.copystat, as copy2 does.
+
+    Args:
+        source: File to copy
+        target: Destination path (created or truncated)
+        size: Size of source, if already known (saves an fstat); a hint
+            only, a file that has grown since is still copied in full
+
+    Returns:
+        Name of the mechanism that copied the data
+    """
+    syscalls.count(syscalls.OPEN, 2)
+    with open(source, "rb") as fsrc, open(target, "wb") as fdst:
+        method = copy_data(fsrc, fdst, size)
+    syscalls.count(syscalls.COPYSTAT)
+    shutil.copystat(source, target)
+    return method
+
+
+def copy_file_verified(source: Path, target: Path, algorithm: str) -> Tuple[str, str]:
+    """Copy like copy_file, proving the target is byte-identical to the source.
+
+    A reflink shares the source's extents, so the clone only needs hashing
+    once, for its digest. Otherwise the data is copied through a buffered
+    loop that hashes the source as it streams, the target is synced and
+    evicted from the page cache, and only the target is read back to
+    compare. The source is read once either way.
+
+    Args:
+        source: File to copy
+        target: Destination path (created or truncated)
+        algorithm: Digest algorithm, one of verify.ALGORITHMS
+
+    Returns:
+        Name of the copy mechanism and the hex digest of the file
+
+    Raises:
+        VerificationError: If the target does not match (it is removed)
+    """
+    syscalls.count(syscalls.OPEN, 2)
+    with open(source, "rb") as fsrc, open(target, "wb") as fdst:
+        try:
+            _reflink(fsrc, fdst)
+            method = REFLINK
+            source_digest = None
+        except CopyUnsupported as e:
+            logger.debug(f"{REFLINK} unavailable: {e}")
+            _rewind(fsrc, fdst)
+            source_digest = _copy_and_hash(fsrc, fdst, algorithm)
+            method = BUFFERED
+            fdst.flush()
+            os.fsync(fdst.fileno())
+            drop_cache(fdst.fileno())
+    syscalls.count(syscalls.COPYSTAT)
+    shutil.copystat(source, target)
+
+    target_digest = hash_file(target, algorithm)
+    if source_digest is not None and target_digest != source_digest:
+        target.unlink(missing_ok=True)
+        raise VerificationError(
+            f"{target} does not match {source} "
+            f"({algorithm} {target_digest} != {source_digest})"
+        )
+    return method, target_digest
+
+
+def reflink_file(source: Path, target: Path) -> None:
+    """Clone source into target with FICLONE, preserving metadata.
+
+    Raises:
+        CopyUnsupported: If the filesystem cannot share extents between them
+    """
+    syscalls.count(syscalls.OPEN, 2)
+    try:
+        with open(source, "rb") as fsrc, open(target, "wb") as fdst:
+            _reflink(fsrc, fdst)
+    except OSError:
+        # Do not leave an empty file behind
+        target.unlink(missing_ok=True)
+        raise
+    syscalls.count(syscalls.COPYSTAT)
+    shutil.copystat(source, target)
+
+
+def copy_data(fsrc: BinaryIO, fdst: BinaryIO, size: Optional[int] = None) -> str:
+    """Copy the contents of one open file into another (empty) one."""
+    if size is None:
+        syscalls.count(syscalls.FSTAT)
+        size = os.fstat(fsrc.fileno()).st_size
+
+    try:
+        _reflink(fsrc, fdst)
+        return REFLINK
+    except CopyUnsupported as e:
+        logger.debug(f"{REFLINK} unavailable: {e}")
+        _rewind(fsrc, fdst)
+
+    for method, call in ((COPY_FILE_RANGE, _copy_file_range), (SENDFILE, _sendfile)):
+        try:
+            _copy_in_kernel(fsrc, fdst, size, call)
+            return method
+        except CopyUnsupported as e:
+            logger.debug(f"{method} unavailable: {e}")
+            _rewind(fsrc, fdst)
+
+    shutil.copyfileobj(fsrc, fdst, _BUFFER_SIZE)
+    return BUFFERED
+
+
+def _reflink(fsrc: BinaryIO, fdst: BinaryIO) -> None:
+    if fcntl is None:
+        raise CopyUnsupported(errno.ENOSYS, "fcntl not available")
+    try:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+    except OSError as e:
+        if e.errno in _UNSUPPORTED_ERRNOS:
+            raise CopyUnsupported(e.errno, e.strerror) from e
+        raise
+
+
+def _copy_file_range(in_fd: int, out_fd: int, count: int) -> int:
+    if not hasattr(os, "copy_file_range"):
+        raise CopyUnsupported(errno.ENOSYS, "copy_file_range not available")
+    return os.copy_file_range(in_fd, out_fd, count)
+
+
+def _sendfile(in_fd: int, out_fd: int, count: int) -> int:
+    if not hasattr(os, "sendfile"):
+        raise CopyUnsupported(errno.ENOSYS, "sendfile not available")
+    return os.sendfile(out_fd, in_fd, None, count)
+
+
+def _copy_in_kernel(
+    fsrc: BinaryIO, fdst: BinaryIO, size: int, call: Callable[[int, int, int], int]
+) -> None:
+    """Copy with copy_file_range/sendfile, which advance both file offsets.
+
+    size (from the scan, or an fstat) is only a hint: the file may have grown
+    since, so copying goes on until the call reports end of file.
+    """
+    in_fd = fsrc.fileno()
+    out_fd = fdst.fileno()
+    copied = 0
+    while True:
+        try:
+            count = min(max(size - copied, _BUFFER_SIZE), _CHUNK_SIZE)
+            sent = call(in_fd, out_fd, count)
+        except OSError as e:
+            # Only fall back if nothing was written yet
+            if copied == 0 and e.errno in _UNSUPPORTED_ERRNOS:
+                raise CopyUnsupported(e.errno, e.strerror) from e
+            raise
+        if sent == 0:
+            if copied == 0 and size > 0:
+                # Some filesystems report success but copy nothing
+                raise CopyUnsupported(errno.EINVAL, "no data copied")
+            break
+        copied += sent
+
+
+def _copy_and_hash(fsrc: BinaryIO, fdst: BinaryIO, algorithm: str) -> str:
+    """Buffered copy that hashes the bytes on the way through."""
+    hasher = new_hasher(algorithm)
+    buffer = bytearray(_BUFFER_SIZE)
+    view = memoryview(buffer)
+    while True:
+        count = fsrc.readinto(buffer)
+        if not count:
+            break
+        hasher.update(view[:count])
+        fdst.write(view[:count])
+    return hasher.hexdigest()
+
+
+def _rewind(fsrc: BinaryIO, fdst: BinaryIO) -> None:
+    """Reset both files before trying the next mechanism."""
+    fsrc.seek(0)
+    fdst.seek(0)
+    fdst.truncate()
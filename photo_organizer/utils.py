@@ -4,6 +4,7 @@ import re
 import logging
 import sys
 from pathlib import Path
+from typing import Optional
 
 
 def sanitize_filename(name: str) -> str:
@@ -21,6 +22,29 @@ def sanitize_filename(name: str) -> str:
     return sanitized
 
 
+def combine_make_model(make: Optional[str], model: Optional[str]) -> Optional[str]:
+    """Combine camera make and model into a single display name.
+
+    The make is omitted when the model already starts with it
+    (e.g. "Canon" + "Canon EOS R5" -> "Canon EOS R5").
+    """
+    make = make.strip() if make else ""
+    model = model.strip() if model else ""
+
+    if make and model:
+        if model.startswith(make):
+            return model
+        return f"{make} {model}".strip()
+
+    if model:
+        return model
+
+    if make:
+        return make
+
+    return None
+
+
 def setup_logging(level: str = "INFO") -> None:
     """Configure logging for the application."""
     numeric_level = getattr(logging, level.upper(), logging.INFO)
@@ -0,0 +1,122 @@
+"""Content digests for verified transfers, and the checksum manifest."""
+
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Optional, TextIO
+
+from photo_organizer import syscalls
+
+logger = logging.getLogger(__name__)
+
+# Digest algorithms for --verify. blake2b uses its full 512-bit digest, the
+# b2sum default, so either manifest can be checked with standard tools.
+ALGORITHMS = {
+    "blake2b": hashlib.blake2b,
+    "sha256": hashlib.sha256,
+}
+
+# Manifest location, relative to the output root; named after the tool that
+# can check it (run from the output root: sha256sum -c .photo-organizer/...)
+MANIFEST_FILENAMES = {
+    "blake2b": Path(".photo-organizer") / "manifest.b2sum",
+    "sha256": Path(".photo-organizer") / "manifest.sha256sum",
+}
+
+_BUFFER_SIZE = 1024 * 1024
+
+
+class VerificationError(OSError):
+    """Raised when a transferred file does not match its source."""
+
+
+def new_hasher(algorithm: str):
+    """Return a fresh hashlib object for one of ALGORITHMS."""
+    return ALGORITHMS[algorithm]()
+
+
+def hash_file(path: Path, algorithm: str) -> str:
+    """Hex digest of a file's contents."""
+    hasher = new_hasher(algorithm)
+    buffer = bytearray(_BUFFER_SIZE)
+    view = memoryview(buffer)
+    syscalls.count(syscalls.OPEN)
+    with open(path, "rb", buffering=0) as fh:
+        while True:
+            count = fh.readinto(buffer)
+            if not count:
+                break
+            hasher.update(view[:count])
+    return hasher.hexdigest()
+
+
+def drop_cache(fd: int) -> None:
+    """Evict a file's (already synced) pages, so a re-read hits the device.
+
+    Without this, verifying a freshly written file would only read back the
+    page cache. A no-op where posix_fadvise is unavailable.
+    """
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError as e:
+            logger.debug(f"posix_fadvise failed: {e}")
+
+
+class Manifest:
+    """Checksum manifest of organized files, in sha256sum/b2sum format.
+
+    Lines are appended as "<hex digest>  <path relative to output root>", so
+    a later audit can check the output tree without reading the sources.
+    Lines are buffered until flush() or close(). Safe to share between
+    threads.
+    """
+
+    def __init__(self, output_root: Path, algorithm: str, fsync: bool = False):
+        """Open a manifest for appending.
+
+        Args:
+            output_root: Root of the organized tree; paths are relative to it
+            algorithm: Digest algorithm, one of ALGORITHMS
+            fsync: Force flushed lines to stable storage
+        """
+        self.output_root = output_root
+        self.algorithm = algorithm
+        self.fsync = fsync
+        self.path = output_root / MANIFEST_FILENAMES[algorithm]
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh: Optional[TextIO] = open(self.path, "a", encoding="utf-8")
+
+    def add(self, target: Path, digest: str) -> None:
+        """Record the digest of a file in the output tree."""
+        try:
+            name = target.relative_to(self.output_root)
+        except ValueError:
+            name = target
+        with self._lock:
+            self._fh.write(f"{digest}  {name.as_posix()}\n")
+
+    def flush(self) -> None:
+        """Write buffered lines out (and fsync them, if enabled)."""
+        with self._lock:
+            if self._fh is None:
+                return
+            self._fh.flush()
+            if self.fsync:
+                os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def __enter__(self) -> "Manifest":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
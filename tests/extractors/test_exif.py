@@ -132,3 +132,36 @@ def test_extract_camera_model_empty_strings(tmp_path):
 
     assert result is not None
     assert result.camera_model is None
+
+
+def test_extract_jpeg_does_not_use_pillow(tmp_path, monkeypatch):
+    img_path = tmp_path / "native.jpg"
+    img = Image.new("RGB", (100, 100), color="red")
+    exif = Image.Exif()
+    exif[0x9003] = "2024:10:15 14:30:00"
+    img.save(img_path, exif=exif)
+
+    extractor = ExifExtractor()
+
+    def fail(file_path):
+        raise AssertionError("Pillow fallback should not be used for JPEG")
+
+    monkeypatch.setattr(extractor, "_read_with_pillow", fail)
+    result = extractor.extract(img_path)
+
+    assert result is not None
+    assert result.date == datetime(2024, 10, 15, 14, 30, 0)
+
+
+def test_extract_png_uses_pillow_fallback(tmp_path):
+    img_path = tmp_path / "image.png"
+    img = Image.new("RGB", (100, 100), color="red")
+    exif = Image.Exif()
+    exif[0x9003] = "2024:10:15 14:30:00"
+    img.save(img_path, exif=exif)
+
+    extractor = ExifExtractor()
+    result = extractor.extract(img_path)
+
+    assert result is not None
+    assert result.date == datetime(2024, 10, 15, 14, 30, 0)
@@ -0,0 +1,82 @@
+import io
+import struct
+import pytest
+from PIL import Image
+from photo_organizer.extractors.exif_parser import (
+    ExifParseError,
+    TAG_DATETIME_ORIGINAL,
+    TAG_MAKE,
+    TAG_MODEL,
+    read_exif,
+)
+
+
+def _tiff_bytes(endian, entries):
+    """Build a minimal TIFF header with one IFD of ASCII entries."""
+    magic = b"II*\x00" if endian == "<" else b"MM\x00*"
+    header = magic + struct.pack(endian + "I", 8)
+    ifd_size = 2 + len(entries) * 12 + 4
+    data_offset = 8 + ifd_size
+
+    ifd = struct.pack(endian + "H", len(entries))
+    data = b""
+    for tag, text in entries:
+        raw = text.encode("ascii") + b"\x00"
+        if len(raw) <= 4:
+            value = raw.ljust(4, b"\x00")
+        else:
+            value = struct.pack(endian + "I", data_offset + len(data))
+            data += raw
+        ifd += struct.pack(endian + "HHI", tag, 2, len(raw)) + value
+    ifd += struct.pack(endian + "I", 0)
+    return header + ifd + data
+
+
+def test_read_exif_from_jpeg_exif_ifd(tmp_path):
+    img_path = tmp_path / "photo.jpg"
+    exif = Image.Exif()
+    exif[TAG_MAKE] = "Nikon"
+    exif[TAG_MODEL] = "D7000"
+    exif.get_ifd(0x8769)[TAG_DATETIME_ORIGINAL] = "2023:01:02 03:04:05"
+    Image.new("RGB", (16, 16)).save(img_path, exif=exif)
+
+    with open(img_path, "rb") as fh:
+        tags = read_exif(fh)
+
+    assert tags[TAG_MAKE] == "Nikon"
+    assert tags[TAG_MODEL] == "D7000"
+    assert tags[TAG_DATETIME_ORIGINAL] == "2023:01:02 03:04:05"
+
+
+def test_read_exif_jpeg_without_exif(tmp_path):
+    img_path = tmp_path / "plain.jpg"
+    Image.new("RGB", (16, 16)).save(img_path)
+
+    with open(img_path, "rb") as fh:
+        assert read_exif(fh) == {}
+
+
+@pytest.mark.parametrize("endian", ["<", ">"])
+def test_read_exif_from_tiff(endian):
+    data = _tiff_bytes(
+        endian, [(TAG_MAKE, "Sony"), (TAG_DATETIME_ORIGINAL, "2022:12:31 23:59:59")]
+    )
+
+    tags = read_exif(io.BytesIO(data))
+
+    assert tags == {TAG_MAKE: "Sony", TAG_DATETIME_ORIGINAL: "2022:12:31 23:59:59"}
+
+
+def test_read_exif_unsupported_format(tmp_path):
+    img_path = tmp_path / "image.png"
+    Image.new("RGB", (16, 16)).save(img_path)
+
+    with open(img_path, "rb") as fh:
+        assert read_exif(fh) is None
+
+
+def test_read_exif_truncated_tiff():
+    data = _tiff_bytes("<", [(TAG_MAKE, "Sony")])[:12]
+
+    with pytest.raises(ExifParseError):
+        read_exif(io.BytesIO(data))
@@ -1,3 +1,4 @@
+import re
 import pytest
 from datetime import datetime
 from pathlib import Path
@@ -190,3 +191,131 @@ def test_no_camera_model_detected():
     assert result is not None
     assert result.date == datetime(2024, 10, 15)
     assert result.camera_model is None
+
+
+def _legacy_device_brand(name):
+    """Reference implementation: one re.search per pattern, in order."""
+    for pattern_name, pattern in FilenameExtractor.DEVICE_PATTERNS.items():
+        if re.search(pattern.lower(), name.lower()):
+            brand = pattern_name.split("_")[0].lower()
+            return FilenameExtractor.BRAND_NAME_MAP.get(brand, brand.capitalize())
+    return None
+
+
+def _legacy_has_brand(folder_name):
+    return any(
+        re.search(r"\b" + re.escape(brand) + r"\b", folder_name.lower())
+        for brand in FilenameExtractor.CAMERA_BRANDS
+    )
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "IMG_20241015_143000.jpg",
+        "DSC_0001.JPG",
+        "SM-G991B",
+        "pxl_20240101_dsc_1234.jpg",  # Sony pattern later in the name wins
+        "GP010203.MP4",
+        "MVI_1234_Canon_5678.MOV",
+        "Canon",
+        "canon_stuff",
+        "my canon",
+        "HTC_1234 iPhone",
+        "Galaxy S21",
+        "Honor_2024",
+        "DJI_0001 samsung_1",
+        "Motorola Edge",
+        "moto g",
+        "LG G8",
+        "lgx",
+        "Xperia pro",
+        "vacation",
+        "",
+    ],
+)
+def test_single_pass_matchers_match_legacy_behavior(name):
+    extractor = FilenameExtractor()
+
+    assert extractor._detect_camera_model_from_name(name) == _legacy_device_brand(name)
+    assert bool(extractor._BRAND_MATCHER.search(name.lower())) == _legacy_has_brand(name)
+
+
+def _legacy_extract_from_folder(folder):
+    """Reference implementation: full scan of every component."""
+    generic = {"photos", "videos", "camera", "pictures", "images", "media", "dcim"}
+    extractor = FilenameExtractor()
+    parts = list(folder.parts)
+    date = None
+    camera_model = None
+
+    for i in range(len(parts) - 2):
+        try:
+            year, month, day = int(parts[i]), int(parts[i + 1]), int(parts[i + 2])
+            if 1900 <= year <= 2100 and 1 <= month <= 12 and 1 <= day <= 31:
+                date = datetime(year, month, day)
+                if i + 3 < len(parts) and parts[i + 3].lower() not in generic:
+                    camera_model = parts[i + 3]
+                break
+        except ValueError:
+            continue
+
+    if not camera_model:
+        for folder_name in reversed(parts):
+            if folder_name.lower() in generic:
+                continue
+            camera_model = _legacy_device_brand(folder_name)
+            if camera_model:
+                break
+            if _legacy_has_brand(folder_name):
+                camera_model = folder_name
+                break
+
+    return date, camera_model
+
+
+@pytest.mark.parametrize(
+    "folder",
+    [
+        "/2024/10/15",
+        "/2024/10/15/Nikon D850",
+        "/2024/10/15/Photos/Canon",
+        "/2024/02/31/2024/03/01/Camera",
+        "/Photos/Nikon/Vacation",
+        "/Pixel 7/Backup/2023/13/01/Sony A7",
+        "/data/1999/12/31/iPhone/DCIM",
+        "/data/DJI_0001/archive",
+        "relative/2020/01/02/cam",
+        "2020/01/02",
+        "/",
+        ".",
+    ],
+)
+def test_folder_scan_matches_legacy_behavior(folder):
+    extractor = FilenameExtractor()
+
+    # Warm the cache with a sibling so ancestors are reused
+    extractor._extract_from_folder(Path(folder) / "sibling")
+    assert extractor._extract_from_folder(Path(folder)) == _legacy_extract_from_folder(
+        Path(folder)
+    )
+
+
+def test_folder_scan_is_cached_per_directory():
+    extractor = FilenameExtractor()
+
+    for i in range(10):
+        extractor.extract(Path(f"/2024/10/15/Nikon/DSC_{i:04d}.jpg"))
+
+    info = extractor.folder_cache_info()
+    assert info.misses == len(Path("/2024/10/15/Nikon").parts)
+    assert info.hits == 9
+
+
+def test_folder_cache_is_bounded():
+    extractor = FilenameExtractor(folder_cache_size=2)
+
+    for i in range(10):
+        extractor.extract(Path(f"/album{i}/photo.jpg"))
+
+    assert extractor.folder_cache_info().currsize == 2
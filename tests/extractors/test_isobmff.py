@@ -0,0 +1,158 @@
+import struct
+import pytest
+from datetime import datetime
+from pathlib import Path
+from photo_organizer.extractors.isobmff import (
+    QUICKTIME_EPOCH_OFFSET,
+    IsoBmffExtractor,
+)
+from photo_organizer.probe import FileProbe
+
+
+def box(box_type, payload=b""):
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def mvhd(created, version=0):
+    if version == 1:
+        payload = bytes([1, 0, 0, 0]) + struct.pack(">QQ", created, created)
+    else:
+        payload = bytes(4) + struct.pack(">II", created, created)
+    return box(b"mvhd", payload + bytes(80))
+
+
+def quicktime_timestamp(date):
+    return int(date.timestamp()) + QUICKTIME_EPOCH_OFFSET
+
+
+def apple_meta(items):
+    """Build a QuickTime moov/meta box with mdta keys."""
+    keys = b"".join(
+        struct.pack(">I4s", 8 + len(key), b"mdta") + key.encode() for key, _ in items
+    )
+    ilst = b"".join(
+        box(
+            struct.pack(">I", i),
+            box(b"data", struct.pack(">II", 1, 0) + value.encode()),
+        )
+        for i, (_, value) in enumerate(items, 1)
+    )
+    hdlr = box(b"hdlr", bytes(8) + b"mdta" + bytes(12))
+    return box(
+        b"meta",
+        hdlr + box(b"keys", bytes(4) + struct.pack(">I", len(items)) + keys) + box(b"ilst", ilst),
+    )
+
+
+def udta_text(box_type, text):
+    raw = text.encode()
+    return box(box_type, struct.pack(">HH", len(raw), 0) + raw)
+
+
+def write_video(path, moov_children, mdat_size=1024, moov_first=False):
+    ftyp = box(b"ftyp", b"qt  " + bytes(4) + b"qt  ")
+    moov = box(b"moov", b"".join(moov_children))
+    mdat = box(b"mdat", bytes(mdat_size))
+    path.write_bytes(ftyp + moov + mdat if moov_first else ftyp + mdat + moov)
+    return path
+
+
+def test_isobmff_extractor_name():
+    assert IsoBmffExtractor().name == "ISO-BMFF"
+
+
+def test_extract_mvhd_creation_time(tmp_path):
+    date = datetime(2024, 10, 15, 14, 30, 0)
+    video = write_video(tmp_path / "clip.mp4", [mvhd(quicktime_timestamp(date))])
+
+    result = IsoBmffExtractor().extract(video)
+
+    assert result is not None
+    assert result.date == date
+    assert result.camera_model is None
+
+
+def test_extract_mvhd_version_1(tmp_path):
+    date = datetime(2023, 1, 2, 3, 4, 5)
+    video = write_video(
+        tmp_path / "clip.mov", [mvhd(quicktime_timestamp(date), version=1)]
+    )
+
+    result = IsoBmffExtractor().extract(video)
+
+    assert result.date == date
+
+
+def test_extract_apple_mdta_keys(tmp_path):
+    video = write_video(
+        tmp_path / "IMG_0001.MOV",
+        [
+            mvhd(quicktime_timestamp(datetime(2024, 1, 1))),
+            apple_meta(
+                [
+                    ("com.apple.quicktime.make", "Apple"),
+                    ("com.apple.quicktime.model", "iPhone 14 Pro"),
+                    ("com.apple.quicktime.creationdate", "2024-10-15T14:30:00+0200"),
+                ]
+            ),
+        ],
+        moov_first=True,
+    )
+
+    result = IsoBmffExtractor().extract(video)
+
+    assert result.date == datetime(2024, 10, 15, 14, 30, 0)
+    assert result.camera_model == "Apple iPhone 14 Pro"
+
+
+def test_extract_udta_text_items(tmp_path):
+    video = write_video(
+        tmp_path / "clip.mp4",
+        [
+            mvhd(0),
+            box(
+                b"udta",
+                udta_text(b"\xa9day", "2022-06-01T08:00:00+01:00")
+                + udta_text(b"\xa9mod", "HERO10 Black"),
+            ),
+        ],
+    )
+
+    result = IsoBmffExtractor().extract(video)
+
+    assert result.date == datetime(2022, 6, 1, 8, 0, 0)
+    assert result.camera_model == "HERO10 Black"
+
+
+def test_extract_skips_mdat_without_reading(tmp_path, monkeypatch):
+    date = datetime(2024, 10, 15, 14, 30, 0)
+    video = write_video(
+        tmp_path / "big.mp4", [mvhd(quicktime_timestamp(date))], mdat_size=4 * 1024 * 1024
+    )
+
+    reads = []
+    real_read_at = FileProbe.read_at
+
+    def tracking_read_at(self, offset, size):
+        data = real_read_at(self, offset, size)
+        reads.append(len(data))
+        return data
+
+    monkeypatch.setattr(FileProbe, "read_at", tracking_read_at)
+    result = IsoBmffExtractor().extract(video)
+
+    assert result.date == date
+    assert sum(reads) < 4096
+
+
+def test_extract_no_date(tmp_path):
+    video = write_video(tmp_path / "clip.mp4", [mvhd(0)])
+
+    assert IsoBmffExtractor().extract(video) is None
+
+
+def test_extract_non_video(tmp_path):
+    jpeg = tmp_path / "photo.jpg"
+    jpeg.write_bytes(b"\xff\xd8\xff\xe0" + bytes(100))
+
+    assert IsoBmffExtractor().extract(jpeg) is None
@@ -0,0 +1,62 @@
+import pytest
+from benchmarks.corpus import MANIFEST_NAME, CorpusError, ensure_corpus
+from benchmarks.harness import Harness
+
+
+def _snapshot(root):
+    """Relative path -> (bytes, mtime) of every generated file."""
+    return {
+        path.relative_to(root): (path.read_bytes(), path.stat().st_mtime)
+        for path in root.rglob("*")
+        if path.is_file() and path.name != MANIFEST_NAME
+    }
+
+
+@pytest.mark.parametrize("shape", ["wide", "deep"])
+def test_corpus_is_deterministic(tmp_path, shape):
+    """Test that the same parameters give the same names, bytes and mtimes."""
+    first = ensure_corpus(tmp_path / "a", 60, shape, seed=3)
+    ensure_corpus(tmp_path / "b", 60, shape, seed=3)
+
+    files = _snapshot(tmp_path / "a")
+    assert len(files) == 60
+    assert files == _snapshot(tmp_path / "b")
+    assert sum(first["kinds"].values()) == 60
+    # Every file is unique
+    assert len({data for data, _ in files.values()}) == 60
+
+
+def test_ensure_corpus_reuses_and_replaces_own_corpus(tmp_path):
+    """Test that a matching corpus is reused and a different one replaced."""
+    root = tmp_path / "corpus"
+    manifest = ensure_corpus(root, 20)
+    assert ensure_corpus(root, 20) == manifest
+
+    ensure_corpus(root, 30)
+    assert len(_snapshot(root)) == 30
+
+
+def test_ensure_corpus_refuses_foreign_directory(tmp_path):
+    """Test that a directory not written by the generator is never deleted."""
+    pictures = tmp_path / "Pictures"
+    pictures.mkdir()
+    (pictures / "holiday.jpg").write_bytes(b"precious")
+    (pictures / MANIFEST_NAME).write_text('{"parameters": {}}')
+
+    with pytest.raises(CorpusError):
+        ensure_corpus(pictures, 20)
+    assert (pictures / "holiday.jpg").read_bytes() == b"precious"
+
+
+def test_harness_stages(tmp_path):
+    """Test that each stage handles every file of a small corpus."""
+    source = tmp_path / "source"
+    ensure_corpus(source, 40, "deep")
+    harness = Harness(source, tmp_path)
+
+    assert harness.scan() == 40
+    assert harness.extract() == 40
+    assert all(metadata is not None for metadata in harness.metadata)
+    assert harness.plan() == 40
+    assert harness.transfer() == 40
+    assert len(list((tmp_path / "transfer").rglob("*.*"))) == 40
@@ -0,0 +1,89 @@
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+from photo_organizer.catalog import CATALOG_FILENAME, Catalog
+from photo_organizer.extractors.base import ExtractionResult
+
+
+def _result(day, camera="iPhone 14 Pro"):
+    return ExtractionResult(datetime(2024, 6, day, 12, 0), camera, "exif")
+
+
+def test_catalog_records_and_queries(tmp_path):
+    output = tmp_path / "output"
+    with Catalog(output) as catalog:
+        assert catalog.created
+        catalog.record(output / "2024/06/01/iPhone/a.jpg", 10, _result(1))
+        catalog.record(output / "2024/06/20/Canon/b.jpg", 20, _result(20, "Canon EOS R5"))
+        catalog.record(output / "undated/c.png", 30)
+
+    with Catalog(output) as catalog:
+        assert not catalog.created
+        assert len(catalog) == 3
+        assert [e.path.name for e in catalog.query()] == ["c.png", "a.jpg", "b.jpg"]
+        assert [e.path.name for e in catalog.query(camera="iphone")] == ["a.jpg"]
+        assert [e.path.name for e in catalog.query("2024-06-02")] == ["b.jpg"]
+        assert [e.path.name for e in catalog.query(end="2024-06-01")] == ["a.jpg"]
+        assert [e.path.name for e in catalog.query("2024", "2024-06")] == ["a.jpg", "b.jpg"]
+
+        entry = catalog.query(end="2024-06-01")[0]
+        assert entry.path == output / "2024/06/01/iPhone/a.jpg"
+        assert entry.size == 10
+        assert entry.date == datetime(2024, 6, 1, 12, 0)
+        assert entry.extractor == "exif"
+
+
+def test_catalog_query_matches_camera_literally(tmp_path):
+    output = tmp_path / "output"
+    with Catalog(output) as catalog:
+        catalog.record(output / "a.jpg", 10, _result(1, "Cam_100%"))
+        catalog.record(output / "b.jpg", 10, _result(2, "CamX100 Pro"))
+        catalog.record(output / "c.jpg", 10, _result(3, "Cam\\100"))
+
+        assert [e.path.name for e in catalog.query(camera="cam_")] == ["a.jpg"]
+        assert [e.path.name for e in catalog.query(camera="100%")] == ["a.jpg"]
+        assert [e.path.name for e in catalog.query(camera="m\\1")] == ["c.jpg"]
+        assert len(catalog.query(camera="cam")) == 3
+
+
+def test_catalog_replaces_and_lists_names(tmp_path):
+    output = tmp_path / "output"
+    with Catalog(output) as catalog:
+        day = output / "2024" / "06" / "01"
+        catalog.record(day / "a.jpg", 10)
+        catalog.record(day / "a.jpg", 11)
+        catalog.record(day / "b.jpg", 12)
+        catalog.record(tmp_path / "elsewhere.jpg", 13)
+
+        assert len(catalog) == 2
+        assert catalog.names_in(day) == {"a.jpg", "b.jpg"}
+        assert catalog.names_in(output / "2023") == set()
+        assert catalog.names_in(tmp_path) is None
+
+
+def test_catalog_set_digest(tmp_path):
+    output = tmp_path / "output"
+    with Catalog(output) as catalog:
+        catalog.record(output / "a.jpg", 10)
+        catalog.set_digest(output / "a.jpg", "abcd")
+
+        assert [entry.digest for entry in catalog.entries()] == ["abcd"]
+
+
+def test_catalog_rebuild(tmp_path):
+    output = tmp_path / "output"
+    (output / "2024").mkdir(parents=True)
+    (output / "2024" / "a.jpg").write_bytes(b"12345")
+    (output / "notes.txt").write_text("not media")
+    resolver = Mock()
+    resolver.resolve.return_value = _result(3)
+
+    with Catalog(output) as catalog:
+        catalog.record(output / "gone.jpg", 1)
+        assert catalog.rebuild(resolver) == 1
+
+        (entry,) = catalog.entries()
+        assert entry.path == output / "2024" / "a.jpg"
+        assert entry.size == 5
+        assert entry.camera == "iPhone 14 Pro"
+    assert (output / CATALOG_FILENAME).exists()
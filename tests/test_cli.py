@@ -1,6 +1,9 @@
 import pytest
+from datetime import datetime
 from pathlib import Path
-from photo_organizer.cli import parse_args
+from PIL import Image
+from photo_organizer import cli
+from photo_organizer.cli import build_resolver, parse_args
 
 
 def test_parse_args_required():
@@ -15,9 +18,11 @@ def test_parse_args_defaults():
     assert args.on_duplicate == "rename"
     assert args.log_level == "INFO"
     assert args.mode == "copy"
+    assert args.incremental is False
+    assert args.link_fallback == "copy"
 
 
-@pytest.mark.parametrize("mode", ["copy", "move"])
+@pytest.mark.parametrize("mode", ["copy", "move", "link", "symlink", "reflink"])
 def test_parse_args_mode(mode):
     args = parse_args(["--source", "/input", "--output", "/output", "--mode", mode])
     assert args.mode == mode
@@ -33,3 +38,54 @@ def test_parse_args_duplicate_strategy():
         ["--source", "/input", "--output", "/output", "--on-duplicate", "skip"]
     )
     assert args.on_duplicate == "skip"
+
+
+def test_parse_args_incremental():
+    args = parse_args(["--source", "/input", "--output", "/output", "--incremental"])
+    assert args.incremental is True
+    assert args.index is None
+
+
+@pytest.mark.parametrize("strategy", ["keep", "skip", "link"])
+def test_parse_args_content_duplicate(strategy):
+    args = parse_args(
+        ["--source", "/input", "--output", "/output", "--on-content-duplicate", strategy]
+    )
+    assert args.on_content_duplicate == strategy
+
+
+def test_parse_args_jobs():
+    args = parse_args(
+        ["--source", "/input", "--output", "/output", "--jobs", "16", "--io-jobs", "8"]
+    )
+    assert args.jobs == 16
+    assert args.io_jobs == 8
+
+
+def test_build_resolver_reads_exif_from_png(tmp_path):
+    """Test that the PNG route tries EXIF before the filename and mtime."""
+    img_path = tmp_path / "image.png"
+    exif = Image.Exif()
+    exif[0x9003] = "2015:03:04 10:20:30"
+    exif[0x010F] = "Canon"
+    exif[0x0110] = "Canon EOS 5D"
+    Image.new("RGB", (16, 16), color="red").save(img_path, exif=exif)
+
+    result = build_resolver().resolve(img_path)
+
+    assert result.date == datetime(2015, 3, 4, 10, 20, 30)
+    assert result.camera_model == "Canon EOS 5D"
+    assert result.extractor == "EXIF"
+
+
+@pytest.mark.parametrize("registered", [False, True])
+def test_build_resolver_heif_route(monkeypatch, registered):
+    """Test that HEIF only tries EXIF when Pillow has a HEIF opener."""
+    monkeypatch.setattr(cli, "_heif_opener_registered", lambda: registered)
+
+    route, chain = build_resolver().route_for(Path("IMG_0001.heic"))
+
+    assert route == "heif"
+    names = [type(extractor).__name__ for extractor in chain]
+    assert ("ExifExtractor" in names) == registered
+    assert names[-2:] == ["FilenameExtractor", "FallbackExtractor"]
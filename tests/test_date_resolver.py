@@ -3,7 +3,9 @@ from datetime import datetime
 from pathlib import Path
 from unittest.mock import Mock
 from photo_organizer.date_resolver import DateResolver
+from photo_organizer.metadata_cache import MetadataCache
 from photo_organizer.extractors.base import ExtractionResult
+from photo_organizer.filetypes import FileType
 
 
 def test_resolver_priority_chain():
@@ -70,3 +72,138 @@ def test_resolver_all_fail():
     result = resolver.resolve(Path("/test.jpg"))
 
     assert result is None
+
+
+def test_resolver_routes_by_file_type(tmp_path):
+    """Test that files only visit the chain routed for their type."""
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"\x00\x00\x00\x10ftypisom\x00\x00\x00\x00")
+
+    photo_extractor = Mock()
+    photo_extractor.name = "Photo"
+    video_extractor = Mock()
+    video_extractor.name = "Video"
+    video_extractor.extract.return_value = ExtractionResult(date=datetime(2024, 1, 1))
+
+    resolver = DateResolver(
+        [photo_extractor, video_extractor],
+        routes={FileType.ISOBMFF: [video_extractor]},
+    )
+    result = resolver.resolve(video)
+
+    assert result.date == datetime(2024, 1, 1)
+    photo_extractor.extract.assert_not_called()
+    assert resolver.stats["isobmff"].resolved == 1
+    assert resolver.stats["isobmff"].extractor_hits["Video"] == 1
+
+
+def test_resolver_unrouted_type_uses_default_chain(tmp_path):
+    unknown = tmp_path / "notes.jpg"
+    unknown.write_text("not really a jpeg")  # sniffed as unknown, routed by extension
+
+    default_extractor = Mock()
+    default_extractor.name = "Default"
+    default_extractor.extract.return_value = None
+
+    resolver = DateResolver(
+        [default_extractor], routes={FileType.ISOBMFF: [Mock()]}
+    )
+    result = resolver.resolve(unknown)
+
+    assert result is None
+    default_extractor.extract.assert_called_once()
+    assert resolver.stats["default"].unresolved == 1
+    assert resolver.stats["default"].extractor_misses["Default"] == 1
+
+
+def test_resolver_reuses_cached_results(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_text("content")
+
+    extractor = Mock()
+    extractor.name = "EXIF"
+    extractor.version = 1
+    extractor.extract.return_value = ExtractionResult(date=datetime(2024, 1, 1))
+
+    with MetadataCache(tmp_path / "cache.sqlite3") as cache:
+        resolver = DateResolver([extractor], cache=cache)
+        first = resolver.resolve(photo)
+        second = resolver.resolve(photo)
+
+    assert first.extractor == "EXIF"
+    assert second == first
+    extractor.extract.assert_called_once()
+    assert cache.hits == 1
+
+
+def test_chain_signature_tracks_extractor_versions():
+    extractor = Mock()
+    extractor.name = "EXIF"
+    extractor.version = 1
+    before = DateResolver([extractor]).chain_signature()
+
+    extractor.version = 2
+    assert DateResolver([extractor]).chain_signature() != before
+
+
+def test_resolver_opens_each_file_once(tmp_path, monkeypatch):
+    from PIL import Image
+    from photo_organizer.extractors.exif import ExifExtractor
+    from photo_organizer.extractors.fallback import FallbackExtractor
+    from photo_organizer.extractors.isobmff import IsoBmffExtractor
+
+    photo = tmp_path / "photo.jpg"
+    Image.new("RGB", (10, 10)).save(photo)  # no EXIF: falls through the chain
+
+    opened = []
+    real_open = open
+
+    def tracking_open(file, *args, **kwargs):
+        opened.append(file)
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    extractors = [ExifExtractor(), IsoBmffExtractor(), FallbackExtractor()]
+    resolver = DateResolver(extractors, routes={FileType.JPEG: extractors})
+    result = resolver.resolve(photo)
+
+    assert result.extractor == "FileSystem"
+    assert opened == [photo]
+
+
+def test_resolver_does_not_reuse_path_results_after_rename(tmp_path):
+    from photo_organizer.extractors.exif import ExifExtractor
+    from photo_organizer.extractors.filename import FilenameExtractor
+
+    photo = tmp_path / "IMG_20240101_120000.jpg"
+    photo.write_bytes(b"not really a jpeg")
+    db = tmp_path / "cache.sqlite3"
+
+    with MetadataCache(db) as cache:
+        resolver = DateResolver([ExifExtractor(), FilenameExtractor()], cache=cache)
+        assert resolver.resolve(photo).date == datetime(2024, 1, 1, 12, 0)
+        assert resolver.resolve(photo).date == datetime(2024, 1, 1, 12, 0)
+        assert cache.hits == 1
+
+    renamed = photo.rename(tmp_path / "IMG_20230505_080000.jpg")
+    with MetadataCache(db) as cache:
+        resolver = DateResolver([ExifExtractor(), FilenameExtractor()], cache=cache)
+        assert resolver.resolve(renamed).date == datetime(2023, 5, 5, 8, 0)
+        assert cache.hits == 0
+
+
+def test_resolver_reuses_content_results_after_rename(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_text("content")
+    extractor = Mock()
+    extractor.name = "EXIF"
+    extractor.version = 1
+    extractor.extract.return_value = ExtractionResult(date=datetime(2024, 1, 1))
+
+    with MetadataCache(tmp_path / "cache.sqlite3") as cache:
+        resolver = DateResolver([extractor], cache=cache)
+        resolver.resolve(photo)
+        renamed = photo.rename(tmp_path / "renamed.jpg")
+        assert resolver.resolve(renamed).date == datetime(2024, 1, 1)
+
+    extractor.extract.assert_called_once()
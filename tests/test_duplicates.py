@@ -1,6 +1,10 @@
+import os
 import pytest
 from pathlib import Path
-from photo_organizer.duplicates import DuplicateHandler, DuplicateStrategy
+from unittest.mock import Mock
+from photo_organizer import syscalls
+from photo_organizer.catalog import Catalog
+from photo_organizer.duplicates import ContentIndex, DuplicateHandler, DuplicateStrategy
 
 
 def test_duplicate_strategy_enum():
@@ -59,3 +63,187 @@ def test_handle_multiple_renames(tmp_path):
     result = handler.resolve(existing)
 
     assert result.name == "test_2.jpg"
+
+
+def test_content_index_finds_identical_file(tmp_path):
+    original = tmp_path / "original.jpg"
+    original.write_bytes(b"x" * 200_000)
+    copy = tmp_path / "copy.jpg"
+    copy.write_bytes(b"x" * 200_000)
+
+    index = ContentIndex()
+    index.add(original)
+
+    assert index.find(copy) == original
+
+
+def test_content_index_same_size_different_content(tmp_path):
+    original = tmp_path / "original.jpg"
+    original.write_bytes(b"a" * 1000)
+    other = tmp_path / "other.jpg"
+    other.write_bytes(b"b" * 1000)
+
+    index = ContentIndex()
+    index.add(original)
+
+    assert index.find(other) is None
+
+
+def test_content_index_differs_only_in_middle(tmp_path):
+    data = bytearray(b"x" * 300_000)
+    original = tmp_path / "original.jpg"
+    original.write_bytes(bytes(data))
+    data[150_000] = ord("y")
+    other = tmp_path / "other.jpg"
+    other.write_bytes(bytes(data))
+
+    index = ContentIndex(block_size=1024)
+    index.add(original)
+
+    assert index.find(other) is None
+
+
+def test_content_index_only_hashes_size_collisions(tmp_path, monkeypatch):
+    original = tmp_path / "original.jpg"
+    original.write_bytes(b"a" * 100)
+    other = tmp_path / "other.jpg"
+    other.write_bytes(b"a" * 101)
+
+    index = ContentIndex()
+    index.add(original)
+    monkeypatch.setattr(index, "_hash_file", Mock(side_effect=AssertionError))
+
+    assert index.find(other) is None
+
+
+def test_content_index_reads_target_after_move(tmp_path):
+    source = tmp_path / "source.jpg"
+    source.write_bytes(b"content")
+    target = tmp_path / "target.jpg"
+
+    index = ContentIndex()
+    index.add(source, target=target)
+    source.rename(target)
+
+    duplicate = tmp_path / "duplicate.jpg"
+    duplicate.write_bytes(b"content")
+
+    assert index.find(duplicate) == target
+
+
+def test_content_index_add_directory(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "one.jpg").write_bytes(b"1")
+    (tmp_path / "two.mp4").write_bytes(b"22")
+    (tmp_path / "notes.txt").write_bytes(b"3")
+
+    index = ContentIndex()
+
+    assert index.add_directory(tmp_path) == 2
+
+
+def test_resolve_claims_names_within_run(tmp_path):
+    handler = DuplicateHandler(DuplicateStrategy.RENAME)
+    target = tmp_path / "IMG_0001.JPG"
+
+    results = [handler.resolve(target).name for _ in range(4)]
+
+    assert results == ["IMG_0001.JPG", "IMG_0001_1.JPG", "IMG_0001_2.JPG", "IMG_0001_3.JPG"]
+
+
+def test_resolve_skips_existing_counters(tmp_path):
+    for name in ["test.jpg", "test_1.jpg", "test_3.jpg"]:
+        (tmp_path / name).touch()
+
+    handler = DuplicateHandler(DuplicateStrategy.RENAME)
+    results = [handler.resolve(tmp_path / "test.jpg").name for _ in range(3)]
+
+    assert results == ["test_2.jpg", "test_4.jpg", "test_5.jpg"]
+
+
+def test_resolve_lists_each_directory_once(tmp_path, monkeypatch):
+    (tmp_path / "IMG_0001.JPG").touch()
+    handler = DuplicateHandler(DuplicateStrategy.RENAME)
+
+    calls = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(
+        os, "scandir", lambda path: calls.append(path) or real_scandir(path)
+    )
+    monkeypatch.setattr(
+        Path, "exists", Mock(side_effect=AssertionError("exists() should not be called"))
+    )
+
+    for _ in range(50):
+        handler.resolve(tmp_path / "IMG_0001.JPG")
+
+    assert len(calls) == 1
+
+
+def test_release_frees_name(tmp_path):
+    handler = DuplicateHandler(DuplicateStrategy.SKIP)
+    target = tmp_path / "test.jpg"
+
+    assert handler.resolve(target) == target
+    handler.release(target)
+
+    assert handler.resolve(target) == target
+
+
+def test_resolve_uses_catalog_names(tmp_path):
+    output = tmp_path / "output"
+    day = output / "2024" / "06" / "01"
+    with Catalog(output) as catalog:
+        catalog.record(day / "photo.jpg", 10)
+        handler = DuplicateHandler(DuplicateStrategy.RENAME, catalog=catalog)
+
+        syscalls.reset()
+        result = handler.resolve(day / "photo.jpg")
+
+    assert result == day / "photo_1.jpg"
+    assert syscalls.snapshot()[syscalls.SCANDIR] == 0
+
+
+def test_resolve_with_stale_catalog_never_overwrites(tmp_path):
+    """Test that files missing from the catalog are still treated as taken."""
+    output = tmp_path / "output"
+    day = output / "2024" / "06" / "01"
+    day.mkdir(parents=True)
+    # Written by hand (or by a run without --catalog)
+    (day / "photo.jpg").write_bytes(b"AAAA")
+    (day / "photo_1.jpg").write_bytes(b"BBBBBB")
+    with Catalog(output) as catalog:
+        catalog.record(day / "other.jpg", 10)
+        handler = DuplicateHandler(DuplicateStrategy.RENAME, catalog=catalog)
+
+        assert handler.resolve(day / "photo.jpg") == day / "photo_2.jpg"
+        assert handler.resolve(day / "new.jpg") == day / "new.jpg"
+
+
+def test_content_index_add_catalog(tmp_path):
+    output = tmp_path / "output"
+    output.mkdir()
+    existing = output / "a.jpg"
+    existing.write_bytes(b"same bytes")
+    other = output / "b.jpg"
+    other.write_bytes(b"diff bytes")
+    new = tmp_path / "new.jpg"
+    new.write_bytes(b"same bytes")
+
+    with Catalog(output) as catalog:
+        catalog.record(existing, 10)
+        catalog.record(other, 10)
+        index = ContentIndex()
+        assert index.add_catalog(catalog) == 2
+
+        assert index.find(new) == existing
+        # Full digests computed for the comparison are saved to the catalog
+        digests = {entry.path: entry.digest for entry in catalog.entries()}
+        assert digests[existing] is not None
+        assert digests[other] is None
+
+        # ...and reused by the next run without reading the file again
+        index = ContentIndex()
+        index.add_catalog(catalog)
+        assert index._full[existing] == bytes.fromhex(digests[existing])
+
@@ -0,0 +1,239 @@
+import errno
+import os
+import pytest
+from photo_organizer import durability
+from photo_organizer.durability import Durability, DurabilityManager
+
+
+def _transfer(tmp_path, name, data=b"data"):
+    source = tmp_path / "source" / name
+    target = tmp_path / "output" / name
+    for path in (source, target):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    return source, target
+
+
+def _record_calls(monkeypatch):
+    """Log fsync'ed paths and unlinks, in order."""
+    calls = []
+    real_open, real_fsync, real_unlink = os.open, os.fsync, os.unlink
+    names = {}
+
+    def fake_open(path, *args, **kwargs):
+        fd = real_open(path, *args, **kwargs)
+        names[fd] = str(path)
+        return fd
+
+    def fake_fsync(fd):
+        calls.append(("fsync", names[fd]))
+        real_fsync(fd)
+
+    def fake_unlink(path, *args, **kwargs):
+        calls.append(("unlink", str(path)))
+        real_unlink(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "open", fake_open)
+    monkeypatch.setattr(os, "fsync", fake_fsync)
+    monkeypatch.setattr(os, "unlink", fake_unlink)
+    return calls
+
+
+def test_none_unlinks_immediately_without_syncing(tmp_path, monkeypatch):
+    calls = _record_calls(monkeypatch)
+    source, target = _transfer(tmp_path, "a.jpg")
+
+    manager = DurabilityManager(Durability.NONE)
+    manager.commit(target, 4, source=source, unlink_source=True)
+
+    assert not source.exists()
+    assert calls == [("unlink", str(source))]
+    assert manager.files_synced == 0
+
+
+def test_batch_defers_unlink_until_file_threshold(tmp_path, monkeypatch):
+    calls = _record_calls(monkeypatch)
+    manager = DurabilityManager(Durability.BATCH, batch_files=3)
+    moves = [_transfer(tmp_path, f"{i}.jpg") for i in range(3)]
+
+    for source, target in moves[:2]:
+        manager.commit(target, 4, source=source, unlink_source=True)
+    assert calls == []
+    assert all(source.exists() for source, _ in moves)
+
+    source, target = moves[2]
+    manager.commit(target, 4, source=source, unlink_source=True)
+
+    assert not any(source.exists() for source, _ in moves)
+    assert manager.batches == 1
+    assert manager.files_synced == 3
+    # Every target and its directory is durable before any source goes
+    first_unlink = calls.index(("unlink", str(moves[0][0])))
+    synced = {path for op, path in calls[:first_unlink] if op == "fsync"}
+    assert {str(target) for _, target in moves} <= synced
+    assert str(tmp_path / "output") in synced
+
+
+def test_batch_flushes_on_byte_threshold(tmp_path):
+    manager = DurabilityManager(Durability.BATCH, batch_files=100, batch_bytes=10)
+    source, target = _transfer(tmp_path, "big.jpg", b"x" * 16)
+
+    manager.commit(target, source=source, unlink_source=True)
+
+    assert not source.exists()
+    assert manager.batches == 1
+
+
+def test_strict_syncs_every_commit(tmp_path):
+    manager = DurabilityManager(Durability.STRICT)
+
+    for i in range(3):
+        _, target = _transfer(tmp_path, f"{i}.jpg")
+        manager.commit(target, 4)
+
+    assert manager.files_synced == 3
+    assert manager.batches == 3
+
+
+def test_rename_syncs_both_directories(tmp_path, monkeypatch):
+    calls = _record_calls(monkeypatch)
+    source, target = _transfer(tmp_path, "a.jpg")
+    source.unlink()
+
+    manager = DurabilityManager(Durability.STRICT)
+    manager.commit(target, 0, source=source)
+
+    synced = {path for op, path in calls if op == "fsync"}
+    assert str(tmp_path / "source") in synced
+    assert str(tmp_path / "output") in synced
+
+
+def test_close_flushes_pending(tmp_path):
+    manager = DurabilityManager(Durability.BATCH)
+    source, target = _transfer(tmp_path, "a.jpg")
+
+    manager.commit(target, 4, source=source, unlink_source=True)
+    assert source.exists()
+    manager.close()
+
+    assert not source.exists()
+    assert "batch: 1 file and 2 directory fsyncs in 1 batches" in manager.summary(1.0)
+
+
+def test_none_reports_durable_after_unlink(tmp_path):
+    source, target = _transfer(tmp_path, "a.jpg")
+    seen = []
+
+    manager = DurabilityManager(Durability.NONE)
+    manager.commit(
+        target, 4, source=source, unlink_source=True,
+        on_durable=lambda: seen.append(source.exists()),
+    )  # fmt: skip
+
+    assert seen == [False]
+
+
+def test_batch_reports_durable_only_after_flush(tmp_path):
+    source, target = _transfer(tmp_path, "a.jpg")
+    seen = []
+
+    manager = DurabilityManager(Durability.BATCH, batch_files=100)
+    manager.commit(
+        target, 4, source=source, unlink_source=True,
+        on_durable=lambda: seen.append(source.exists()),
+    )  # fmt: skip
+    assert seen == []
+
+    manager.flush()
+
+    # The source of the move is gone by the time it is reported
+    assert seen == [False]
+
+
+def test_sync_does_not_follow_symlinks(tmp_path, monkeypatch):
+    calls = _record_calls(monkeypatch)
+    output = tmp_path / "output"
+    output.mkdir()
+    link = output / "a.jpg"
+    link.symlink_to(tmp_path / "missing.jpg")
+
+    manager = DurabilityManager(Durability.STRICT)
+    manager.commit(link, 0)
+
+    synced = {path for op, path in calls if op == "fsync"}
+    assert synced == {str(output)}
+    assert manager.files_synced == 1
+
+
+def _fail_fsync_of(monkeypatch, failing):
+    real_fsync_file = durability._fsync_file
+
+    def fsync_file(path):
+        if path == failing:
+            raise OSError(errno.EIO, "Input/output error")
+        real_fsync_file(path)
+
+    monkeypatch.setattr(durability, "_fsync_file", fsync_file)
+
+
+def test_batch_member_failing_to_sync_spares_the_rest(tmp_path, monkeypatch):
+    moves = [_transfer(tmp_path, f"{i}.jpg") for i in range(3)]
+    _fail_fsync_of(monkeypatch, moves[1][1])
+    done = []
+
+    manager = DurabilityManager(Durability.BATCH, batch_files=3)
+    for i, (source, target) in enumerate(moves):
+        manager.commit(
+            target, 4, source=source, unlink_source=True,
+            on_durable=lambda i=i: done.append(i),
+        )  # fmt: skip
+
+    assert done == [0, 2]
+    assert [source.exists() for source, _ in moves] == [False, True, False]
+    assert manager.errors == 1
+    assert "1 files failed to sync" in manager.summary(1.0)
+
+
+def test_strict_raises_for_its_own_file(tmp_path, monkeypatch):
+    source, target = _transfer(tmp_path, "a.jpg")
+    _fail_fsync_of(monkeypatch, target)
+    done = []
+
+    manager = DurabilityManager(Durability.STRICT)
+    with pytest.raises(OSError):
+        manager.commit(
+            target, 4, source=source, unlink_source=True,
+            on_durable=lambda: done.append(target),
+        )  # fmt: skip
+
+    assert source.exists()
+    assert done == []
+
+
+def test_close_logs_instead_of_raising(tmp_path, monkeypatch, caplog):
+    manager = DurabilityManager(Durability.BATCH)
+    _, target = _transfer(tmp_path, "a.jpg")
+    manager.commit(target, 4)
+
+    def broken(batch):
+        raise RuntimeError("disk gone")
+
+    monkeypatch.setattr(manager, "_sync", broken)
+    manager.close()
+
+    assert "disk gone" in caplog.text
+
+
+def test_failing_before_durable_reports_nothing_durable(tmp_path):
+    source, target = _transfer(tmp_path, "a.jpg")
+    done = []
+
+    def broken():
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    manager = DurabilityManager(Durability.BATCH, before_durable=broken)
+    manager.commit(target, 4, on_durable=lambda: done.append(target))
+    manager.flush()
+
+    assert done == []
+    assert manager.errors == 1
@@ -0,0 +1,40 @@
+import pytest
+from pathlib import Path
+from photo_organizer.filetypes import FileType, detect_file_type, sniff_file_type
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (b"\xff\xd8\xff\xe1\x00\x10Exif", FileType.JPEG),
+        (b"II*\x00\x08\x00\x00\x00", FileType.TIFF),
+        (b"MM\x00*\x00\x00\x00\x08", FileType.TIFF),
+        (b"\x89PNG\r\n\x1a\n\x00\x00", FileType.PNG),
+        (b"\x00\x00\x00\x18ftypheic\x00\x00", FileType.HEIF),
+        (b"\x00\x00\x00\x18ftypisom\x00\x00", FileType.ISOBMFF),
+        (b"\x00\x00\x00\x08wide\x00\x00", FileType.ISOBMFF),
+        (b"RIFF\x00\x00\x00\x00AVI LIST", FileType.RIFF),
+        (b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81", FileType.MATROSKA),
+        (b"plain text", FileType.UNKNOWN),
+    ],
+)
+def test_sniff_file_type(header, expected):
+    assert sniff_file_type(header) == expected
+
+
+def test_detect_prefers_magic_over_extension(tmp_path):
+    mislabeled = tmp_path / "photo.jpg"
+    mislabeled.write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(8))
+
+    assert detect_file_type(mislabeled) == FileType.PNG
+
+
+def test_detect_falls_back_to_extension(tmp_path):
+    video = tmp_path / "clip.MKV"
+    video.write_text("fake video")
+
+    assert detect_file_type(video) == FileType.MATROSKA
+
+
+def test_detect_missing_file_uses_extension():
+    assert detect_file_type(Path("/nonexistent/clip.mov")) == FileType.ISOBMFF
@@ -0,0 +1,50 @@
+import os
+import pytest
+from pathlib import Path
+from photo_organizer.index import ScanIndex
+
+
+def test_record_and_lookup(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_text("content")
+    target = tmp_path / "out" / "photo.jpg"
+
+    with ScanIndex(tmp_path / "index.sqlite3") as index:
+        assert not index.is_unchanged(photo.stat())
+        index.record(photo, photo.stat(), target)
+        assert index.lookup(photo.stat()) == target
+
+
+def test_index_persists_across_instances(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_text("content")
+    db = tmp_path / "nested" / "index.sqlite3"
+
+    with ScanIndex(db) as index:
+        index.record(photo, photo.stat(), tmp_path / "target.jpg")
+
+    with ScanIndex(db) as index:
+        assert index.is_unchanged(photo.stat())
+
+
+def test_modified_file_is_changed(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_text("content")
+
+    with ScanIndex(tmp_path / "index.sqlite3") as index:
+        index.record(photo, photo.stat(), tmp_path / "target.jpg")
+
+        photo.write_text("new and longer content")
+        assert not index.is_unchanged(photo.stat())
+
+
+def test_touched_file_is_changed(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_text("content")
+
+    with ScanIndex(tmp_path / "index.sqlite3") as index:
+        index.record(photo, photo.stat(), tmp_path / "target.jpg")
+
+        st = photo.stat()
+        os.utime(photo, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert not index.is_unchanged(photo.stat())
@@ -1,10 +1,14 @@
 """Integration test for photo organizer."""
 
+import hashlib
+import json
+import pstats
 import pytest
 from datetime import datetime
 from pathlib import Path
 from PIL import Image
 from photo_organizer.cli import main
+from photo_organizer.journal import JOURNAL_FILENAME, Journal
 
 
 def test_integration_full_workflow(tmp_path, caplog):
@@ -78,3 +82,232 @@ def test_integration_dry_run(tmp_path, caplog):
     # Verify no files were copied
     assert not list(output.rglob("*.jpg"))
     assert img_path.exists()
+
+
+def test_integration_incremental_rerun(tmp_path):
+    """Test that an incremental re-run skips files organized before."""
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+
+    (source / "IMG_20240101_120000.jpg").write_text("first")
+    args = ["--source", str(source), "--output", str(output), "--incremental"]
+
+    assert main(args) == 0
+    first_target = output / "2024" / "01" / "01" / "Unknown" / "IMG_20240101_120000.jpg"
+    assert first_target.exists()
+
+    # Remove the organized copy: an unchanged source must not be copied again
+    first_target.unlink()
+    (source / "IMG_20240202_120000.jpg").write_text("second")
+
+    assert main(args) == 0
+    assert not first_target.exists()
+    assert (
+        output / "2024" / "02" / "02" / "Unknown" / "IMG_20240202_120000.jpg"
+    ).exists()
+
+
+def test_integration_incremental_dry_run_creates_no_index(tmp_path):
+    """Test that an incremental dry run does not create the index."""
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+    output.mkdir()
+    (source / "IMG_20240101_120000.jpg").write_text("first")
+    args = ["--source", str(source), "--output", str(output), "--incremental"]
+
+    assert main(args + ["--dry-run"]) == 0
+    assert not (output / ".photo-organizer").exists()
+
+
+@pytest.mark.parametrize("strategy", ["skip", "link"])
+def test_integration_content_duplicates(tmp_path, strategy):
+    """Test that re-imported identical files are not stored twice."""
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    (source / "phone1").mkdir(parents=True)
+    (source / "phone2").mkdir(parents=True)
+
+    (source / "phone1" / "IMG_20240101_120000.jpg").write_bytes(b"same bytes")
+    (source / "phone2" / "IMG_20240101_120000.jpg").write_bytes(b"same bytes")
+    (source / "phone2" / "IMG_20240303_120000.jpg").write_bytes(b"same bytes")
+
+    result = main(
+        [
+            "--source",
+            str(source),
+            "--output",
+            str(output),
+            "--on-content-duplicate",
+            strategy,
+        ]
+    )
+
+    assert result == 0
+    day1 = output / "2024" / "01" / "01" / "Unknown"
+    day3 = output / "2024" / "03" / "03" / "Unknown"
+    assert [p.name for p in day1.iterdir()] == ["IMG_20240101_120000.jpg"]
+    if strategy == "skip":
+        assert not day3.exists()
+    else:
+        linked = day3 / "IMG_20240303_120000.jpg"
+        assert linked.stat().st_ino == (day1 / "IMG_20240101_120000.jpg").stat().st_ino
+
+
+def test_integration_resume_interrupted_run(tmp_path):
+    """Test that --resume finishes in-flight transfers and skips completed ones."""
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+    done_source = source / "IMG_20240101_120000.jpg"
+    partial_source = source / "IMG_20240202_120000.jpg"
+    new_source = source / "IMG_20240303_120000.jpg"
+    for path in (done_source, partial_source, new_source):
+        path.write_text(path.name)
+
+    # Simulate a run killed mid-copy: one file done (and since deleted from
+    # the output), one partially copied
+    partial_target = output / "2024" / "02" / "02" / "Unknown" / partial_source.name
+    partial_target.parent.mkdir(parents=True)
+    partial_target.write_text("IMG_")
+    journal = Journal(output / JOURNAL_FILENAME)
+    done_id = journal.plan(done_source, output / "done.jpg", "copy")
+    journal.plan(partial_source, partial_target, "copy")
+    journal.done(done_id)
+    journal.close()
+
+    args = ["--source", str(source), "--output", str(output)]
+    assert main(args + ["--resume"]) == 0
+
+    assert partial_target.read_text() == partial_source.name
+    assert not (output / "2024" / "01" / "01").exists()
+    assert (output / "2024" / "03" / "03" / "Unknown" / new_source.name).exists()
+    assert not (output / JOURNAL_FILENAME).exists()
+
+
+def test_integration_resume_requires_same_mode(tmp_path):
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+    journal = Journal(output / JOURNAL_FILENAME)
+    journal.plan(source / "a.jpg", output / "a.jpg", "move")
+    journal.close()
+
+    args = ["--source", str(source), "--output", str(output), "--resume"]
+
+    assert main(args) == 1
+    assert (output / JOURNAL_FILENAME).exists()
+
+
+def test_integration_verify_manifest(tmp_path):
+    """Test that --verify records a checkable digest for every file."""
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+    for day in ("01", "02"):
+        (source / f"IMG_202401{day}_120000.jpg").write_text(f"photo {day}")
+
+    args = ["--source", str(source), "--output", str(output), "--verify", "sha256"]
+    assert main(args) == 0
+
+    manifest = output / ".photo-organizer" / "manifest.sha256sum"
+    lines = sorted(manifest.read_text().splitlines())
+    assert len(lines) == 2
+    for line in lines:
+        digest, name = line.split("  ", 1)
+        assert hashlib.sha256((output / name).read_bytes()).hexdigest() == digest
+
+
+def test_integration_durable_move(tmp_path, caplog):
+    """Test that --durability batch moves every file and reports its cost."""
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+    for day in ("01", "02", "03"):
+        (source / f"IMG_202401{day}_120000.jpg").write_text(f"photo {day}")
+
+    args = [
+        "--source", str(source), "--output", str(output),
+        "--mode", "move", "--durability", "batch", "--sync-batch-files", "2",
+    ]
+    with caplog.at_level("INFO"):
+        assert main(args) == 0
+
+    assert not list(source.iterdir())
+    assert (output / "2024" / "01" / "03" / "Unknown" / "IMG_20240103_120000.jpg").exists()
+    assert "Durability batch: 3 file and" in caplog.text
+
+
+def test_integration_catalog_query(tmp_path, capsys):
+    """Test that --catalog records transfers and 'catalog query' answers from it."""
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+    (output / "2023" / "12" / "31" / "Unknown").mkdir(parents=True)
+    (output / "2023" / "12" / "31" / "Unknown" / "old.jpg").write_text("organized before")
+    for day in ("01", "02"):
+        (source / f"IMG_202401{day}_120000.jpg").write_text(f"photo {day}")
+
+    args = ["--source", str(source), "--output", str(output), "--catalog"]
+    assert main(args) == 0
+    capsys.readouterr()
+
+    query = ["catalog", "query", "--output", str(output)]
+    assert main(query + ["--from", "2024-01-02"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 1
+    assert lines[0].startswith("2024-01-02T12:00:00\t")
+    assert lines[0].endswith("IMG_20240102_120000.jpg")
+
+    # The file that was there before the catalog existed is cataloged too
+    assert main(query + ["--count"]) == 0
+    assert capsys.readouterr().out.strip() == "3"
+
+
+def test_integration_metrics_file(tmp_path, caplog):
+    """Test that --metrics-file writes per-stage timings and the summary shows them."""
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    metrics_file = tmp_path / "metrics.json"
+    source.mkdir()
+    for day in ("01", "02"):
+        (source / f"IMG_202401{day}_120000.jpg").write_text(f"photo {day}")
+
+    args = [
+        "--source", str(source), "--output", str(output),
+        "--metrics-file", str(metrics_file), "--metrics-interval", "0",
+    ]
+    with caplog.at_level("INFO"):
+        assert main(args) == 0
+
+    data = json.loads(metrics_file.read_text())
+    assert data["files"] == 2
+    assert data["bytes"] == len("photo 01") * 2
+    assert data["extractors"]["Filename"] == {"hits": 2, "attempts": 2}
+    for stage in ("scan", "metadata", "extract.Filename", "transfer"):
+        assert data["stages"][stage]["count"] >= 1
+    assert "Stage timings:" in caplog.text
+    assert "Extractor hit rates:" in caplog.text
+
+
+def test_integration_profile(tmp_path, caplog):
+    """Test that --profile writes a pstats dump and lists the slowest files."""
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    profile = tmp_path / "run.prof"
+    source.mkdir()
+    for day in ("01", "02", "03"):
+        (source / f"IMG_202401{day}_120000.jpg").write_text(f"photo {day}")
+
+    args = [
+        "--source", str(source), "--output", str(output),
+        "--profile", str(profile), "--profile-top", "2",
+    ]
+    with caplog.at_level("INFO"):
+        assert main(args) == 0
+
+    functions = {name for _, _, name in pstats.Stats(str(profile)).stats}
+    assert "_analyze" in functions
+    slowest = caplog.text.split("Slowest files:")[1].splitlines()[1:3]
+    assert all("IMG_202401" in line for line in slowest)
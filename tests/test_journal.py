@@ -0,0 +1,125 @@
+import json
+import os
+import pytest
+from pathlib import Path
+from photo_organizer.journal import (
+    DONE,
+    FAILED,
+    STARTED,
+    Journal,
+    JournalEntry,
+    load_journal,
+    reconcile,
+)
+
+
+def test_journal_round_trip(tmp_path):
+    path = tmp_path / "nested" / "journal.jsonl"
+
+    journal = Journal(path)
+    first = journal.plan(Path("/src/a.jpg"), Path("/out/a.jpg"), "copy")
+    second = journal.plan(Path("/src/b.jpg"), Path("/out/b.jpg"), "link", Path("/out/a.jpg"))
+    third = journal.plan(Path("/src/c.jpg"), Path("/out/c.jpg"), "copy")
+    journal.sync()
+    journal.start(first)
+    journal.done(first)
+    journal.start(second)
+    journal.fail(third)
+    journal.close()
+
+    state = load_journal(path)
+    assert [entry.id for entry in state.in_flight()] == [second]
+    assert state.entries[second].status == STARTED
+    assert state.entries[second].link_to == Path("/out/a.jpg")
+    assert state.entries[first].status == DONE
+    assert state.entries[third].status == FAILED
+    assert state.handled_sources() == {"/src/a.jpg", "/src/b.jpg"}
+    assert state.modes == {"copy"}
+    assert state.next_id == 4
+
+
+def test_journal_ignores_truncated_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = Journal(path)
+    entry_id = journal.plan(Path("/src/a.jpg"), Path("/out/a.jpg"), "move")
+    journal.close()
+    with open(path, "a") as fh:
+        fh.write(json.dumps({"op": "done", "id": entry_id})[:10])
+
+    state = load_journal(path)
+
+    assert [entry.id for entry in state.in_flight()] == [entry_id]
+
+
+def test_journal_close_remove(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = Journal(path)
+    journal.plan(Path("/src/a.jpg"), Path("/out/a.jpg"), "copy")
+
+    journal.close(remove=True)
+
+    assert not path.exists()
+
+
+def test_journal_without_fsync_only_flushes(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    path = tmp_path / "journal.jsonl"
+
+    journal = Journal(path, fsync=False)
+    journal.plan(Path("/src/a.jpg"), Path("/out/a.jpg"), "copy")
+    journal.sync()
+
+    assert synced == []
+    assert len(path.read_text().splitlines()) == 1
+    journal.close()
+
+
+def test_journal_appends_across_runs(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = Journal(path)
+    journal.plan(Path("/src/a.jpg"), Path("/out/a.jpg"), "copy")
+    journal.close()
+
+    journal = Journal(path, next_id=load_journal(path).next_id)
+    assert journal.plan(Path("/src/b.jpg"), Path("/out/b.jpg"), "copy") == 2
+    journal.close()
+
+    assert len(load_journal(path).entries) == 2
+
+
+def test_reconcile_removes_partial_copy(tmp_path):
+    source = tmp_path / "a.jpg"
+    target = tmp_path / "out" / "a.jpg"
+    source.write_text("full")
+    target.parent.mkdir()
+    target.write_text("pa")
+
+    assert reconcile(JournalEntry(1, source, target, "copy"))
+    assert not target.exists()
+
+
+def test_reconcile_completed_move(tmp_path):
+    target = tmp_path / "a.jpg"
+    target.write_text("moved")
+
+    assert not reconcile(JournalEntry(1, tmp_path / "gone.jpg", target, "move"))
+    assert target.exists()
+
+
+def test_reconcile_interrupted_move(tmp_path):
+    source = tmp_path / "a.jpg"
+    target = tmp_path / "out.jpg"
+    source.write_text("full")
+    target.write_text("pa")
+
+    assert reconcile(JournalEntry(1, source, target, "move"))
+    assert not target.exists()
+    assert source.exists()
+
+
+def test_reconcile_lost_move(tmp_path):
+    entry = JournalEntry(1, tmp_path / "a.jpg", tmp_path / "b.jpg", "move")
+
+    with pytest.raises(FileNotFoundError):
+        reconcile(entry)
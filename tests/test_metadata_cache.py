@@ -0,0 +1,99 @@
+import os
+import time
+from datetime import datetime
+from photo_organizer.extractors.base import ExtractionResult
+from photo_organizer.metadata_cache import MetadataCache
+
+
+def test_put_and_get(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_text("content")
+    result = ExtractionResult(
+        date=datetime(2024, 3, 15, 10, 30), camera_model="Canon EOS R5", extractor="EXIF"
+    )
+
+    with MetadataCache(tmp_path / "cache.sqlite3") as cache:
+        assert cache.get(photo.stat(), "chain") is None
+        cache.put(photo.stat(), "chain", result)
+        assert cache.get(photo.stat(), "chain") == result
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_persists_across_instances(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_text("content")
+    db = tmp_path / "nested" / "cache.sqlite3"
+
+    with MetadataCache(db) as cache:
+        cache.put(photo.stat(), "chain", ExtractionResult(date=datetime(2024, 1, 1)))
+
+    with MetadataCache(db) as cache:
+        assert cache.get(photo.stat(), "chain").date == datetime(2024, 1, 1)
+
+
+def test_unresolved_file_is_cached(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_text("content")
+
+    with MetadataCache(tmp_path / "cache.sqlite3") as cache:
+        cache.put(photo.stat(), "chain", None)
+        cached = cache.get(photo.stat(), "chain")
+
+    assert cached is not None
+    assert cached.date is None
+
+
+def test_entries_invalidate_on_change(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_text("content")
+
+    with MetadataCache(tmp_path / "cache.sqlite3") as cache:
+        cache.put(photo.stat(), "chain", ExtractionResult(date=datetime(2024, 1, 1)))
+        assert cache.get(photo.stat(), "other-chain") is None
+
+        photo.write_text("changed content")
+        os.utime(photo, ns=(0, 1_000_000_000))
+        assert cache.get(photo.stat(), "chain") is None
+
+
+def test_eviction_by_age_and_size(tmp_path):
+    files = []
+    for i in range(5):
+        photo = tmp_path / f"photo{i}.jpg"
+        photo.write_text(f"content {i}")
+        files.append(photo)
+    db = tmp_path / "cache.sqlite3"
+
+    with MetadataCache(db) as cache:
+        for photo in files:
+            cache.put(photo.stat(), "chain", ExtractionResult(date=datetime(2024, 1, 1)))
+
+    with MetadataCache(db, max_entries=3) as cache:
+        assert sum(cache.get(p.stat(), "chain") is not None for p in files) == 3
+
+    cache = MetadataCache(db, max_age_days=0)
+    time.sleep(0.01)
+    cache.close()
+    with MetadataCache(db) as cache:
+        assert all(cache.get(p.stat(), "chain") is None for p in files)
+
+
+def test_hits_keep_entries_from_eviction(tmp_path):
+    files = []
+    for i in range(4):
+        photo = tmp_path / f"photo{i}.jpg"
+        photo.write_text(f"content {i}")
+        files.append(photo)
+    db = tmp_path / "cache.sqlite3"
+
+    with MetadataCache(db) as cache:
+        for photo in files:
+            cache.put(photo.stat(), "chain", ExtractionResult(date=datetime(2024, 1, 1)))
+    # The first file, stored first, is the only one used since
+    time.sleep(0.01)
+    with MetadataCache(db) as cache:
+        assert cache.get(files[0].stat(), "chain") is not None
+
+    with MetadataCache(db, max_entries=2) as cache:
+        assert cache.get(files[0].stat(), "chain") is not None
+        assert cache.get(files[1].stat(), "chain") is None
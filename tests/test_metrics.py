@@ -0,0 +1,99 @@
+import json
+import pytest
+from photo_organizer import metrics
+from photo_organizer.metrics import Histogram, MetricsWriter
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_histogram_quantiles():
+    """Test that quantiles are estimated by bucket upper bound, capped at max."""
+    histogram = Histogram()
+    for _ in range(90):
+        histogram.observe(0.0008)
+    for _ in range(10):
+        histogram.observe(0.2)
+
+    assert histogram.count == 100
+    assert histogram.quantile(0.5) == 0.001
+    assert histogram.quantile(0.95) == 0.2
+    assert histogram.max == 0.2
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_histogram_overflow_and_cumulative():
+    """Test that slow calls beyond the last bucket still count and set max."""
+    histogram = Histogram()
+    histogram.observe(0.00001)
+    histogram.observe(120.0)
+
+    cumulative = histogram.cumulative()
+    assert cumulative[0] == (0.00001, 1)
+    assert cumulative[-1] == (60.0, 1)
+    assert histogram.quantile(0.99) == 120.0
+
+
+def test_counters_and_hit_rates():
+    """Test counters, labels, hit rates and reset."""
+    metrics.count(metrics.FILES)
+    metrics.count(metrics.BYTES, 2048)
+    metrics.count(metrics.EXTRACTOR_HITS, label="EXIF")
+    metrics.count(metrics.EXTRACTOR_MISSES, 3, label="EXIF")
+    metrics.count(metrics.EXTRACTOR_MISSES, label="Filename")
+    with metrics.timed(metrics.EXTRACT, "EXIF"):
+        pass
+
+    snapshot = metrics.snapshot()
+    assert snapshot.counters[(metrics.BYTES, "")] == 2048
+    assert snapshot.hit_rates() == {"EXIF": (1, 4), "Filename": (0, 1)}
+    assert snapshot.histograms[(metrics.EXTRACT, "EXIF")].count == 1
+
+    metrics.reset()
+    snapshot = metrics.snapshot()
+    assert not snapshot.histograms
+    assert not snapshot.counters
+
+
+def test_json_and_prometheus_output(tmp_path):
+    """Test both metrics file formats."""
+    metrics.count(metrics.FILES, 2)
+    metrics.count(metrics.EXTRACTOR_HITS, label="EXIF")
+    metrics.observe(metrics.TRANSFER, 0.003)
+    metrics.observe(metrics.TRANSFER, 0.004)
+
+    json_path = tmp_path / "metrics.json"
+    metrics.write_metrics(json_path, "json")
+    data = json.loads(json_path.read_text())
+    assert data["files"] == 2
+    assert data["extractors"] == {"EXIF": {"hits": 1, "attempts": 1}}
+    assert data["stages"]["transfer"]["count"] == 2
+    assert data["stages"]["transfer"]["p50_seconds"] == 0.004
+
+    prom_path = tmp_path / "metrics.prom"
+    metrics.write_metrics(prom_path, "prometheus")
+    text = prom_path.read_text()
+    assert "photo_organizer_files_total 2\n" in text
+    assert 'photo_organizer_stage_seconds_bucket{stage="transfer",le="0.005"} 2' in text
+    assert 'photo_organizer_stage_seconds_count{stage="transfer"} 2' in text
+    assert (
+        'photo_organizer_extractor_results_total{extractor="EXIF",result="miss"} 0'
+        in text
+    )
+    # Written atomically: no temporary file left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["metrics.json", "metrics.prom"]
+
+
+def test_metrics_writer_writes_final_snapshot(tmp_path):
+    """Test that stop() writes the metrics even without periodic refreshes."""
+    path = tmp_path / "out" / "metrics.json"
+    writer = MetricsWriter(path, "json", interval=0)
+    writer.start()
+    metrics.count(metrics.FILES, 5)
+    writer.stop()
+
+    assert json.loads(path.read_text())["files"] == 5
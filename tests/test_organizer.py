@@ -1,8 +1,14 @@
+import errno
+import hashlib
+import os
 import pytest
 from datetime import datetime
 from pathlib import Path
+from photo_organizer import syscalls
+from photo_organizer.durability import Durability, DurabilityManager
 from photo_organizer.organizer import Organizer, TransferMode
 from photo_organizer.extractors.base import ExtractionResult
+from photo_organizer.verify import Manifest
 
 
 def test_build_target_path():
@@ -68,3 +74,214 @@ def test_organize_file_moves(tmp_path):
     assert target.exists()
     assert target.read_text() == "photo content"
     assert not photo.exists()
+
+
+def _setup_photo(tmp_path):
+    source = tmp_path / "source"
+    output = tmp_path / "output"
+    source.mkdir()
+    output.mkdir()
+
+    photo = source / "test.jpg"
+    photo.write_text("photo content")
+    result = ExtractionResult(date=datetime(2024, 10, 15), camera_model="TestCamera")
+    return photo, output, result
+
+
+def test_organize_file_hardlinks(tmp_path):
+    photo, output, result = _setup_photo(tmp_path)
+
+    organizer = Organizer(output, mode=TransferMode.LINK)
+    target = organizer.build_target_path(photo, result)
+    assert organizer.organize_file(photo, target)
+
+    assert target.read_text() == "photo content"
+    assert target.stat().st_ino == photo.stat().st_ino
+    assert photo.exists()
+
+
+def test_organize_file_symlinks(tmp_path):
+    photo, output, result = _setup_photo(tmp_path)
+
+    organizer = Organizer(output, mode=TransferMode.SYMLINK)
+    target = organizer.build_target_path(photo, result)
+    assert organizer.organize_file(photo, target)
+
+    assert target.is_symlink()
+    assert Path(os.readlink(target)) == photo.absolute()
+    assert target.read_text() == "photo content"
+
+
+def test_organize_file_reflink_or_fallback(tmp_path):
+    photo, output, result = _setup_photo(tmp_path)
+
+    organizer = Organizer(output, mode=TransferMode.REFLINK)
+    target = organizer.build_target_path(photo, result)
+    assert organizer.organize_file(photo, target)
+
+    assert target.read_text() == "photo content"
+    assert not target.is_symlink()
+
+
+def test_organize_file_link_falls_back_to_copy(tmp_path, monkeypatch):
+    photo, output, result = _setup_photo(tmp_path)
+
+    def cross_device(*args):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "link", cross_device)
+    organizer = Organizer(output, mode=TransferMode.LINK)
+    target = organizer.build_target_path(photo, result)
+
+    assert organizer.organize_file(photo, target)
+    assert target.read_text() == "photo content"
+    assert target.stat().st_ino != photo.stat().st_ino
+
+
+def test_organize_file_link_without_fallback_fails(tmp_path, monkeypatch):
+    photo, output, result = _setup_photo(tmp_path)
+
+    def cross_device(*args):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "link", cross_device)
+    organizer = Organizer(output, mode=TransferMode.LINK, fallback_to_copy=False)
+    target = organizer.build_target_path(photo, result)
+
+    assert not organizer.organize_file(photo, target)
+    assert not target.exists()
+
+
+def test_organize_file_link_does_not_copy_on_real_errors(tmp_path, monkeypatch):
+    photo, output, result = _setup_photo(tmp_path)
+
+    def denied(*args):
+        raise OSError(errno.EACCES, "Permission denied")
+
+    monkeypatch.setattr(os, "link", denied)
+    organizer = Organizer(output, mode=TransferMode.LINK)
+    target = organizer.build_target_path(photo, result)
+
+    assert not organizer.organize_file(photo, target)
+    assert not target.exists()
+
+
+def test_organize_file_link_overwrites_existing(tmp_path):
+    photo, output, result = _setup_photo(tmp_path)
+
+    organizer = Organizer(output, mode=TransferMode.LINK)
+    target = organizer.build_target_path(photo, result)
+    target.parent.mkdir(parents=True)
+    target.write_text("old content")
+
+    assert organizer.organize_file(photo, target)
+    assert target.read_text() == "photo content"
+
+
+def test_organize_file_creates_each_directory_once(tmp_path):
+    output = tmp_path / "output"
+    organizer = Organizer(output)
+    target_dir = output / "2024" / "10" / "15" / "Unknown"
+
+    syscalls.reset()
+    for i in range(5):
+        source = tmp_path / f"photo{i}.jpg"
+        source.write_text(f"photo {i}")
+        assert organizer.organize_file(source, target_dir / source.name)
+
+    assert syscalls.snapshot()[syscalls.MKDIR] == 1
+    assert len(list(target_dir.iterdir())) == 5
+
+
+def test_prepare_directories_skips_known(tmp_path):
+    output = tmp_path / "output"
+    organizer = Organizer(output)
+    day = output / "2024" / "10" / "15"
+    directories = [day / "Canon", day / "Nikon", day / "Canon"]
+
+    assert organizer.prepare_directories(directories) == 2
+    assert (day / "Canon").is_dir() and (day / "Nikon").is_dir()
+    assert organizer.prepare_directories(directories + [day]) == 0
+
+
+def test_prepare_directories_dry_run(tmp_path):
+    organizer = Organizer(tmp_path / "output", dry_run=True)
+
+    organizer.prepare_directories([tmp_path / "output" / "2024"])
+
+    assert not (tmp_path / "output").exists()
+
+
+@pytest.mark.parametrize("mode", [TransferMode.COPY, TransferMode.MOVE, TransferMode.LINK])
+def test_organize_file_verify_writes_manifest(tmp_path, mode):
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(b"image data")
+    output = tmp_path / "output"
+    target = output / "2024" / "10" / "15" / "Unknown" / "photo.jpg"
+
+    with Manifest(output, "sha256") as manifest:
+        organizer = Organizer(output, mode=mode, verify="sha256", manifest=manifest)
+        assert organizer.organize_file(source, target)
+
+    digest = hashlib.sha256(b"image data").hexdigest()
+    assert manifest.path.read_text() == f"{digest}  2024/10/15/Unknown/photo.jpg\n"
+    assert organizer.verified == 1
+
+
+def test_manifest_is_flushed_before_transfer_is_durable(tmp_path):
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(b"image data")
+    output = tmp_path / "output"
+    target = output / "photo.jpg"
+    manifest = Manifest(output, "sha256")
+    durability = DurabilityManager(Durability.BATCH, before_durable=manifest.flush)
+    organizer = Organizer(
+        output, verify="sha256", manifest=manifest, durability=durability
+    )
+    lines = []
+
+    assert organizer.organize_file(
+        source, target, on_durable=lambda: lines.append(manifest.path.read_text())
+    )
+    assert lines == []
+    organizer.flush()
+
+    digest = hashlib.sha256(b"image data").hexdigest()
+    assert lines == [f"{digest}  photo.jpg\n"]
+    manifest.close()
+
+
+def test_organize_file_move_across_devices_verifies_before_unlink(tmp_path, monkeypatch):
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(b"image data")
+    target = tmp_path / "output" / "photo.jpg"
+    monkeypatch.setattr(os, "rename", _cross_device)
+
+    organizer = Organizer(tmp_path / "output", mode=TransferMode.MOVE, verify="blake2b")
+    assert organizer.organize_file(source, target)
+
+    assert not source.exists()
+    assert target.read_bytes() == b"image data"
+    assert organizer.verified == 1
+
+
+def test_cross_device_move_keeps_source_until_batch_is_durable(tmp_path, monkeypatch):
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(b"image data")
+    target = tmp_path / "output" / "photo.jpg"
+    monkeypatch.setattr(os, "rename", _cross_device)
+
+    durability = DurabilityManager(Durability.BATCH, batch_files=2)
+    organizer = Organizer(tmp_path / "output", mode=TransferMode.MOVE, durability=durability)
+    assert organizer.organize_file(source, target)
+
+    assert source.exists()
+    assert target.read_bytes() == b"image data"
+
+    organizer.flush()
+    assert not source.exists()
+    assert durability.files_synced == 1
+
+
+def _cross_device(*args):
+    raise OSError(errno.EXDEV, "Invalid cross-device link")
@@ -0,0 +1,130 @@
+import random
+import pytest
+from pathlib import Path
+from PIL import Image
+from photo_organizer import perceptual
+from photo_organizer.perceptual import (
+    HASH_BITS,
+    NearDuplicateIndex,
+    _chunk_layout,
+    dhash,
+    hamming,
+    is_image,
+)
+
+
+def _scene(seed, size=(320, 240)):
+    """A deterministic picture with large-scale structure."""
+    rng = random.Random(seed)
+    image = Image.new("RGB", size, "white")
+    for _ in range(12):
+        x, y = rng.randrange(size[0]), rng.randrange(size[1])
+        w, h = rng.randrange(20, 160), rng.randrange(20, 120)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        image.paste(color, (x, y, min(x + w, size[0]), min(y + h, size[1])))
+    return image
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(perceptual, "np", None)
+    return request.param
+
+
+def test_dhash_matches_recompressed_and_resized_copy(tmp_path):
+    original = tmp_path / "original.png"
+    _scene(1).save(original)
+    export = tmp_path / "export.jpg"
+    _scene(1).resize((160, 120)).save(export, quality=40)
+    other = tmp_path / "other.png"
+    _scene(2).save(other)
+
+    assert hamming(dhash(original), dhash(export)) <= perceptual.DEFAULT_RADIUS
+    assert hamming(dhash(original), dhash(other)) > perceptual.DEFAULT_RADIUS
+
+
+def test_dhash_applies_exif_orientation(tmp_path):
+    upright = tmp_path / "upright.jpg"
+    _scene(3).save(upright, quality=95)
+
+    # Stored rotated, with the tag telling viewers to turn it back
+    rotated = tmp_path / "rotated.jpg"
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    _scene(3).rotate(90, expand=True).save(rotated, quality=95, exif=exif)
+
+    assert hamming(dhash(upright), dhash(rotated)) <= 2
+
+
+def test_dhash_unreadable_file(tmp_path):
+    broken = tmp_path / "broken.jpg"
+    broken.write_bytes(b"\xff\xd8\xff not really a jpeg")
+
+    assert dhash(broken) is None
+
+
+def test_is_image():
+    assert is_image(Path("a.JPG"))
+    assert is_image(Path("b.heic"))
+    assert not is_image(Path("c.mp4"))
+
+
+@pytest.mark.parametrize("radius", [0, 1, 5, 10, 63])
+def test_chunk_layout_covers_all_bits(radius):
+    layout = _chunk_layout(radius)
+
+    assert len(layout) == radius // 2 + 1
+    covered = 0
+    for shift, mask, _ in layout:
+        assert covered & (mask << shift) == 0
+        covered |= mask << shift
+    assert covered == (1 << HASH_BITS) - 1
+
+
+def test_index_finds_closest_within_radius(backend):
+    index = NearDuplicateIndex(radius=3)
+    index.add(0b1111, Path("/out/a.jpg"))
+    index.add(0b0111, Path("/out/b.jpg"))
+
+    assert index.find(0b0011) == (Path("/out/b.jpg"), 1)
+    assert index.find(0b1111) == (Path("/out/a.jpg"), 0)
+    assert index.find(0b1111 << 40) is None
+
+
+def test_index_prefers_first_added_on_ties(backend):
+    index = NearDuplicateIndex(radius=2)
+    index.add(0b01, Path("/out/first.jpg"))
+    index.add(0b10, Path("/out/second.jpg"))
+
+    assert index.find(0b11) == (Path("/out/first.jpg"), 1)
+
+
+def test_index_matches_brute_force(backend):
+    rng = random.Random(42)
+    radius = 6
+    index = NearDuplicateIndex(radius)
+    known = []
+    # More than the initial array capacity, so it has to grow
+    for i in range(3000):
+        value = rng.getrandbits(HASH_BITS)
+        known.append(value)
+        index.add(value, Path(f"/out/{i}.jpg"))
+
+    for _ in range(300):
+        query = rng.choice(known)
+        for bit in rng.sample(range(HASH_BITS), rng.randrange(radius + 3)):
+            query ^= 1 << bit
+        distances = [hamming(query, value) for value in known]
+        best = min(distances)
+        expected = None
+        if best <= radius:
+            expected = (Path(f"/out/{distances.index(best)}.jpg"), best)
+        assert index.find(query) == expected
+
+
+def test_index_rejects_bad_radius():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(radius=64)
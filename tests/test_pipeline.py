@@ -0,0 +1,227 @@
+import time
+import pytest
+from PIL import Image
+from pathlib import Path
+from unittest.mock import Mock
+from photo_organizer.date_resolver import DateResolver
+from photo_organizer.durability import Durability, DurabilityManager
+from photo_organizer.duplicates import (
+    ContentDuplicateStrategy,
+    ContentIndex,
+    DuplicateHandler,
+    DuplicateStrategy,
+)
+from photo_organizer.extractors.filename import FilenameExtractor
+from photo_organizer.journal import Journal, load_journal
+from photo_organizer.organizer import Organizer
+from photo_organizer.perceptual import NearDuplicateIndex, NearDuplicateStrategy
+from photo_organizer.pipeline import Pipeline, ProgressReporter
+from photo_organizer.scanner import scan_records
+from photo_organizer import syscalls
+
+
+def _make_pipeline(output, strategy=DuplicateStrategy.RENAME, **kwargs):
+    return Pipeline(
+        DateResolver([FilenameExtractor()]),
+        Organizer(output),
+        DuplicateHandler(strategy),
+        **kwargs,
+    )
+
+
+def _make_sources(source, count):
+    files = []
+    for i in range(count):
+        folder = source / f"card{i}"
+        folder.mkdir(parents=True)
+        photo = folder / "IMG_20240101_120000.jpg"
+        photo.write_text(f"photo {i}")
+        files.append(photo)
+    return files
+
+
+def test_pipeline_processes_all_files(tmp_path):
+    files = _make_sources(tmp_path / "source", 20)
+    output = tmp_path / "output"
+
+    stats = _make_pipeline(output, jobs=4, io_jobs=3).run(files)
+
+    assert stats.processed == 20
+    assert stats.errors == 0
+    assert len(list(output.rglob("*.jpg"))) == 20
+
+
+def test_pipeline_renames_in_input_order(tmp_path):
+    files = _make_sources(tmp_path / "source", 5)
+    output = tmp_path / "output"
+
+    _make_pipeline(output, jobs=4, io_jobs=4).run(files)
+
+    day = output / "2024" / "01" / "01" / "Unknown"
+    assert (day / "IMG_20240101_120000.jpg").read_text() == "photo 0"
+    for i in range(1, 5):
+        assert (day / f"IMG_20240101_120000_{i}.jpg").read_text() == f"photo {i}"
+
+
+def test_pipeline_overwrite_keeps_last_file(tmp_path):
+    files = _make_sources(tmp_path / "source", 6)
+    output = tmp_path / "output"
+
+    stats = _make_pipeline(output, DuplicateStrategy.OVERWRITE, io_jobs=4).run(files)
+
+    assert stats.processed == 6
+    day = output / "2024" / "01" / "01" / "Unknown"
+    assert (day / "IMG_20240101_120000.jpg").read_text() == "photo 5"
+
+
+def test_pipeline_links_content_duplicates_in_same_run(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    first = source / "IMG_20240101_120000.jpg"
+    first.write_text("same")
+    second = source / "IMG_20240202_120000.jpg"
+    second.write_text("same")
+    output = tmp_path / "output"
+
+    stats = _make_pipeline(
+        output,
+        content_index=ContentIndex(),
+        content_strategy=ContentDuplicateStrategy.LINK,
+        io_jobs=2,
+    ).run([first, second])
+
+    assert stats.processed == 2
+    original = output / "2024" / "01" / "01" / "Unknown" / first.name
+    linked = output / "2024" / "02" / "02" / "Unknown" / second.name
+    assert linked.stat().st_ino == original.stat().st_ino
+
+
+@pytest.mark.parametrize(
+    "strategy,processed", [(NearDuplicateStrategy.REPORT, 3), (NearDuplicateStrategy.SKIP, 2)]
+)
+def test_pipeline_near_duplicates(tmp_path, strategy, processed):
+    source = tmp_path / "source"
+    source.mkdir()
+    original = source / "IMG_20240101_120000.jpg"
+    picture = Image.new("RGB", (320, 240), "white")
+    picture.paste((200, 30, 30), (0, 0, 200, 120))
+    picture.paste((30, 30, 200), (120, 80, 320, 240))
+    picture.save(original, quality=95)
+    # Smaller, heavily recompressed export of the same picture
+    export = source / "IMG_20240102_120000.jpg"
+    picture.resize((160, 120)).save(export, quality=30)
+    unrelated = source / "IMG_20240103_120000.jpg"
+    picture.transpose(Image.Transpose.FLIP_LEFT_RIGHT).save(unrelated, quality=95)
+    output = tmp_path / "output"
+
+    stats = _make_pipeline(
+        output, near_index=NearDuplicateIndex(), near_strategy=strategy
+    ).run([original, export, unrelated])
+
+    assert stats.near_duplicates == 1
+    assert stats.processed == processed
+    transferred = bool(list(output.rglob(export.name)))
+    assert transferred == (strategy == NearDuplicateStrategy.REPORT)
+
+
+def test_pipeline_counts_unresolved_files(tmp_path):
+    photo = tmp_path / "photo.jpg"
+    photo.write_text("no date anywhere")
+    extractor = Mock()
+    extractor.name = "Never"
+    extractor.extract.return_value = None
+
+    pipeline = Pipeline(
+        DateResolver([extractor]),
+        Organizer(tmp_path / "output"),
+        DuplicateHandler(DuplicateStrategy.RENAME),
+    )
+    stats = pipeline.run([photo])
+
+    assert stats.errors == 1
+    assert stats.processed == 0
+
+
+def test_pipeline_consumes_files_lazily(tmp_path):
+    files = _make_sources(tmp_path / "source", 40)
+    pipeline = _make_pipeline(tmp_path / "output", jobs=1, io_jobs=1)
+    processed_while_scanning = []
+
+    def stream():
+        for i, photo in enumerate(files):
+            if i == 30:
+                processed_while_scanning.append(pipeline.stats.processed)
+            yield photo
+
+    stats = pipeline.run(stream())
+
+    assert stats.scanned == 40
+    assert stats.processed == 40
+    assert processed_while_scanning[0] > 0
+
+
+def test_progress_reporter_precount(tmp_path):
+    progress = ProgressReporter(interval=0)
+    progress.precount(iter([Path("a.jpg"), Path("b.jpg"), Path("c.jpg")]))
+
+    for _ in range(100):
+        if progress.total is not None:
+            break
+        time.sleep(0.01)
+
+    progress.advance()
+    assert progress.total == 3
+    assert progress.describe().startswith("1/3 files")
+
+
+def test_pipeline_reuses_scanner_records(tmp_path, monkeypatch):
+    _make_sources(tmp_path / "source", 5)
+    output = tmp_path / "output"
+    records = list(scan_records(tmp_path / "source"))
+    content_index = ContentIndex()
+
+    syscalls.reset()
+    stats = _make_pipeline(output, content_index=content_index).run(records)
+
+    assert stats.processed == 5
+    calls = syscalls.snapshot()
+    # Sizes come from the records: no stat of the sources, no fstat in copies
+    assert calls[syscalls.STAT] == 0
+    assert calls[syscalls.FSTAT] == 0
+    assert calls[syscalls.COPYSTAT] == 5
+
+
+def test_pipeline_creates_target_directories_once(tmp_path):
+    files = _make_sources(tmp_path / "source", 12)
+    output = tmp_path / "output"
+
+    syscalls.reset()
+    stats = _make_pipeline(output, jobs=2, io_jobs=1).run(files)
+
+    assert stats.processed == 12
+    # Every file lands in the same day/camera directory
+    assert syscalls.snapshot()[syscalls.MKDIR] == 1
+
+
+def test_pipeline_journals_done_only_once_durable(tmp_path, monkeypatch):
+    files = _make_sources(tmp_path / "source", 3)
+    output = tmp_path / "output"
+    durability = DurabilityManager(Durability.BATCH, batch_files=100)
+    organizer = Organizer(output, durability=durability)
+    journal = Journal(tmp_path / "journal.jsonl")
+    pipeline = Pipeline(
+        DateResolver([FilenameExtractor()]),
+        organizer,
+        DuplicateHandler(DuplicateStrategy.RENAME),
+        journal=journal,
+    )
+    # Interrupted before the end-of-run flush
+    monkeypatch.setattr(organizer, "flush", lambda: None)
+
+    assert pipeline.run(files).processed == 3
+    journal.sync()
+    assert len(load_journal(journal.path).in_flight()) == 3
+
+    durability.flush()
+    journal.close()
+    assert load_journal(journal.path).in_flight() == []
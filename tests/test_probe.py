@@ -0,0 +1,60 @@
+import os
+import pytest
+from pathlib import Path
+from photo_organizer.probe import FileProbe
+
+
+def test_header_and_reads(tmp_path):
+    data = bytes(range(256)) * 64
+    path = tmp_path / "file.bin"
+    path.write_bytes(data)
+
+    with FileProbe(path, header_size=1024) as probe:
+        assert probe.header == data[:1024]
+        assert probe.read_at(100, 10) == data[100:110]
+        assert probe.read_at(1000, 100) == data[1000:1100]
+        assert probe.read_at(len(data) - 4, 100) == data[-4:]
+
+
+def test_file_object_interface(tmp_path):
+    data = b"0123456789" * 10
+    path = tmp_path / "file.bin"
+    path.write_bytes(data)
+
+    with FileProbe(path, header_size=16) as probe:
+        assert probe.read(4) == b"0123"
+        probe.seek(2, os.SEEK_CUR)
+        assert probe.tell() == 6
+        assert probe.read(20) == data[6:26]
+        probe.seek(-5, os.SEEK_END)
+        assert probe.read() == data[-5:]
+        assert probe.read(1) == b""
+
+
+def test_large_files_are_memory_mapped(tmp_path):
+    data = os.urandom(256 * 1024)
+    path = tmp_path / "big.bin"
+    path.write_bytes(data)
+
+    with FileProbe(path, header_size=1024, mmap_threshold=64 * 1024) as probe:
+        assert probe.read_at(200_000, 50) == data[200_000:200_050]
+        assert probe._map is not None
+
+
+def test_stat_does_not_open(tmp_path, monkeypatch):
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"content")
+    st = path.stat()
+
+    monkeypatch.setattr("builtins.open", lambda *args, **kwargs: pytest.fail("opened"))
+    probe = FileProbe(path, stat=st)
+
+    assert probe.stat() is st
+    assert probe.size == 7
+
+
+def test_missing_file_raises(tmp_path):
+    probe = FileProbe(tmp_path / "missing.jpg")
+
+    with pytest.raises(OSError):
+        probe.header
@@ -0,0 +1,68 @@
+import pstats
+import threading
+from pathlib import Path
+from photo_organizer import metrics
+from photo_organizer.profiling import Profiler, SlowFiles
+
+
+def test_slow_files_keeps_the_slowest():
+    """Test that only the slowest files are kept, slowest first."""
+    slow_files = SlowFiles(limit=2)
+    for name, seconds in (("a", 0.1), ("b", 0.5), ("c", 0.3), ("d", 0.05)):
+        slow_files.add(Path(name), {(metrics.TRANSFER, ""): seconds})
+
+    assert [slow.path.name for slow in slow_files.slowest()] == ["b", "c"]
+    assert slow_files.slowest()[0].seconds == 0.5
+
+
+def test_slow_files_attributes_nested_stages():
+    """Test that the hot stage is the extractor, not the stage enclosing it."""
+    slow_files = SlowFiles()
+    slow_files.add(
+        Path("big.tif"),
+        {
+            (metrics.METADATA, ""): 2.0,
+            (metrics.EXTRACT, "EXIF"): 1.5,
+            (metrics.EXTRACT, "Filename"): 0.1,
+            (metrics.TRANSFER, ""): 0.3,
+        },
+    )
+
+    (slow,) = slow_files.slowest()
+    assert slow.stage == "extract.EXIF"
+    assert slow.stage_seconds == 1.5
+    # Nested stages are not counted twice
+    assert abs(slow.seconds - 2.3) < 1e-9
+
+
+def test_attribute_collects_observations_of_this_thread():
+    """Test that metrics.attribute captures only the enclosing thread's stages."""
+    timings = {}
+    with metrics.attribute(timings):
+        metrics.observe(metrics.EXTRACT, 0.25, "EXIF")
+        metrics.observe(metrics.EXTRACT, 0.25, "EXIF")
+        other = threading.Thread(target=metrics.observe, args=(metrics.SCAN, 1.0))
+        other.start()
+        other.join()
+    metrics.observe(metrics.TRANSFER, 1.0)
+
+    assert timings == {(metrics.EXTRACT, "EXIF"): 0.5}
+
+
+def _busy_worker():
+    return sum(range(1000))
+
+
+def test_profiler_merges_threads(tmp_path):
+    """Test that functions run on worker threads appear in the dump."""
+    path = tmp_path / "run.prof"
+    profiler = Profiler(path, memory=True)
+    profiler.start()
+    worker = threading.Thread(target=_busy_worker)
+    worker.start()
+    worker.join()
+    profiler.stop()
+
+    functions = {name for _, _, name in pstats.Stats(str(path)).stats}
+    assert "_busy_worker" in functions
+    assert profiler.memory_path.exists()
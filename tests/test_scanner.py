@@ -1,6 +1,8 @@
 import pytest
 from pathlib import Path
-from photo_organizer.scanner import scan_directory, SUPPORTED_EXTENSIONS
+from concurrent.futures import ThreadPoolExecutor
+from photo_organizer import scanner
+from photo_organizer.scanner import scan_directory, scan_records, SUPPORTED_EXTENSIONS
 
 
 def test_scan_directory_finds_photos(tmp_path):
@@ -32,3 +34,119 @@ def test_supported_extensions():
     assert ".jpg" in SUPPORTED_EXTENSIONS
     assert ".mp4" in SUPPORTED_EXTENSIONS
     assert ".txt" not in SUPPORTED_EXTENSIONS
+
+
+def test_scan_directory_extension_case_insensitive(tmp_path):
+    (tmp_path / "PHOTO.JPG").touch()
+    (tmp_path / "clip.MoV").touch()
+
+    result = list(scan_directory(tmp_path))
+
+    assert sorted(p.name for p in result) == ["PHOTO.JPG", "clip.MoV"]
+
+
+def test_scan_directory_skips_directories_with_media_suffix(tmp_path):
+    (tmp_path / "album.jpg").mkdir()
+    (tmp_path / "album.jpg" / "inner.jpg").touch()
+
+    result = list(scan_directory(tmp_path))
+
+    assert result == [tmp_path / "album.jpg" / "inner.jpg"]
+
+
+def test_scan_directory_deep_tree_parallel(tmp_path):
+    expected = set()
+    for a in range(5):
+        for b in range(5):
+            folder = tmp_path / f"a{a}" / f"b{b}"
+            folder.mkdir(parents=True)
+            photo = folder / "photo.jpg"
+            photo.touch()
+            expected.add(photo)
+
+    result = list(scan_directory(tmp_path, workers=4))
+
+    assert len(result) == len(expected)
+    assert set(result) == expected
+
+
+def test_scan_directory_ordered(tmp_path):
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "nested").mkdir()
+    (tmp_path / "z.jpg").touch()
+    (tmp_path / "c.jpg").touch()
+    (tmp_path / "b" / "2.jpg").touch()
+    (tmp_path / "b" / "1.jpg").touch()
+    (tmp_path / "a" / "x.jpg").touch()
+    (tmp_path / "a" / "nested" / "y.jpg").touch()
+
+    result = list(scan_directory(tmp_path, workers=3, ordered=True))
+
+    assert [p.relative_to(tmp_path).as_posix() for p in result] == [
+        "c.jpg",
+        "z.jpg",
+        "a/x.jpg",
+        "a/nested/y.jpg",
+        "b/1.jpg",
+        "b/2.jpg",
+    ]
+
+
+def test_scan_directory_ordered_bounds_prefetch(tmp_path, monkeypatch):
+    for i in range(50):
+        folder = tmp_path / f"d{i:02}"
+        folder.mkdir()
+        (folder / "photo.jpg").touch()
+    submitted = []
+
+    class CountingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(args[0])
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(scanner, "ThreadPoolExecutor", CountingExecutor)
+    walk = scan_directory(tmp_path, workers=2, ordered=True)
+
+    first = next(walk)
+    assert first == tmp_path / "d00" / "photo.jpg"
+    # The root, then at most workers * 2 listings ahead of the walk
+    assert len(submitted) <= 1 + 4 + 1
+    assert len(list(walk)) == 49
+    walk.close()
+
+
+def test_scan_directory_missing_source(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list(scan_directory(tmp_path / "missing"))
+
+
+def test_scan_records_carries_stat_fields(tmp_path):
+    photo = tmp_path / "sub" / "photo.jpg"
+    photo.parent.mkdir()
+    photo.write_text("content")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    records = list(scan_records(tmp_path))
+
+    assert len(records) == 1
+    record = records[0]
+    st = photo.stat()
+    assert record.path == photo
+    assert (record.size, record.mtime_ns, record.ino, record.dev) == (
+        st.st_size,
+        st.st_mtime_ns,
+        st.st_ino,
+        st.st_dev,
+    )
+    assert record.st_ctime == st.st_ctime_ns / 1e9
+
+
+def test_scan_records_ordered_matches_scan_directory(tmp_path):
+    for name in ["b/2.jpg", "a/1.jpg", "c.jpg"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).touch()
+
+    records = list(scan_records(tmp_path, ordered=True))
+
+    assert [r.path for r in records] == list(scan_directory(tmp_path, ordered=True))
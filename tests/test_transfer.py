@@ -0,0 +1,140 @@
+import errno
+import hashlib
+import os
+import pytest
+from pathlib import Path
+from photo_organizer import transfer
+from photo_organizer.transfer import (
+    BUFFERED,
+    COPY_FILE_RANGE,
+    SENDFILE,
+    CopyUnsupported,
+    copy_file,
+    copy_file_verified,
+)
+from photo_organizer.verify import VerificationError
+
+
+def _unsupported(*args, **kwargs):
+    raise OSError(errno.EOPNOTSUPP, "not supported")
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.jpg"
+    path.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+    os.chmod(path, 0o640)
+    os.utime(path, ns=(1_600_000_000_000_000_000, 1_650_000_000_123_456_789))
+    return path
+
+
+def _assert_copied(source, target):
+    assert target.read_bytes() == source.read_bytes()
+    assert target.stat().st_mtime_ns == source.stat().st_mtime_ns
+    assert (target.stat().st_mode & 0o777) == 0o640
+
+
+def test_copy_file_preserves_content_and_metadata(source, tmp_path):
+    target = tmp_path / "target.jpg"
+
+    method = copy_file(source, target)
+
+    assert method in (transfer.REFLINK, COPY_FILE_RANGE, SENDFILE, BUFFERED)
+    _assert_copied(source, target)
+
+
+def test_copy_file_falls_back_to_copy_file_range(source, tmp_path, monkeypatch):
+    if not hasattr(os, "copy_file_range"):
+        pytest.skip("copy_file_range not available")
+    monkeypatch.setattr(transfer, "_reflink", lambda *args: _raise_unsupported())
+    target = tmp_path / "target.jpg"
+
+    assert copy_file(source, target) == COPY_FILE_RANGE
+    _assert_copied(source, target)
+
+
+def test_copy_file_falls_back_to_sendfile(source, tmp_path, monkeypatch):
+    if not hasattr(os, "sendfile"):
+        pytest.skip("sendfile not available")
+    monkeypatch.setattr(transfer, "_reflink", lambda *args: _raise_unsupported())
+    monkeypatch.setattr(os, "copy_file_range", _unsupported, raising=False)
+    target = tmp_path / "target.jpg"
+
+    assert copy_file(source, target) == SENDFILE
+    _assert_copied(source, target)
+
+
+def test_copy_file_falls_back_to_buffered(source, tmp_path, monkeypatch):
+    monkeypatch.setattr(transfer, "_reflink", lambda *args: _raise_unsupported())
+    monkeypatch.setattr(os, "copy_file_range", _unsupported, raising=False)
+    monkeypatch.setattr(os, "sendfile", _unsupported, raising=False)
+    target = tmp_path / "target.jpg"
+
+    assert copy_file(source, target) == BUFFERED
+    _assert_copied(source, target)
+
+
+def test_copy_file_empty(tmp_path):
+    source = tmp_path / "empty.jpg"
+    source.touch()
+    target = tmp_path / "target.jpg"
+
+    copy_file(source, target)
+
+    assert target.read_bytes() == b""
+
+
+@pytest.mark.parametrize("method", [COPY_FILE_RANGE, SENDFILE])
+def test_copy_file_does_not_truncate_grown_file(tmp_path, monkeypatch, method):
+    """Test that a file larger than its scanned size is copied in full."""
+    if not hasattr(os, method):
+        pytest.skip(f"{method} not available")
+    monkeypatch.setattr(transfer, "_reflink", lambda *args: _raise_unsupported())
+    if method == SENDFILE:
+        monkeypatch.setattr(os, "copy_file_range", _unsupported, raising=False)
+    source = tmp_path / "growing.jpg"
+    source.write_bytes(os.urandom(6000))
+    target = tmp_path / "target.jpg"
+
+    # Size as seen by the scan, before the file grew
+    assert copy_file(source, target, size=1000) == method
+
+    assert target.read_bytes() == source.read_bytes()
+
+
+def test_copy_file_real_errors_propagate(source, tmp_path, monkeypatch):
+    def broken(*args):
+        raise OSError(errno.EIO, "I/O error")
+
+    monkeypatch.setattr(transfer, "_reflink", lambda *args: _raise_unsupported())
+    monkeypatch.setattr(os, "copy_file_range", broken, raising=False)
+
+    with pytest.raises(OSError) as excinfo:
+        copy_file(source, tmp_path / "target.jpg")
+    assert excinfo.value.errno == errno.EIO
+
+
+def _raise_unsupported():
+    raise CopyUnsupported(errno.EOPNOTSUPP, "not supported")
+
+
+@pytest.mark.parametrize("algorithm", ["blake2b", "sha256"])
+def test_copy_file_verified(source, tmp_path, algorithm):
+    target = tmp_path / "target.jpg"
+
+    method, digest = copy_file_verified(source, target, algorithm)
+
+    assert method in (transfer.REFLINK, BUFFERED)
+    assert digest == hashlib.new(algorithm, source.read_bytes()).hexdigest()
+    _assert_copied(source, target)
+
+
+def test_copy_file_verified_detects_mismatch(source, tmp_path, monkeypatch):
+    target = tmp_path / "target.jpg"
+    monkeypatch.setattr(transfer, "_reflink", lambda fsrc, fdst: _raise_unsupported())
+    monkeypatch.setattr(transfer, "hash_file", lambda path, algorithm: "0" * 64)
+
+    with pytest.raises(VerificationError):
+        copy_file_verified(source, target, "sha256")
+
+    assert not target.exists()